@@ -0,0 +1,259 @@
+import argparse
+import dataclasses
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from mock_dexscreener import MockConfig, start_mock_server
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(tempfile.gettempdir(), "solsniper_bench_results.json")  # Outside the repo
+DEFAULT_ROUNDS = 50
+ICON_SIZE = (100, 100)  # Thumbnail size the Tk app asks for
+STARTUP_PATTERN = re.compile(r"Window ready in ([0-9.]+)s")
+
+
+################################################################################
+# MEASURING
+################################################################################
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    """ Nearest-rank percentile of an already sorted list. """
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: list, items_per_sample: int = 1) -> dict:
+    """
+    Turns per-call durations (seconds) into latency percentiles (ms) and throughput.
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(1000 * total / len(ordered), 3),
+        "p50_ms": round(1000 * percentile(ordered, 0.50), 3),
+        "p95_ms": round(1000 * percentile(ordered, 0.95), 3),
+        "p99_ms": round(1000 * percentile(ordered, 0.99), 3),
+        "items_per_second": round(items_per_sample * len(ordered) / total, 1) if total else None,
+    }
+
+
+def timed(function, rounds: int) -> list:
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        function(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def unique_tokens(tokens: list, round_number: int) -> list:
+    """ Copies of 'tokens' with fresh addresses, so every round looks like new tokens. """
+    return [dataclasses.replace(t, tokenAddress=f"{t.tokenAddress}-{round_number}") for t in tokens]
+
+
+################################################################################
+# STAGES
+################################################################################
+
+def bench_pipeline(rounds: int) -> dict:
+    """ Fetch, parse, filter and icon stages, run in-process against the mock server. """
+    from PIL import Image
+
+    from dexscreener import API_URL, TIMEOUT, TOKEN_LIMIT, extract_tokens, fetch_token_profiles, get_session
+    from enrichment import enrich_tokens
+    from filters import load_filter
+    from icons import make_thumbnail, prefetch_icons
+    from json_stream import STREAM_CHUNK_SIZE, iter_json_items, loads
+    from tokens import parse_tokens
+
+    results = {}
+
+    results["fetch"] = summarize(timed(lambda i: fetch_token_profiles(), rounds))
+
+    body = get_session().get(API_URL, timeout=TIMEOUT).content
+    chunks = [body[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE)]
+    tokens = extract_tokens(loads(body), None)
+
+    # Streamed: stops after one page. Full: every token in the body (listv2.py)
+    results["parse"] = summarize(
+        timed(lambda i: parse_tokens(iter_json_items(chunks), TOKEN_LIMIT), rounds * 10), TOKEN_LIMIT
+    )
+    results["parse_full"] = summarize(timed(lambda i: extract_tokens(loads(body), None), rounds * 10), len(tokens))
+    tokens = tokens[:TOKEN_LIMIT]
+
+    # Fresh addresses every round, so each one costs a batched request
+    results["enrich_cold"] = summarize(timed(lambda i: enrich_tokens(unique_tokens(tokens, i)), rounds), len(tokens))
+    enriched = enrich_tokens(tokens)
+    results["enrich_warm"] = summarize(timed(lambda i: enrich_tokens(tokens), rounds * 10), len(tokens))
+    tokens = enriched
+
+    for name in ("sol_eth", "strict"):
+        token_filter = load_filter(name)
+        results[f"filter_{name}"] = summarize(timed(lambda i: token_filter.apply(tokens), rounds * 10), len(tokens))
+
+    # Every round asks for icons of tokens the cache has never seen
+    def fetch_icons_cold(i):
+        prefetch_icons([dataclasses.replace(t, icon=f"{t.icon}?round={i}") for t in tokens], size=ICON_SIZE)
+
+    results["icons_cold"] = summarize(timed(fetch_icons_cold, max(1, rounds // 5)), len(tokens))
+    prefetch_icons(tokens, size=ICON_SIZE)
+    results["icons_warm"] = summarize(timed(lambda i: prefetch_icons(tokens, size=ICON_SIZE), rounds), len(tokens))
+
+    icon_bytes = get_session().get(tokens[0].icon, timeout=TIMEOUT).content
+
+    results["icon_decode"] = summarize(timed(lambda i: make_thumbnail(icon_bytes, ICON_SIZE), rounds * 4))
+
+    # A camera-sized JPEG icon: draft mode decodes it at 1/8 scale
+    buffer = BytesIO()
+    Image.new("RGB", (2048, 2048), (200, 80, 40)).save(buffer, format="JPEG")
+    large_bytes = buffer.getvalue()
+    results["icon_decode_large"] = summarize(timed(lambda i: make_thumbnail(large_bytes, ICON_SIZE), rounds))
+    return results
+
+
+def bench_tk_render(rounds: int) -> dict:
+    """ Inserts a batch of new cards into the Tk app per round; needs a display. """
+    try:
+        import script
+        script.build_window()
+    except Exception as e:  # No display, no Tk, ...
+        return {"skipped": f"{type(e).__name__}: {e}"}
+
+    from dexscreener import fetch_token_profiles
+    from icons import prefetch_icons
+
+    tokens = fetch_token_profiles()
+    icons = prefetch_icons(tokens, size=ICON_SIZE)
+
+    def render(i):
+        script.apply_delta(unique_tokens(tokens, i), [], [], icons)
+        script.root.update()
+
+    try:
+        script.root.update()
+        return {"render_batch": summarize(timed(render, rounds), len(tokens))}
+    finally:
+        script.root.destroy()
+
+
+def bench_streamlit_render(rounds: int) -> dict:
+    """ Runs solethsniper.py with Streamlit's test harness and times a "Fetch Tokens" click. """
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError as e:
+        return {"skipped": f"streamlit not installed: {e}"}
+
+    app = AppTest.from_file(os.path.join(HERE, "solethsniper.py"), default_timeout=30)
+    app.run()
+
+    def click(i):
+        app.button[0].click().run()
+
+    return {"fetch_and_render": summarize(timed(click, max(1, rounds // 5)))}
+
+
+def bench_cold_start(runs: int = 3) -> dict:
+    """
+    Launches script.py with SOLSNIPER_STARTUP_CHECK=1 and records how long
+    the window took to come up, and whether it stayed within STARTUP_BUDGET.
+    """
+    samples, within_budget = [], True
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, os.path.join(HERE, "script.py")],
+            env=dict(os.environ, SOLSNIPER_STARTUP_CHECK="1"), capture_output=True, text=True, timeout=60,
+        )
+        match = STARTUP_PATTERN.search(process.stdout)
+        if match is None:
+            return {"skipped": (process.stderr.strip().splitlines() or ["no output"])[-1]}
+        samples.append(float(match.group(1)))
+        within_budget = within_budget and process.returncode == 0
+
+    result = summarize(samples)
+    result["within_budget"] = within_budget
+    return result
+
+
+################################################################################
+# REPORTING
+################################################################################
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """ Prints the p50 change of every stage against an earlier results file. """
+    for group, stages in results["results"].items():
+        for stage, current in stages.items():
+            before = baseline.get("results", {}).get(group, {}).get(stage)
+            if not isinstance(current, dict) or not isinstance(before, dict) or "p50_ms" not in before:
+                continue
+            if "p50_ms" in current and before["p50_ms"]:
+                change = 100 * (current["p50_ms"] / before["p50_ms"] - 1)
+                print(f"{group}.{stage}: p50 {before['p50_ms']} -> {current['p50_ms']} ms ({change:+.1f}%)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the token pipeline against a local mock API.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--tokens", type=int, default=30, help="profiles per mock response")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock latency per request (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--churn", type=float, default=0.1)
+    parser.add_argument("--icon-size", type=int, default=256)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results JSON file (default: %(default)s)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--skip-ui", action="store_true", help="skip the Tk, Streamlit and cold-start stages")
+    args = parser.parse_args(argv)
+
+    config = MockConfig(args.tokens, args.latency, 0.0, args.error_rate, args.churn, args.icon_size)
+    server = start_mock_server(config)
+
+    # Must be set before dexscreener / icon_cache are imported, here and in child processes
+    os.environ["SOLSNIPER_API_BASE"] = server.base_url
+    os.environ["SOLSNIPER_CACHE_DIR"] = tempfile.mkdtemp(prefix="solsniper-bench-")
+
+    results = {"pipeline": bench_pipeline(args.rounds)}
+    if not args.skip_ui:
+        results["cold_start"] = {"script": bench_cold_start()}
+        results["tk"] = bench_tk_render(args.rounds)
+        results["streamlit"] = bench_streamlit_render(args.rounds)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "config": vars(config),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
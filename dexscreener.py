@@ -0,0 +1,443 @@
+import dataclasses
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+import metrics
+import rate_limit
+from json_stream import STREAM_CHUNK_SIZE, iter_json_items, loads, release_response
+from tokens import Token, parse_tokens
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+# Overridable so tests and benchmarks can point at a local stand-in (see mock_dexscreener.py)
+API_BASE = os.environ.get("SOLSNIPER_API_BASE", "https://api.dexscreener.com").rstrip("/")
+PROFILES_PATH = "/token-profiles/"
+API_URL = f"{API_BASE}{PROFILES_PATH}latest/v1"
+TOKENS_URL = f"{API_BASE}/tokens/v1"  # /{chainId}/{address,address,...} -> pairs with market data
+BOOSTS_LATEST_URL = f"{API_BASE}/token-boosts/latest/v1"  # Recently boosted tokens, profile-shaped
+BOOSTS_TOP_URL = f"{API_BASE}/token-boosts/top/v1"  # Tokens with the most active boosts
+SEARCH_URL = f"{API_BASE}/latest/dex/search"  # ?q=... -> pairs with market data
+TOKEN_LIMIT = 30  # Number of tokens kept from each response
+PAIR_BATCH_SIZE = 30  # Most addresses the tokens endpoint accepts per request
+
+# (connect, read) timeouts in seconds, so a hung socket can't stall a poll
+TIMEOUT = (3.05, 10)
+
+# Size of the keep-alive connection pool per host
+POOL_SIZE = 16
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/58.0.3029.110 Safari/537.36"
+    ),
+    # gzip/deflate always, plus br when the brotli package is installed
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "Connection": "keep-alive",
+}
+
+# Request budgets per host, shared by every process on this machine: host -> (requests per minute, burst).
+# 60/min is Dexscreener's documented limit for the profiles endpoint, which shares the host with enrichment
+RATE_LIMITS = {
+    "api.dexscreener.com": (float(os.environ.get("SOLSNIPER_API_RATE", "60")), 10),
+    "cdn.dexscreener.com": (300, 30),
+}
+RATE_LIMIT_WAIT = 60  # Longest a throttled request queues before it fails
+RATE_LIMIT_PENALTY = 5  # Seconds every process pauses after a 429 without Retry-After
+
+# Multi-source fetch: chains searched for pairs when the caller's filter has no chain list
+# (see search_chains), and how long a merged fetch waits for slow sources
+SEARCH_CHAINS = tuple(
+    chain.strip().lower() for chain in os.environ.get("SOLSNIPER_CHAINS", "solana,ethereum").split(",")
+    if chain.strip()
+)
+SOURCE_WORKERS = 8  # Source requests in flight at the same time
+SOURCES_DEADLINE = 4.0  # Seconds; sources that haven't answered by then are left out of this round
+
+_session = None
+_buckets = {}
+_executor = None
+_in_flight = {}  # (source name, limit) -> Future of its latest request
+_in_flight_lock = threading.Lock()
+_local = threading.local()  # .deadline: monotonic time a source request stops queueing for a slot
+
+
+class RateLimitTimeout(requests.exceptions.RequestException):
+    """ Raised when a request queued for RATE_LIMIT_WAIT seconds without getting a slot. """
+
+
+class SourcesTimeout(requests.exceptions.RequestException):
+    """ Raised when no source of a merged fetch answered within its deadline. """
+
+
+################################################################################
+# RATE LIMITING
+################################################################################
+
+def get_bucket(host: str):
+    """
+    Returns the shared token bucket for 'host', or None if it isn't rate limited.
+    """
+    if host not in RATE_LIMITS:
+        return None
+
+    bucket = _buckets.get(host)
+    if bucket is None:
+        per_minute, burst = RATE_LIMITS[host]
+        try:
+            bucket = rate_limit.TokenBucket(host, per_minute / 60, burst)
+        except OSError as e:
+            print(f"Rate limiting for {host} disabled: {e}")
+            RATE_LIMITS.pop(host, None)
+            return None
+        bucket = _buckets.setdefault(host, bucket)
+    return bucket
+
+
+def request_priority(url: str) -> int:
+    """
+    Latest-profile polls go first; enrichment, icons and logos yield to them.
+    """
+    return rate_limit.HIGH if urlsplit(url).path.startswith(PROFILES_PATH) else rate_limit.LOW
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that takes a slot from the host's shared token bucket before
+    every request, queueing while the budget is spent, and pauses the whole
+    host for everyone when the API answers 429.
+    """
+
+    def send(self, request, **kwargs):
+        bucket = get_bucket(urlsplit(request.url).hostname)
+        if bucket is not None:
+            started = time.perf_counter()
+            wait = RATE_LIMIT_WAIT
+            deadline = getattr(_local, "deadline", None)
+            if deadline is not None:  # A source of a merged fetch: no point queueing past its deadline
+                wait = max(0.0, min(wait, deadline - time.monotonic()))
+            if not bucket.acquire(request_priority(request.url), timeout=wait):
+                metrics.increment("errors", kind="rate_limit")
+                raise RateLimitTimeout(f"No request slot for {bucket.name} within {wait:g}s", request=request)
+            metrics.observe("queue", time.perf_counter() - started)
+
+        response = super().send(request, **kwargs)
+
+        if bucket is not None and response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", RATE_LIMIT_PENALTY))
+            except ValueError:
+                retry_after = RATE_LIMIT_PENALTY  # HTTP-date form
+            bucket.penalize(retry_after)
+
+        return response
+
+
+################################################################################
+# HTTP SESSION
+################################################################################
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared requests.Session, creating it on first use.
+    Reusing one session keeps TCP+TLS connections alive between polls, and
+    every request goes through the host's shared rate limit.
+    """
+    global _session
+
+    if _session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+
+        adapter = RateLimitedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        _session = session
+
+    return _session
+
+
+################################################################################
+# FETCHING TOKEN DATA
+################################################################################
+
+def extract_tokens(data, limit: int = TOKEN_LIMIT) -> list:
+    """
+    Pulls the token list out of a decoded response body, which is either a
+    bare list or a dict with a "tokens" key, and parses it into Token records.
+    """
+    if isinstance(data, dict) and "tokens" in data:
+        tokens = data["tokens"]
+    elif isinstance(data, list):
+        tokens = data
+    else:
+        return []  # If the response isn't as expected
+
+    if not tokens:
+        return []
+
+    return parse_tokens(tokens, limit)
+
+
+def read_tokens(response, limit: int = TOKEN_LIMIT) -> list:
+    """
+    Parses the token list out of a streamed response. With a 'limit' the
+    body is decoded one token at a time and reading stops as soon as 'limit'
+    tokens are kept, so parse time and memory follow the page size, not the
+    response size. Without one it's parsed whole (with orjson if installed).
+    """
+    if not limit:
+        return extract_tokens(loads(response.content), None)
+
+    try:
+        items = iter_json_items(response.iter_content(STREAM_CHUNK_SIZE), key="tokens")
+        return parse_tokens(items, limit)
+    finally:
+        release_response(response)
+
+
+def fetch_token_profiles(limit: int = TOKEN_LIMIT) -> list:
+    """
+    Fetches the latest token profiles from Dexscreener.
+    Raises requests.exceptions.RequestException on network or HTTP errors.
+    """
+    return fetch_token_list(API_URL, limit)
+
+
+def fetch_token_list(url: str, limit: int = TOKEN_LIMIT) -> list:
+    """
+    Fetches any endpoint that returns profile-shaped tokens (latest profiles,
+    latest or top boosts) and parses at most 'limit' of them.
+    Raises requests.exceptions.RequestException on network or HTTP errors.
+    """
+    try:
+        with metrics.timer("http"):  # Until the headers arrive; the body is read while decoding
+            response = get_session().get(url, timeout=TIMEOUT, stream=True)
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+
+        with metrics.timer("decode"):
+            tokens = read_tokens(response, limit)
+    except (requests.exceptions.RequestException, ValueError):
+        metrics.increment("errors", kind="fetch")
+        raise
+
+    metrics.increment("tokens", amount=len(tokens), stage="fetched")
+    return tokens
+
+
+def fetch_token_pairs(chain_id: str, addresses: list) -> list:
+    """
+    Fetches the trading pairs (price, market cap, liquidity, volume, creation
+    time) of up to PAIR_BATCH_SIZE tokens on one chain with a single request.
+    Raises requests.exceptions.RequestException on network or HTTP errors.
+    """
+    if len(addresses) > PAIR_BATCH_SIZE:
+        raise ValueError(f"At most {PAIR_BATCH_SIZE} addresses per request, got {len(addresses)}")
+
+    with metrics.timer("enrich"):
+        response = get_session().get(f"{TOKENS_URL}/{chain_id}/{','.join(addresses)}", timeout=TIMEOUT)
+        response.raise_for_status()
+        data = loads(response.content)
+
+    if isinstance(data, dict):
+        data = data.get("pairs")
+    return data if isinstance(data, list) else []
+
+
+def fetch_chain_pairs(chain_id: str, limit: int = TOKEN_LIMIT) -> list:
+    """
+    Searches the pairs on one chain and returns their base tokens as Token
+    records, market data included, at most 'limit' of them.
+    Raises requests.exceptions.RequestException on network or HTTP errors.
+    """
+    try:
+        with metrics.timer("http"):
+            response = get_session().get(SEARCH_URL, params={"q": chain_id}, timeout=TIMEOUT)
+            response.raise_for_status()
+
+        with metrics.timer("decode"):
+            data = loads(response.content)
+            pairs = data.get("pairs") if isinstance(data, dict) else None
+            tokens = [
+                Token.from_pair(pair) for pair in pairs or []
+                if isinstance(pair, dict) and pair.get("chainId") == chain_id
+            ]
+    except (requests.exceptions.RequestException, ValueError):
+        metrics.increment("errors", kind="fetch")
+        raise
+
+    tokens = tokens[:limit] if limit else tokens
+    metrics.increment("tokens", amount=len(tokens), stage="fetched")
+    return tokens
+
+
+################################################################################
+# MULTI-SOURCE FETCH
+################################################################################
+
+# Filled in from a later source when the first one to list a token lacks them
+MERGE_FIELDS = ("url", "icon", "name", "links", "price", "marketCap", "liquidity", "volume", "holders", "age")
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool that queries the sources of a merged fetch.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=SOURCE_WORKERS, thread_name_prefix="source")
+
+    return _executor
+
+
+def search_chains(chains=None) -> tuple:
+    """
+    Returns the chains to search for pairs: those of a filter's chain
+    allow-list (e.g. TokenFilter.chains), or SEARCH_CHAINS without one.
+    """
+    if not chains:
+        return SEARCH_CHAINS
+    return tuple(sorted(chain.lower() for chain in chains))  # Sorted, so the merge order is deterministic
+
+
+def token_sources(chains=SEARCH_CHAINS) -> list:
+    """
+    Lists the sources of a merged fetch as (name, fetch function, argument),
+    in merge order: latest profiles, latest and top boosts, then a pair
+    search per chain.
+    """
+    sources = [
+        ("latest profiles", fetch_token_list, API_URL),
+        ("latest boosts", fetch_token_list, BOOSTS_LATEST_URL),
+        ("top boosts", fetch_token_list, BOOSTS_TOP_URL),
+    ]
+    sources.extend((f"{chain} pairs", fetch_chain_pairs, chain) for chain in chains)
+    return sources
+
+
+def _fetch_source(fetch, argument, limit, deadline: float) -> list:
+    _local.deadline = deadline
+    try:
+        return fetch(argument, limit)
+    finally:
+        _local.deadline = None
+
+
+def merge_tokens(batches) -> list:
+    """
+    Merges token lists in one pass, deduplicated by Token.key() (so EVM
+    addresses match in any letter case). A token keeps the position of its
+    first listing; fields missing there are filled in from later listings
+    (e.g. market data from a pair search).
+    """
+    merged = {}
+    for tokens in batches:
+        for token in tokens:
+            key = token.key()
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = token
+                continue
+
+            updates = {
+                field: getattr(token, field) for field in MERGE_FIELDS
+                if getattr(existing, field) in (None, (), "") and getattr(token, field) not in (None, (), "")
+            }
+            if updates:
+                merged[key] = dataclasses.replace(existing, **updates)
+
+    return list(merged.values())
+
+
+def fetch_sources(limit: int = TOKEN_LIMIT, chains=SEARCH_CHAINS, on_error=print,
+                  deadline: float = SOURCES_DEADLINE) -> list:
+    """
+    Queries every source from token_sources() concurrently (at most 'limit'
+    tokens each) and merges the results. Sources still running after
+    'deadline' seconds are skipped for this round, so one slow endpoint
+    doesn't hold up the others, and covering more chains costs parallel
+    requests rather than sequential ones. A source whose request from an
+    earlier round is still running is waited on again instead of being
+    requested twice, and requests stop queueing for the rate limit at the
+    deadline, so slow sources can't pile up on the pool.
+    Failed sources are reported through 'on_error'. SourcesTimeout (or the
+    first error) is raised when no source answered in time.
+    """
+    expires = time.monotonic() + deadline
+    futures = []
+    with _in_flight_lock:
+        for name, fetch, argument in token_sources(chains):
+            future = _in_flight.get((name, limit))
+            if future is None or future.done():
+                future = get_executor().submit(_fetch_source, fetch, argument, limit, expires)
+                _in_flight[(name, limit)] = future
+            futures.append((name, future))
+
+    done, not_done = wait([future for _, future in futures], timeout=deadline)
+    for future in not_done:
+        future.cancel()  # Only succeeds for requests that haven't started
+
+    batches, errors = [], []
+    for name, future in futures:  # In source order, so the merge is deterministic
+        if future not in done:
+            on_error(f"Skipped {name}: no answer within {deadline:g}s")
+            continue
+        try:
+            batches.append(future.result())
+        except (requests.exceptions.RequestException, ValueError) as e:
+            errors.append(e)
+            on_error(f"Error fetching {name}: {e}")
+
+    if not batches:
+        if errors:
+            raise errors[0]
+        raise SourcesTimeout(f"No source answered within {deadline:g}s")
+    return merge_tokens(batches)
+
+
+def get_token_data(limit: int = TOKEN_LIMIT, chain_filter=None, on_error=print, chains=None) -> list:
+    """
+    Fetches token data from every source (see fetch_sources), returns a list
+    of at most 'limit' Token records. Pairs are searched on 'chains' (pass
+    the active filter's TokenFilter.chains; see search_chains). When
+    'chain_filter' is given only that chain is searched and only tokens on
+    it are kept.
+    Errors are reported through 'on_error' and an empty list is returned.
+    Each record only keeps the fields the front-ends read:
+      url (clickable link)
+      tokenAddress
+      icon (image)
+      links
+      price
+      marketCap
+      liquidity
+      volume
+      holders
+      age
+      chainId
+    """
+    try:
+        chains = (chain_filter.lower(),) if chain_filter else search_chains(chains)
+        tokens = fetch_sources(None if chain_filter else limit, chains, on_error=on_error)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        on_error(f"Error fetching data: {e}")
+        return []
+
+    if chain_filter:
+        tokens = [token for token in tokens if token.chainId.lower() == chain_filter.lower()]
+
+    return tokens[:limit] if limit else tokens
@@ -0,0 +1,142 @@
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import metrics
+from dexscreener import PAIR_BATCH_SIZE, fetch_token_pairs
+from tokens import to_number
+from ttl_cache import TTLCache
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+ENRICH_TTL = 30  # Seconds a token's market data is reused before it is fetched again
+ENRICH_CACHE_ENTRIES = 20000  # Tokens whose market data is remembered
+ENRICH_WORKERS = 4  # Batch requests in flight at the same time
+
+MARKET_FIELDS = ("price", "marketCap", "liquidity", "volume", "age")
+
+_executor = None
+_market_cache = TTLCache(ENRICH_TTL, max_entries=ENRICH_CACHE_ENTRIES)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool that issues enrichment batches.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ENRICH_WORKERS, thread_name_prefix="enrich")
+
+    return _executor
+
+
+################################################################################
+# MARKET DATA
+################################################################################
+
+def _market_key(chain_id: str, address: str) -> tuple:
+    # EVM addresses come back in any letter case; Solana ones never collide when lowercased
+    return chain_id, address.lower()
+
+
+def summarize_pairs(pairs: list, now: float = None) -> dict:
+    """
+    Reduces the pairs returned for a batch to one market record per token
+    (keyed by lowercased base token address). Price, market cap, liquidity
+    and volume come from the token's most liquid pair; age is the number of
+    days since its oldest pair was created.
+    """
+    now = time.time() if now is None else now
+    summaries, best_liquidity, created = {}, {}, {}
+
+    for pair in pairs:
+        if not isinstance(pair, dict):
+            continue
+        address = (pair.get("baseToken") or {}).get("address")
+        if not address:
+            continue
+        key = address.lower()
+
+        created_at = to_number(pair.get("pairCreatedAt"))  # Milliseconds since the epoch
+        if created_at is not None:
+            created[key] = min(created_at, created.get(key, created_at))
+
+        liquidity = to_number(pair.get("liquidity"), "usd")
+        if key in summaries and (liquidity or 0) <= best_liquidity[key]:
+            continue
+
+        market_cap = to_number(pair.get("marketCap"))
+        best_liquidity[key] = liquidity or 0
+        summaries[key] = {
+            "price": to_number(pair.get("priceUsd")),
+            "marketCap": market_cap if market_cap is not None else to_number(pair.get("fdv")),
+            "liquidity": liquidity,
+            "volume": to_number(pair.get("volume"), "h24"),
+            "age": None,
+        }
+
+    for key, created_at in created.items():
+        summaries[key]["age"] = max(0.0, (now - created_at / 1000) / 86400)
+
+    return summaries
+
+
+def _load_batch(chain_id: str, addresses: list) -> dict:
+    summaries = summarize_pairs(fetch_token_pairs(chain_id, addresses))
+    return {address: summaries.get(address.lower(), {}) for address in addresses}
+
+
+################################################################################
+# ENRICHMENT
+################################################################################
+
+def enrich_tokens(tokens: list, on_error=print) -> list:
+    """
+    Fills in the market fields (price, marketCap, liquidity, volume, age) of
+    a batch of tokens. Addresses without fresh cached data are grouped by
+    chain and resolved PAIR_BATCH_SIZE at a time, all batches concurrently,
+    so a poll costs one request per 30 uncached tokens. Tokens whose batch
+    fails are returned unchanged and retried on the next call. Tokens that
+    already carry market data (from a pair search) are left as they are.
+    Dexscreener has no holder counts, so 'holders' is left as it is.
+    """
+    pending = {}  # chainId -> addresses without fresh market data
+    for token in tokens:
+        if not token.chainId or not token.tokenAddress or token.price is not None:
+            continue
+        if _market_cache.get(_market_key(token.chainId, token.tokenAddress)) is None:
+            addresses = pending.setdefault(token.chainId, [])
+            if token.tokenAddress not in addresses:
+                addresses.append(token.tokenAddress)
+
+    futures = [
+        (chain_id, get_executor().submit(_load_batch, chain_id, addresses[i:i + PAIR_BATCH_SIZE]))
+        for chain_id, addresses in pending.items()
+        for i in range(0, len(addresses), PAIR_BATCH_SIZE)
+    ]
+
+    for chain_id, future in futures:
+        try:
+            batch = future.result()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            metrics.increment("errors", kind="enrich")
+            on_error(f"Error fetching market data for {chain_id}: {e}")
+            continue
+        for address, market in batch.items():
+            _market_cache.put(_market_key(chain_id, address), market)  # {} = no pairs yet, also cached
+
+    enriched = []
+    for token in tokens:
+        if token.price is not None:
+            enriched.append(token)
+            continue
+        market = _market_cache.get(_market_key(token.chainId, token.tokenAddress)) if token.tokenAddress else None
+        updates = {field: market[field] for field in MARKET_FIELDS if market and market.get(field) is not None}
+        enriched.append(dataclasses.replace(token, **updates) if updates else token)
+
+    return enriched
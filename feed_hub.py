@@ -0,0 +1,360 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+from icon_cache import CACHE_DIR
+from seen import SeenSet, token_key
+from tokens import Token
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+HUB_SOCKET = os.environ.get("SOLSNIPER_HUB_SOCKET", os.path.join(CACHE_DIR, "hub.sock"))
+SUBSCRIBER_BACKLOG = 64  # Messages queued per subscriber before it's dropped as too slow
+RECONNECT_DELAY = 1.0  # Seconds between a subscriber's attempts to reach the hub
+HUB_WAIT = 2.0  # Seconds a new subscriber waits for the hub's first batch
+HUB_CONNECT_WAIT = 0.5  # Seconds a new subscriber gets to reach the hub before it counts as not running
+
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+################################################################################
+# PUBLISHER
+################################################################################
+
+class _Subscriber:
+    """ One connected viewer, fed from its own queue so a slow one can't stall the others. """
+
+    def __init__(self, connection: socket.socket, on_close):
+        self.connection = connection
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        self.on_close = on_close
+        threading.Thread(target=self._send_loop, name="hub-subscriber", daemon=True).start()
+
+    def send(self, data: bytes) -> bool:
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except queue.Full:
+            self.close()  # It reconnects and starts over from a fresh snapshot
+            return False
+
+    def close(self) -> None:
+        try:
+            self.queue.put_nowait(None)  # Stops an idle send loop
+        except queue.Full:
+            pass  # A busy one fails on its next send instead
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _send_loop(self) -> None:
+        try:
+            while True:
+                data = self.queue.get()
+                if data is None:
+                    break
+                self.connection.sendall(data)
+        except OSError:
+            pass
+        finally:
+            self.connection.close()
+            self.on_close(self)
+
+
+class FeedHub:
+    """
+    Owns the single poll -> enrich -> record pipeline and pushes every
+    result to any number of local viewers over a Unix-domain socket, so
+    upstream load doesn't grow with the number of open UIs.
+    Messages are JSON lines, each with an increasing "version":
+      {"type": "snapshot", "version", "tokens": [...]}      on connect
+      {"type": "delta", "version", "tokens": [...], "keys": [...], "dropped": [...]}
+    A delta carries only new and changed tokens; "keys" is the full batch
+    in API order as [chainId, tokenAddress] pairs.
+    """
+
+    def __init__(self, path: str = HUB_SOCKET):
+        self.path = path
+        self.version = 0
+        self._tokens = []  # Latest batch, in API order
+        self._seen = SeenSet()
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def listen(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a hub that didn't shut down cleanly
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen()
+        threading.Thread(target=self._accept_loop, name="hub-accept", daemon=True).start()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+
+    def _accept_loop(self) -> None:
+        while self._server is not None:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+
+            with self._lock:
+                subscriber = _Subscriber(connection, self._discard)
+                subscriber.send(encode_message({
+                    "type": "snapshot", "version": self.version,
+                    "tokens": [token.to_dict() for token in self._tokens],
+                }))
+                self._subscribers.add(subscriber)
+
+    def _discard(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, tokens: list) -> None:
+        """
+        Diffs a polled batch against the previous ones and pushes the delta.
+        """
+        if not tokens:
+            return
+
+        delta = self._seen.diff(tokens)
+        with self._lock:
+            self.version += 1
+            self._tokens = list(tokens)
+            data = encode_message({
+                "type": "delta", "version": self.version,
+                "tokens": [token.to_dict() for token in delta.new + delta.changed],
+                "keys": [token_key(token) for token in tokens],
+                "dropped": delta.dropped,
+            })
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            subscriber.send(data)
+
+
+################################################################################
+# SUBSCRIBER
+################################################################################
+
+class HubClient:
+    """
+    Keeps a live copy of the hub's latest batch on a daemon thread,
+    reconnecting (and resyncing from a snapshot) whenever the hub restarts.
+    on_update(tokens), if given, runs on that thread after every message,
+    and on_disconnect() when an established connection is lost.
+    """
+
+    def __init__(self, path: str = HUB_SOCKET, on_update=None, on_error=print):
+        self.path = path
+        self.on_update = on_update
+        self.on_disconnect = None
+        self.on_error = on_error
+        self.version = 0
+        self.connected = False
+        self.attempts = 0  # Connections tried and ended (or refused) so far
+
+        self._tokens = {}  # (chainId, tokenAddress) -> Token
+        self._keys = []  # Latest batch, in API order
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hub-client", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def latest(self) -> list:
+        """ Returns the hub's latest batch as Token records, in API order. """
+        with self._changed:
+            return [self._tokens[key] for key in self._keys if key in self._tokens]
+
+    def wait_for_update(self, after_version: int, timeout: float = None) -> int:
+        """
+        Blocks until a version newer than 'after_version' arrives, the
+        connection drops or the timeout runs out; returns the current version.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > after_version or not self.connected, timeout)
+            return self.version
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """ Blocks until the first connection attempt succeeds or fails (or the timeout), returns whether connected. """
+        with self._changed:
+            self._changed.wait_for(lambda: self.connected or self.attempts, timeout)
+            return self.connected
+
+    def _set_connected(self, connected: bool) -> None:
+        with self._changed:
+            self.connected = connected
+            if not connected:
+                self.attempts += 1
+            self._changed.notify_all()
+
+    def _apply(self, message: dict) -> None:
+        with self._changed:
+            tokens = [Token.from_json(data) for data in message.get("tokens", [])]
+            if message.get("type") == "snapshot":
+                self._tokens = {token.key(): token for token in tokens}
+                self._keys = [token.key() for token in tokens]
+            else:
+                self._tokens.update((token.key(), token) for token in tokens)
+                self._keys = [tuple(key) for key in message.get("keys", [])]
+                live = set(self._keys)
+                for key in message.get("dropped", []):
+                    if tuple(key) not in live:
+                        self._tokens.pop(tuple(key), None)
+            self.version = message.get("version", self.version + 1)
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            was_connected = False
+            try:
+                sock.connect(self.path)
+                self._set_connected(True)
+                was_connected = True
+                with sock.makefile("rb") as stream:
+                    for line in stream:
+                        if self._stop.is_set():
+                            break
+                        self._apply(json.loads(line))
+                        if self.on_update is not None:
+                            try:
+                                self.on_update(self.latest())
+                            except Exception as e:
+                                self.on_error(f"Error processing hub update: {e}")
+            except (OSError, ValueError) as e:
+                if was_connected:
+                    self.on_error(f"Lost connection to feed hub: {e}")
+            finally:
+                self._set_connected(False)
+                sock.close()
+
+            if was_connected and self.on_disconnect is not None and not self._stop.is_set():
+                try:
+                    self.on_disconnect()
+                except Exception as e:
+                    self.on_error(f"Error handling hub disconnect: {e}")
+            self._stop.wait(RECONNECT_DELAY)
+
+
+_hub_client = None
+_hub_lock = threading.Lock()
+
+
+def get_hub_client(on_update=None):
+    """
+    Returns a started process-wide HubClient connected to a hub listening
+    on HUB_SOCKET, else None (the caller then fetches by itself). A socket
+    file left behind by a hub that was killed doesn't count, and a client
+    whose hub went away is dropped, so callers fall back to polling until
+    a hub is reachable again.
+    """
+    global _hub_client
+
+    with _hub_lock:
+        if _hub_client is not None and not _hub_client.connected:
+            _hub_client.stop()
+            _hub_client = None
+
+        if _hub_client is None:
+            if not os.path.exists(HUB_SOCKET):
+                return None
+            client = HubClient(on_update=on_update)
+            client.start()
+            if not client.wait_connected(HUB_CONNECT_WAIT):
+                client.stop()
+                return None
+            _hub_client = client
+        return _hub_client
+
+
+def hub_tokens(wait: float = HUB_WAIT):
+    """
+    Returns the feed hub's latest batch (enriched and recorded already), or
+    None when no hub is running or it has nothing yet.
+    """
+    hub = get_hub_client()
+    if hub is None:
+        return None
+    hub.wait_for_update(0, timeout=wait)
+    return hub.latest() or None
+
+
+################################################################################
+# ENTRY POINT
+################################################################################
+
+def main(argv=None) -> int:
+    # The fetching pipeline is only imported by the hub process itself
+    from dexscreener import fetch_token_profiles
+    from headless import enriched_batches, log, poll_batches, recorded_batches
+    from history import flush_history
+    from poller import FETCH_INTERVAL, AdaptiveSchedule
+
+    parser = argparse.ArgumentParser(description="Poll Dexscreener once and push updates to every local viewer.")
+    parser.add_argument("--socket", default=HUB_SOCKET, help="Unix socket path (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=FETCH_INTERVAL, help="base poll interval in seconds")
+    args = parser.parse_args(argv)
+
+    hub = FeedHub(args.socket)
+    hub.listen()
+    log(f"Feed hub listening on {args.socket}")
+
+    try:
+        batches = poll_batches(fetch_token_profiles, AdaptiveSchedule(args.interval))
+        for tokens in recorded_batches(enriched_batches(batches)):
+            started = time.perf_counter()
+            hub.publish(tokens)
+            log(f"v{hub.version}: {len(tokens)} tokens to {hub.subscriber_count} viewers "
+                f"in {1000 * (time.perf_counter() - started):.2f} ms")
+    except KeyboardInterrupt:
+        log("Interrupted. Exiting gracefully...")
+    finally:
+        hub.close()
+        flush_history()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import json
+import os
+
+import metrics
+from timeseries import INDICATORS, indicator
+from tokens import TOKEN_FIELDS
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+FILTER_SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filter_specs")
+
+# Supported comparison operators, emitted as-is into the compiled predicate
+OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+
+
+class FilterSpecError(ValueError):
+    """ Raised when a filter spec is malformed. """
+
+
+################################################################################
+# LOADING SPECS
+################################################################################
+
+def load_filter_spec(name_or_path: str) -> dict:
+    """
+    Loads a filter spec from a JSON (or, with PyYAML installed, YAML) file.
+    A bare name like "sol_eth" is looked up in the filter_specs directory.
+    """
+    path = name_or_path
+    if not os.path.exists(path):
+        for extension in (".json", ".yaml", ".yml"):
+            candidate = os.path.join(FILTER_SPECS_DIR, name_or_path + extension)
+            if os.path.exists(candidate):
+                path = candidate
+                break
+        else:
+            raise FilterSpecError(f"Filter spec not found: {name_or_path}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # Only needed for YAML specs
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_filter(name_or_path: str) -> "TokenFilter":
+    """
+    Loads and compiles a filter spec.
+    """
+    return TokenFilter(load_filter_spec(name_or_path))
+
+
+################################################################################
+# COMPILED FILTER
+################################################################################
+
+def _check_rule(rule: dict) -> tuple:
+    field, op, value = rule.get("field"), rule.get("op"), rule.get("value")
+
+    if field not in TOKEN_FIELDS and field not in INDICATORS:
+        raise FilterSpecError(f"Unknown token field: {field!r}")
+    if op not in OPERATORS:
+        raise FilterSpecError(f"Unsupported operator {op!r} for field {field!r}")
+
+    default = rule.get("default", 0)
+    for number in (value, default):
+        if isinstance(number, bool) or not isinstance(number, (int, float)):
+            raise FilterSpecError(f"Threshold and default for {field!r} must be numbers")
+
+    return field, op, value, default
+
+
+class TokenFilter:
+    """
+    A declarative filter spec compiled once into a predicate:
+      {
+        "chains": ["solana", "ethereum"],       # optional chainId allow-list
+        "rules": [                              # all must hold
+          {"field": "marketCap", "op": "<", "value": 10000000, "default": 0}
+        ]
+      }
+    Fields are Token attributes or per-token series INDICATORS (e.g.
+    "liquidity_drain", "price_roc"; see timeseries.py), which need the batch
+    recorded with record_series() first. A missing (None) value takes the
+    rule's "default" value.
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.description = spec.get("description", "")
+
+        chains = spec.get("chains")
+        self.chains = frozenset(chain.lower() for chain in chains) if chains else None
+        self.rules = [_check_rule(rule) for rule in spec.get("rules", [])]
+
+        self.source = self._generate_source()
+        namespace = {"CHAINS": self.chains, "INDICATOR": indicator}
+        exec(compile(self.source, "<token filter>", "exec"), namespace)
+        self.matches = namespace["matches"]
+
+    def _generate_source(self) -> str:
+        # Only validated Token fields, operators and numbers reach the source
+        lines = ["def matches(token):"]
+
+        if self.chains is not None:
+            lines.append("    if token.chainId.lower() not in CHAINS: return False")
+
+        for i, (field, op, value, default) in enumerate(self.rules):
+            if field in TOKEN_FIELDS:
+                lines.append(f"    v{i} = token.{field}")
+            else:
+                lines.append(f"    v{i} = INDICATOR(token, {field!r})")
+            lines.append(f"    if not ({default!r} if v{i} is None else v{i}) {op} {value!r}: return False")
+
+        lines.append("    return True")
+        return "\n".join(lines) + "\n"
+
+    def apply(self, tokens: list) -> list:
+        """
+        Returns the tokens that pass the filter, in order.
+        """
+        matches = self.matches
+        with metrics.timer("filter"):
+            matched = [token for token in tokens if matches(token)]
+
+        metrics.increment("tokens", amount=len(matched), stage="matched")
+        return matched
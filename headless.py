@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+from dexscreener import fetch_token_profiles
+from enrichment import enrich_tokens
+import metrics
+from filters import load_filter
+from history import flush_history, record_tokens, warm_start_tokens
+from poller import FETCH_INTERVAL, AdaptiveSchedule, poll_once
+from seen import SeenSet
+from timeseries import record_series
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+DEFAULT_FILTER = os.environ.get("SOLSNIPER_FILTER", "sol_eth")
+SOCKET_RETRY_DELAY = 1  # Seconds between attempts to reach the consumer's socket
+
+
+def log(message: str) -> None:
+    """ Diagnostics go to stderr; stdout may be carrying the token stream. """
+    print(message, file=sys.stderr, flush=True)
+
+
+################################################################################
+# GENERATOR PIPELINE
+################################################################################
+
+def poll_batches(fetch, schedule: AdaptiveSchedule, once: bool = False):
+    """
+    Yields each fetched batch as soon as it arrives, then sleeps as long as
+    the schedule says. Failed fetches yield an empty batch.
+    """
+    while True:
+        yield poll_once(fetch, schedule, on_error=log)
+        if once:
+            return
+        time.sleep(schedule.next_delay())
+
+
+def enriched_batches(batches):
+    """
+    Resolves the market data of every batch, 30 tokens per request.
+    """
+    for tokens in batches:
+        yield enrich_tokens(tokens, on_error=log) if tokens else tokens
+
+
+def recorded_batches(batches):
+    """
+    Queues every batch for the history database and appends it to the
+    per-token series (read by indicator filter rules), passing it through unchanged.
+    """
+    for tokens in batches:
+        record_tokens(tokens)
+        record_series(tokens)
+        yield tokens
+
+
+def matching_tokens(batches, seen: SeenSet, token_filter, include_changed: bool = False):
+    """
+    Diffs every batch against the tokens seen so far and yields
+    (event, token) for each new (and optionally changed) token that passes
+    the filter, in API order.
+    """
+    for tokens in batches:
+        if not tokens:
+            continue
+
+        delta = seen.diff(tokens)
+        for token in token_filter.apply(delta.new):
+            yield "new", token
+        if include_changed:
+            for token in token_filter.apply(delta.changed):
+                yield "changed", token
+
+
+def json_lines(events):
+    """
+    Serializes each (event, token) pair as one compact JSON line.
+    """
+    for event, token in events:
+        record = token.to_dict()
+        record["event"] = event
+        record["detectedAt"] = round(time.time(), 3)
+        yield json.dumps(record, separators=(",", ":")) + "\n"
+
+
+################################################################################
+# OUTPUT SINKS
+################################################################################
+
+class StreamSink:
+    """ Writes lines to a text stream (stdout or an appended file), flushing each one. """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, line: str) -> None:
+        self.stream.write(line)
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class UnixSocketSink:
+    """
+    Sends lines to a consumer listening on a Unix stream socket,
+    reconnecting when the consumer restarts. Lines written while it is down
+    are dropped rather than queued, and reconnecting is tried at most once
+    every SOCKET_RETRY_DELAY, so a dead consumer can't stall the poll.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock = None
+        self._last_attempt = None  # time.monotonic() of the last connection attempt
+
+    def _connect(self) -> bool:
+        now = time.monotonic()
+        if self._last_attempt is not None and now - self._last_attempt < SOCKET_RETRY_DELAY:
+            return False
+        self._last_attempt = now
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            log(f"Can't reach consumer socket {self.path}: {e}")
+            return False
+        self._sock = sock
+        return True
+
+    def write(self, line: str) -> None:
+        data = line.encode("utf-8")
+        for _ in range(2):  # One retry on a fresh connection
+            if self._sock is None and not self._connect():
+                return  # Dropped until the consumer is back
+            try:
+                self._sock.sendall(data)
+                return
+            except OSError as e:
+                log(f"Consumer socket error: {e}")
+                self.close()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def open_sink(output: str = "-", socket_path: str = None):
+    if socket_path:
+        return UnixSocketSink(socket_path)
+    if output == "-":
+        return StreamSink(sys.stdout)
+    return StreamSink(open(output, "a", encoding="utf-8"))
+
+
+################################################################################
+# ENTRY POINT
+################################################################################
+
+def run(sink, token_filter, interval: float = FETCH_INTERVAL, include_changed: bool = False, once: bool = False,
+        warm_start: bool = True) -> None:
+    """
+    Polls the API and streams every newly matching token to 'sink' until interrupted.
+    With 'warm_start', tokens already in the history database count as seen,
+    so a restart doesn't stream them again.
+    """
+    seen = SeenSet()
+    if warm_start:
+        seen.diff(warm_start_tokens())
+
+    batches = enriched_batches(poll_batches(fetch_token_profiles, AdaptiveSchedule(interval), once=once))
+    for line in json_lines(matching_tokens(recorded_batches(batches), seen, token_filter, include_changed)):
+        sink.write(line)
+        metrics.increment("tokens", stage="emitted")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream newly matching tokens as JSON lines, without a UI.")
+    parser.add_argument("--filter", default=DEFAULT_FILTER, help="filter spec name or path (default: %(default)s)")
+    parser.add_argument("--output", default="-", help="file to append JSON lines to (default: stdout)")
+    parser.add_argument("--socket", help="Unix socket path of a listening consumer (overrides --output)")
+    parser.add_argument("--interval", type=float, default=FETCH_INTERVAL, help="base poll interval in seconds")
+    parser.add_argument("--changed", action="store_true", help="also emit tokens whose data changed")
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    parser.add_argument("--no-warm-start", action="store_true", help="re-emit tokens already in the history database")
+    args = parser.parse_args(argv)
+
+    token_filter = load_filter(args.filter)
+    sink = open_sink(args.output, args.socket)
+    metrics.start_metrics_server()  # Prometheus endpoint, when SOLSNIPER_METRICS_PORT is set
+    log(f"Streaming tokens matching {args.filter!r}...")
+
+    try:
+        run(sink, token_filter, args.interval, args.changed, args.once, not args.no_warm_start)
+    except KeyboardInterrupt:
+        log("Interrupted. Exiting gracefully...")
+    finally:
+        sink.close()
+        flush_history()  # The last batch is still queued for the writer thread
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
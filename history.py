@@ -0,0 +1,285 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from icon_cache import CACHE_DIR
+from tokens import Token
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+HISTORY_DB = os.environ.get("SOLSNIPER_HISTORY_DB", os.path.join(CACHE_DIR, "history.sqlite3"))
+HISTORY_ENABLED = os.environ.get("SOLSNIPER_HISTORY", "1") != "0"
+
+WRITE_BATCH_SIZE = 5000  # Most tokens written in one transaction
+WRITE_INTERVAL = 1.0  # Seconds the writer waits to gather more tokens into a batch
+WARM_START_LIMIT = 200  # Tokens loaded when a front-end starts from history
+FLUSH_TIMEOUT = 10.0  # Longest exit waits for queued batches to be written
+
+MARKET_COLUMNS = ("price", "marketCap", "liquidity", "volume", "holders", "age")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    chainId      TEXT NOT NULL,
+    tokenAddress TEXT NOT NULL,
+    name         TEXT,
+    url          TEXT,
+    icon         TEXT,
+    links        TEXT,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL,
+    PRIMARY KEY (chainId, tokenAddress)
+);
+CREATE INDEX IF NOT EXISTS tokens_chain_first_seen ON tokens (chainId, first_seen);
+CREATE INDEX IF NOT EXISTS tokens_first_seen ON tokens (first_seen);
+CREATE INDEX IF NOT EXISTS tokens_address ON tokens (tokenAddress);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    chainId      TEXT NOT NULL,
+    tokenAddress TEXT NOT NULL,
+    observed_at  REAL NOT NULL,
+    price        REAL,
+    marketCap    REAL,
+    liquidity    REAL,
+    volume       REAL,
+    holders      REAL,
+    age          REAL
+);
+CREATE INDEX IF NOT EXISTS snapshots_address_time ON snapshots (tokenAddress, observed_at);
+"""
+
+UPSERT_TOKEN = """
+INSERT INTO tokens (chainId, tokenAddress, name, url, icon, links, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (chainId, tokenAddress) DO UPDATE SET
+    name = COALESCE(excluded.name, name),
+    url = COALESCE(excluded.url, url),
+    icon = COALESCE(excluded.icon, icon),
+    links = excluded.links,
+    last_seen = excluded.last_seen
+"""
+
+INSERT_SNAPSHOT = f"""
+INSERT INTO snapshots (chainId, tokenAddress, observed_at, {", ".join(MARKET_COLUMNS)})
+VALUES (?, ?, ?, {", ".join("?" for _ in MARKET_COLUMNS)})
+"""
+
+# Each token with its most recent snapshot (if any)
+SELECT_TOKENS = f"""
+SELECT t.chainId, t.tokenAddress, t.name, t.url, t.icon, t.links,
+       {", ".join(f"s.{column}" for column in MARKET_COLUMNS)}, s.observed_at
+FROM tokens AS t
+LEFT JOIN snapshots AS s ON s.rowid = (
+    SELECT rowid FROM snapshots
+    WHERE tokenAddress = t.tokenAddress AND chainId = t.chainId
+    ORDER BY observed_at DESC LIMIT 1
+)
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer (or each other)
+    connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; skips an fsync per commit
+    return connection
+
+
+def _row_to_token(row, now: float) -> Token:
+    chain_id, address, name, url, icon, links = row[:6]
+    market = dict(zip(MARKET_COLUMNS, row[6:-1]))
+    observed_at = row[-1]
+    if market.get("age") is not None and observed_at is not None:
+        market["age"] += (now - observed_at) / 86400  # Age now, not at the snapshot
+    return Token(
+        tokenAddress=address, chainId=chain_id, url=url, icon=icon, name=name,
+        links=tuple(json.loads(links)) if links else (), **market,
+    )
+
+
+################################################################################
+# HISTORY STORE
+################################################################################
+
+class HistoryStore:
+    """
+    Records every observed token, and every enriched market snapshot, in an
+    SQLite database in WAL mode. record() only queues the batch: a writer
+    thread commits queued batches together, so polling threads never wait on
+    the disk. Reads use one connection per thread.
+    """
+
+    def __init__(self, path: str = HISTORY_DB):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with _connect(path) as connection:
+            connection.executescript(SCHEMA)
+
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, tokens: list, observed_at: float = None) -> None:
+        """ Queues a polled batch for writing. """
+        if tokens:
+            self._queue.put((time.time() if observed_at is None else observed_at, tokens))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until everything queued so far has been committed (or the
+        timeout); returns whether it was.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _write_loop(self) -> None:
+        connection = _connect(self.path)
+        while True:
+            batches, waiters, count = [], [], 0
+            item = self._queue.get()
+            deadline = time.monotonic() + WRITE_INTERVAL
+
+            # Gather whatever else arrives shortly after, up to WRITE_BATCH_SIZE tokens
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    if not batches:
+                        break
+                else:
+                    batches.append(item)
+                    count += len(item[1])
+                if waiters or count >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(connection, batches)
+            except sqlite3.Error as e:
+                print(f"Error writing token history: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, connection: sqlite3.Connection, batches: list) -> None:
+        token_rows, snapshot_rows = [], []
+        for observed_at, tokens in batches:
+            for token in tokens:
+                token_rows.append((
+                    token.chainId, token.tokenAddress, token.name, token.url, token.icon,
+                    json.dumps(token.links), observed_at, observed_at,
+                ))
+                market = [getattr(token, column) for column in MARKET_COLUMNS]
+                if any(value is not None for value in market):
+                    snapshot_rows.append((token.chainId, token.tokenAddress, observed_at, *market))
+
+        if not token_rows:
+            return
+        with connection:  # One transaction per batch
+            connection.executemany(UPSERT_TOKEN, token_rows)
+            connection.executemany(INSERT_SNAPSHOT, snapshot_rows)
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = _connect(self.path)
+        return connection
+
+    def recent_tokens(self, chain_id: str = None, minutes: float = None, limit: int = WARM_START_LIMIT) -> list:
+        """
+        Returns tokens first seen in the last 'minutes' (any time when None),
+        on 'chain_id' when given, newest first, with their latest market data
+        (age counted up to now).
+        """
+        where, params = [], []
+        if chain_id:
+            where.append("t.chainId = ?")
+            params.append(chain_id)
+        if minutes is not None:
+            where.append("t.first_seen >= ?")
+            params.append(time.time() - minutes * 60)
+
+        sql = SELECT_TOKENS
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.first_seen DESC, t.rowid LIMIT ?"  # Ties keep API order (newest first)
+        params.append(limit)
+
+        now = time.time()
+        return [_row_to_token(row, now) for row in self._reader().execute(sql, params)]
+
+    def token_history(self, token_address: str, chain_id: str = None, limit: int = 1000) -> list:
+        """
+        Returns a token's market snapshots, oldest first, as dicts with
+        observed_at plus the market fields.
+        """
+        sql = f"SELECT observed_at, {', '.join(MARKET_COLUMNS)} FROM snapshots WHERE tokenAddress = ?"
+        params = [token_address]
+        if chain_id:
+            sql += " AND chainId = ?"
+            params.append(chain_id)
+        sql += " ORDER BY observed_at DESC LIMIT ?"
+        params.append(limit)
+
+        columns = ("observed_at",) + MARKET_COLUMNS
+        rows = self._reader().execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in reversed(rows)]
+
+
+_history_store = None
+_history_lock = threading.Lock()
+
+
+def get_history_store():
+    """
+    Returns the process-wide history store, or None when history is
+    disabled (SOLSNIPER_HISTORY=0) or the database can't be opened.
+    The writer thread is a daemon, so batches still queued are flushed at exit.
+    """
+    global _history_store, HISTORY_ENABLED
+
+    with _history_lock:
+        if _history_store is None and HISTORY_ENABLED:
+            try:
+                _history_store = HistoryStore(HISTORY_DB)
+                atexit.register(_history_store.flush, FLUSH_TIMEOUT)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Token history disabled: {e}")
+                HISTORY_ENABLED = False
+
+    return _history_store
+
+
+def record_tokens(tokens: list) -> None:
+    """ Queues a polled batch for the history store, if it's enabled. """
+    store = get_history_store()
+    if store is not None:
+        store.record(tokens)
+
+
+def flush_history(timeout: float = FLUSH_TIMEOUT) -> None:
+    """ Waits for queued batches to reach the history database; entry points call it on the way out. """
+    if _history_store is not None:
+        _history_store.flush(timeout)
+
+
+def warm_start_tokens(chain_id: str = None, limit: int = WARM_START_LIMIT) -> list:
+    """ Returns the most recently discovered tokens from history, newest first ([] without history). """
+    store = get_history_store()
+    if store is None:
+        return []
+    try:
+        return store.recent_tokens(chain_id, limit=limit)
+    except sqlite3.Error as e:
+        print(f"Error reading token history: {e}")
+        return []
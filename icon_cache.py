@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+CACHE_DIR = os.environ.get(
+    "SOLSNIPER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "solsniper")
+)
+ICON_CACHE_DIR = os.path.join(CACHE_DIR, "icons")
+
+ICON_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Disk budget for cached thumbnails
+ICON_MEMORY_ENTRIES = 512  # Decoded thumbnails kept in the in-memory LRU
+ICON_REVALIDATE_AFTER = 3600  # Seconds before a cached icon is revalidated upstream
+
+
+################################################################################
+# CACHE ENTRIES
+################################################################################
+
+class CachedIcon:
+    """
+    One cached thumbnail: the PNG bytes stored on disk, the validators needed
+    to revalidate it (ETag / Last-Modified) and the decoded image, which is
+    created lazily and then shared by every reader.
+    """
+
+    __slots__ = ("data", "etag", "last_modified", "checked_at", "_image")
+
+    def __init__(self, data: bytes, etag=None, last_modified=None, checked_at=None, image=None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = checked_at if checked_at is not None else time.time()
+        self._image = image
+
+    @property
+    def image(self):
+        if self._image is None:
+            from PIL import Image  # Deferred so importing CACHE_DIR stays cheap
+
+            img = Image.open(BytesIO(self.data))
+            img.load()
+            self._image = img
+        return self._image
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.checked_at < ICON_REVALIDATE_AFTER
+
+    def validators(self) -> dict:
+        """ Returns the conditional request headers for revalidating this icon. """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def encode_png(img) -> bytes:
+    """
+    Encodes an image as PNG bytes, converting modes PNG can't store.
+    """
+    if img.mode not in ("1", "L", "LA", "P", "RGB", "RGBA", "I"):
+        img = img.convert("RGBA")
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+################################################################################
+# ICON CACHE
+################################################################################
+
+class IconCache:
+    """
+    Content-addressed thumbnail cache keyed by icon URL and thumbnail variant.
+    An in-memory LRU of decoded images sits in front of a size-capped directory
+    of PNG files; the least recently used files are evicted first.
+    """
+
+    def __init__(self, directory: str = ICON_CACHE_DIR, max_bytes: int = ICON_CACHE_MAX_BYTES,
+                 memory_entries: int = ICON_MEMORY_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # Computed on first write
+
+    @staticmethod
+    def key(icon_url: str, variant: str) -> str:
+        return hashlib.sha256(f"{icon_url}|{variant}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".png", base + ".json"
+
+    def _remember(self, key: str, entry: CachedIcon) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, icon_url: str, variant: str):
+        """
+        Returns the CachedIcon for 'icon_url' / 'variant', or None on a miss.
+        """
+        key = self.key(icon_url, variant)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        png_path, meta_path = self._paths(key)
+        try:
+            with open(png_path, "rb") as f:
+                data = f.read()
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(png_path)  # Mark as recently used for eviction
+        except (OSError, ValueError):
+            return None
+
+        entry = CachedIcon(data, meta.get("etag"), meta.get("last_modified"), meta.get("checked_at"))
+        self._remember(key, entry)
+        return entry
+
+    def put(self, icon_url: str, variant: str, img, etag=None, last_modified=None) -> CachedIcon:
+        """
+        Stores an already-thumbnailed image and returns its CachedIcon.
+        """
+        return self.put_png(icon_url, variant, encode_png(img), etag, last_modified, image=img)
+
+    def put_png(self, icon_url: str, variant: str, data: bytes, etag=None, last_modified=None,
+                image=None) -> CachedIcon:
+        """
+        Stores an already-thumbnailed image given as PNG bytes and returns its CachedIcon.
+        """
+        key = self.key(icon_url, variant)
+        entry = CachedIcon(data, etag, last_modified, image=image)
+        self._remember(key, entry)
+
+        png_path, meta_path = self._paths(key)
+        try:
+            replaced = os.path.getsize(png_path)  # A refreshed icon overwrites its old file
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(os.path.dirname(png_path), exist_ok=True)
+            self._write(png_path, entry.data)
+            self._write_meta(meta_path, icon_url, entry)
+        except OSError as e:
+            print(f"Error writing icon cache: {e}")
+            return entry
+
+        self._account(len(entry.data), replaced)
+        return entry
+
+    def touch(self, icon_url: str, variant: str, entry: CachedIcon) -> None:
+        """
+        Records a successful revalidation (HTTP 304) of 'entry'.
+        """
+        entry.checked_at = time.time()
+        _, meta_path = self._paths(self.key(icon_url, variant))
+        try:
+            self._write_meta(meta_path, icon_url, entry)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # Atomic, so readers never see half a file
+
+    def _write_meta(self, meta_path: str, icon_url: str, entry: CachedIcon) -> None:
+        meta = {
+            "url": icon_url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "checked_at": entry.checked_at,
+        }
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _scan(self) -> list:
+        files = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith(".png"):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _account(self, added: int, replaced: int = 0) -> None:
+        """ Counts a written file of 'added' bytes that overwrote one of 'replaced' bytes. """
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._disk_bytes += added - replaced
+
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Deletes the least recently used files until the cache is back under
+        90% of its budget. Must be called with the lock held.
+        """
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+
+        for _, size, png_path in files:
+            if total <= target:
+                break
+            for path in (png_path, png_path[:-len(".png")] + ".json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+        self._disk_bytes = total
+
+
+_icon_cache = None
+
+
+def get_icon_cache() -> IconCache:
+    """
+    Returns the process-wide icon cache, creating it on first use.
+    """
+    global _icon_cache
+
+    if _icon_cache is None:
+        _icon_cache = IconCache()
+
+    return _icon_cache
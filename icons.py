@@ -0,0 +1,207 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from PIL import Image
+
+import requests
+
+import metrics
+from dexscreener import TIMEOUT, get_session
+from icon_cache import encode_png, get_icon_cache
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+ICON_WORKERS = 8  # Maximum number of icons downloaded at the same time
+MAX_ICON_PIXELS = 4096 * 4096  # Bigger images are rejected before decoding (decompression bombs)
+
+# Decode worker processes. They're started with forkserver (spawn where there's none), never
+# forked from the front-ends, which already run Tk, poller and HTTP threads by then
+DECODE_PROCESSES = int(os.environ.get("SOLSNIPER_DECODE_PROCESSES", os.cpu_count() or 1))
+DECODE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+PROCESS_DECODE_MIN_BYTES = 32 * 1024  # Smaller icons decode faster in place than the trip to a worker takes
+
+_executor = None
+_decode_pool = None
+_decode_pool_lock = threading.Lock()  # Icon threads ask for the pool concurrently
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared, bounded thread pool used for icon downloads.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ICON_WORKERS, thread_name_prefix="icon")
+
+    return _executor
+
+
+def get_decode_pool():
+    """
+    Returns the shared process pool that decodes and shrinks large icons,
+    or None when DECODE_PROCESSES is 0.
+    """
+    global _decode_pool
+
+    with _decode_pool_lock:
+        if _decode_pool is None and DECODE_PROCESSES > 0:
+            _decode_pool = _new_decode_pool()
+
+    return _decode_pool
+
+
+def _new_decode_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=DECODE_PROCESSES, mp_context=multiprocessing.get_context(DECODE_START_METHOD)
+    )
+
+
+def replace_decode_pool(broken) -> None:
+    """
+    Swaps a broken decode pool (one of its workers died, e.g. killed) for a
+    fresh one and shuts the old one down without waiting. Threads that hit
+    the same broken pool only replace it once.
+    """
+    global _decode_pool
+
+    with _decode_pool_lock:
+        if _decode_pool is not broken:
+            return  # Already replaced by another thread
+        _decode_pool = _new_decode_pool()
+
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+################################################################################
+# DECODING ICONS
+################################################################################
+
+def make_thumbnail(data: bytes, size=None, exact: bool = False) -> bytes:
+    """
+    Decodes an image and returns it as PNG bytes, shrunk with thumbnail() to
+    fit 'size', or resized to exactly 'size' when 'exact' is set.
+    JPEGs are decoded straight at a reduced scale (draft mode) and other
+    formats are shrunk by an integer factor with reduce() before resampling,
+    so a large icon never costs a full-resolution resample.
+    Raises ValueError for images over MAX_ICON_PIXELS, before decoding them.
+    """
+    img = Image.open(BytesIO(data))
+    width, height = img.size
+    if width * height > MAX_ICON_PIXELS:
+        raise ValueError(f"Icon too large to decode ({width}x{height})")
+
+    if size:
+        img.draft(None, size)  # JPEG only; a no-op for other formats
+        if img.mode == "P":
+            img = img.convert("RGBA")  # Palette images would otherwise be resampled with NEAREST
+        if exact:
+            img = img.resize(size, reducing_gap=2.0)
+        else:
+            img.thumbnail(size, reducing_gap=2.0)
+    else:
+        img.load()
+
+    return encode_png(img)
+
+
+def decode_icon(data: bytes, size=None, exact: bool = False) -> bytes:
+    """
+    Runs make_thumbnail() on the decode process pool for large icons, so
+    decoding a batch uses every core; small ones are decoded in place.
+    """
+    pool = get_decode_pool() if len(data) >= PROCESS_DECODE_MIN_BYTES else None
+    if pool is not None:
+        try:
+            return pool.submit(make_thumbnail, data, size, exact).result()
+        except BrokenProcessPool:
+            replace_decode_pool(pool)  # This icon is decoded in place below
+    return make_thumbnail(data, size, exact)
+
+
+################################################################################
+# FETCHING ICONS
+################################################################################
+
+def icon_variant(size=None, exact: bool = False) -> str:
+    """
+    Names the thumbnail variant a front-end asks for, e.g. "100x100" for
+    thumbnail((100, 100)), "50x50!" for resize((50, 50)) or "orig".
+    """
+    if not size:
+        return "orig"
+    return f"{size[0]}x{size[1]}{'!' if exact else ''}"
+
+
+def load_icon(icon_url: str, size=None, exact: bool = False) -> Image.Image:
+    """
+    Returns a single icon as a fully decoded PIL image.
+    When 'size' is given the image is shrunk with thumbnail(), or resized to
+    exactly 'size' when 'exact' is set (see make_thumbnail()).
+    Thumbnails come from the icon cache when fresh; stale entries are
+    revalidated with ETag / Last-Modified, and served as-is if upstream fails.
+    Raises on network errors or when the response isn't an image.
+    """
+    cache = get_icon_cache()
+    variant = icon_variant(size, exact)
+
+    cached = cache.get(icon_url, variant)
+    if cached is not None and cached.is_fresh():
+        return cached.image
+
+    try:
+        with metrics.timer("icon_fetch"):
+            response = get_session().get(
+                icon_url, headers=cached.validators() if cached else None, timeout=TIMEOUT
+            )
+    except requests.exceptions.RequestException:
+        if cached is not None:
+            return cached.image
+        raise
+
+    if response.status_code == 304 and cached is not None:
+        cache.touch(icon_url, variant, cached)
+        return cached.image
+
+    if response.status_code != 200 or "image" not in response.headers.get("Content-Type", ""):
+        raise ValueError(f"{icon_url} - Not a valid image")
+
+    with metrics.timer("icon_decode"):
+        entry = cache.put_png(
+            icon_url, variant, decode_icon(response.content, size, exact),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return entry.image  # Decode the small thumbnail now, on the worker thread, not later while rendering
+
+
+def prefetch_icons(tokens: list, size=None, exact: bool = False, on_error=print) -> dict:
+    """
+    Downloads and decodes the icons of a batch of tokens concurrently.
+    Returns a dict mapping icon URL -> PIL image; icons that fail to load are
+    reported through 'on_error' and left out.
+    """
+    icon_urls = {token.icon for token in tokens if token.icon}
+    if not icon_urls:
+        return {}
+
+    futures = {
+        icon_url: get_executor().submit(load_icon, icon_url, size, exact)
+        for icon_url in icon_urls
+    }
+
+    icons = {}
+    for icon_url, future in futures.items():
+        try:
+            icons[icon_url] = future.result()
+        except Exception as e:
+            metrics.increment("errors", kind="icon")
+            on_error(f"Error loading icon: {e}")
+
+    return icons
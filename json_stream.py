@@ -0,0 +1,133 @@
+import codecs
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is the fallback
+    orjson = None
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+STREAM_CHUNK_SIZE = 16 * 1024  # Bytes read from the response per step
+MAX_DRAIN_BYTES = 64 * 1024  # Unread body we still consume so the connection can be reused
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def loads(data):
+    """
+    Parses a whole JSON document (bytes or str) with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+################################################################################
+# INCREMENTAL PARSING
+################################################################################
+
+def iter_json_items(chunks, key: str = None):
+    """
+    Yields the elements of a JSON array as they arrive from an iterable of
+    byte chunks, decoding one element at a time, so a consumer that stops
+    early never reads or parses the rest of the body.
+    A top-level object is parsed whole and the array under 'key' is yielded
+    instead (nothing when there is none).
+    Raises ValueError on malformed JSON.
+    """
+    chunks = iter(chunks)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, exhausted = "", 0, False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, exhausted
+        if exhausted:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            text = utf8.decode(b"", final=True)
+        else:
+            text = utf8.decode(chunk)
+        buffer = buffer[pos:] + text  # Drop what has been consumed, so memory tracks one element
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not read_more():
+                return False
+
+    if not skip_whitespace():
+        return
+
+    if buffer[pos] == "{":
+        while read_more():
+            pass
+        data = loads(buffer[pos:])
+        items = data.get(key) if key else None
+        if isinstance(items, list):
+            yield from items
+        return
+
+    if buffer[pos] != "[":
+        raise ValueError(f"Expected a JSON array or object, got {buffer[pos]!r}")
+    pos += 1
+
+    if skip_whitespace() and buffer[pos] == "]":
+        return
+
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of JSON array")
+
+        while True:
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if read_more():
+                    continue
+                raise
+            # A number cut off by the chunk boundary ("1" of "1.5") needs the next chunk
+            if exhausted or (end < len(buffer) and buffer[end] not in _NUMBER_CHARS):
+                break
+            if not read_more():
+                break
+
+        pos = end
+        yield item
+
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of JSON array")
+        if buffer[pos] == "]":
+            return
+        if buffer[pos] != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[pos]!r}")
+        pos += 1
+
+
+def release_response(response, max_drain: int = MAX_DRAIN_BYTES) -> None:
+    """
+    Finishes with a streamed response that was only partly read. A small
+    remainder is drained so the keep-alive connection goes back to the pool;
+    a large one is cut off by closing the connection instead.
+    """
+    drained = 0
+    try:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            drained += len(chunk)
+            if drained > max_drain:
+                break
+    except Exception:
+        pass  # Whatever went wrong, close() below cleans up
+    response.close()
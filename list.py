@@ -1,229 +1,282 @@
-import sys
-import webbrowser
-import requests
-import streamlit as st
-from PIL import Image
-import threading
-import time
-from io import BytesIO
-
-################################################################################
-# GLOBAL CONSTANTS & CONFIG
-################################################################################
-
-API_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
-FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/58.0.3029.110 Safari/537.36"
-    )
-}
-
-# Adjusted for a futuristic full-width solid line
-SOLID_LINE = "█" * 150
-
-
-################################################################################
-# UI & LOGGING
-################################################################################
-
-def initialize_log_area():
-    """ Initialize log area in session state if it doesn't exist. """
-    if "log_area" not in st.session_state:
-        st.session_state.log_area = ""  # Initialize log_area if not yet set
-
-def append_to_log(message: str, extra_newline: bool = True) -> None:
-    """
-    Appends plain text to the log with optional extra spacing.
-    """
-    initialize_log_area()  # Ensure the log_area is initialized
-
-    # Add a newline if specified
-    new_message = f"{message}\n\n" if extra_newline else f"{message}\n"
-
-    # Add new message to the log
-    st.session_state.log_area += new_message
-
-
-def display_logs():
-    """ Render logs using Streamlit once the session state is updated. """
-    if "log_area" in st.session_state:
-        st.text_area("Logs", value=st.session_state.log_area, height=300, max_chars=None, key="log_area", disabled=True)
-
-
-################################################################################
-# HYPERLINK HANDLING
-################################################################################
-
-hyperlinks_map = {}
-hyperlink_id = 0
-
-
-def add_hyperlink(url: str, display_text: str) -> None:
-    """
-    Inserts 'display_text' as a clickable link in the log which, when clicked, opens 'url' in the default web browser.
-    """
-    global hyperlink_id
-
-    tag_name = f"hyper-{hyperlink_id}"
-    hyperlink_id += 1
-
-    st.markdown(f"[{display_text}]({url})")
-
-
-################################################################################
-# FETCHING & DISPLAYING TOKENS
-################################################################################
-
-def get_token_data() -> list:
-    """
-    Fetches token data from Dexscreener, returns a list of token dictionaries.
-    Only extracts these fields:
-      url (clickable link)
-      tokenAddress
-      icon (image)
-      links
-      price
-      marketCap
-      liquidity
-      volume
-      holders
-      age
-    """
-    try:
-        response = requests.get(API_URL, headers=HEADERS)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if isinstance(data, dict) and "tokens" in data:
-            tokens = data["tokens"]  # Adjust this line according to actual response structure
-        elif isinstance(data, list):
-            tokens = data
-        else:
-            return []  # If the response isn't as expected
-
-        # Return the first 30 tokens
-        return tokens[:30] if tokens else []
-
-    except requests.exceptions.RequestException as e:
-        append_to_log(f"Error fetching data: {e}")  # Log any errors that occur
-        return []
-
-
-def display_token(token: dict, index: int):
-    """
-    Inserts token info into the display area in the order:
-      1) token name (bold)
-      2) price (above market cap)
-      3) market cap
-      4) liquidity
-      5) 24-hour volume
-      6) holders
-      7) age (below holders)
-      8) tokenAddress
-      9) icon (image)
-      10) links (clickable)
-    Then inserts the black line.
-    """
-    # Number the tokens in order
-    st.markdown(f"### Token #{index}")
-
-    # Displaying the icon as an image
-    icon_url = token.get("icon", "")
-    if icon_url:
-        try:
-            # Fetch the icon image
-            response = requests.get(icon_url)
-            img_data = response.content
-            img = Image.open(BytesIO(img_data))
-
-            # Display the image in the Streamlit app
-            st.image(img, caption="Token Icon", use_container_width=True)
-        except Exception as e:
-            append_to_log(f"Error loading icon: {e}")
-
-    # Price (above market cap)
-    price = token.get("price", "N/A")
-    st.markdown(f"**Price**: {price}")
-
-    # Token Metrics (Market Cap, Liquidity, 24 Hour Volume, and Holders)
-    market_cap = token.get("marketCap", "N/A")
-    liquidity = token.get("liquidity", "N/A")
-    volume = token.get("volume", "N/A")
-    holders = token.get("holders", "N/A")
-
-    st.markdown(f"**Market Cap**: {market_cap}")
-    st.markdown(f"**Liquidity**: {liquidity}")
-    st.markdown(f"**24h Volume**: {volume}")
-    st.markdown(f"**Holders**: {holders}")
-
-    # Age (below holders)
-    age = token.get("age", "N/A")
-    st.markdown(f"**Age**: {age}")
-
-    # tokenAddress
-    st.markdown(f"**tokenAddress**:\n  {token['tokenAddress']}")
-
-    # URL as clickable link
-    if token["url"] and token["url"] != "N/A":
-        add_hyperlink(token["url"], token["url"])
-    else:
-        st.markdown("**URL**: N/A")
-
-    # links - Safely check if the key 'links' exists in the token
-    links_list = token.get("links", [])
-    if links_list:
-        st.markdown("**Links**:")
-        for link in links_list:
-            add_hyperlink(link, link)
-    else:
-        st.markdown("**Links**: None")
-
-
-################################################################################
-# BACKGROUND & UI CONTROL
-################################################################################
-
-def background_search():
-    append_to_log("Starting token search...")
-
-    tokens = get_token_data()
-    if tokens:
-        # Filter tokens based on market cap, holders, and age
-        filtered_tokens = [
-            token for token in tokens
-            if token.get("marketCap", 0) < 5000000 and token.get("holders", 0) < 2000 and token.get("age", 0) < 2
-        ]
-
-        append_to_log(f"Found {len(filtered_tokens)} tokens that meet the criteria.")
-
-        for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
-            display_token(token, i)
-    else:
-        append_to_log("No tokens found this round.")
-
-
-def fetch_process():
-    append_to_log("Fetching new token data...")
-    background_search()
-
-
-def main():
-    st.title("Nexgonic SOLETH Token Sniper")
-    st.subheader("Prolif SOL Sniper v1")
-
-    st.sidebar.header("Controls")
-    fetch_button = st.sidebar.button("Fetch Tokens")
-
-    if fetch_button:
-        fetch_process()
-
-    display_logs()
-
-
-if __name__ == "__main__":
-    main()
+import os
+import sys
+import webbrowser
+import streamlit as st
+import threading
+import time
+from collections import deque
+
+from dexscreener import fetch_token_profiles, get_token_data
+from enrichment import enrich_tokens
+from feed_hub import get_hub_client, hub_tokens
+from filters import load_filter
+from history import record_tokens, warm_start_tokens
+import metrics
+from icons import prefetch_icons
+from poller import AdaptiveSchedule, poll_once
+from ranking import Ranking, load_ranking
+from streamlit_metrics import show_metrics_panel
+from timeseries import ROC_WINDOW, get_series_store, record_series
+from tokens import Token, display_value
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
+RERUN_WAIT = 2  # Longest (in seconds) auto-poll blocks the script between reruns, so the controls stay responsive
+ICON_SIZE = (150, 150)  # Icons are decoded straight to the size they're shown at
+LOG_MAX_MESSAGES = 200  # Log messages kept per session; older ones scroll out
+
+# Filter spec (name in filter_specs/ or path to a JSON/YAML file), compiled once
+FILTER_SPEC = os.environ.get("SOLSNIPER_FILTER", "strict")
+TOKEN_FILTER = load_filter(FILTER_SPEC)
+
+# Adjusted for a futuristic full-width solid line
+SOLID_LINE = "█" * 150
+
+
+################################################################################
+# UI & LOGGING
+################################################################################
+
+def initialize_log_area():
+    """ Initialize log area in session state if it doesn't exist. """
+    if "log_messages" not in st.session_state:
+        st.session_state.log_messages = deque(maxlen=LOG_MAX_MESSAGES)  # Bounded, however long auto-poll runs
+
+def append_to_log(message: str, extra_newline: bool = True) -> None:
+    """
+    Appends plain text to the log with optional extra spacing.
+    """
+    initialize_log_area()  # Ensure the log_area is initialized
+
+    # Add a newline if specified
+    new_message = f"{message}\n\n" if extra_newline else f"{message}\n"
+
+    # Add new message to the log, dropping the oldest one once it's full
+    st.session_state.log_messages.append(new_message)
+
+
+def display_logs():
+    """ Render logs using Streamlit once the session state is updated. """
+    if "log_messages" in st.session_state:
+        log_area = "".join(st.session_state.log_messages)
+        st.text_area("Logs", value=log_area, height=300, max_chars=None, disabled=True)
+
+
+################################################################################
+# HYPERLINK HANDLING
+################################################################################
+
+hyperlinks_map = {}
+hyperlink_id = 0
+
+
+def add_hyperlink(url: str, display_text: str) -> None:
+    """
+    Inserts 'display_text' as a clickable link in the log which, when clicked, opens 'url' in the default web browser.
+    """
+    global hyperlink_id
+
+    tag_name = f"hyper-{hyperlink_id}"
+    hyperlink_id += 1
+
+    st.markdown(f"[{display_text}]({url})")
+
+
+################################################################################
+# FETCHING & DISPLAYING TOKENS
+################################################################################
+
+def display_token(token: Token, index: int, icon=None):
+    """
+    Inserts token info into the display area in the order:
+      1) token name (bold)
+      2) price (above market cap)
+      3) market cap
+      4) liquidity
+      5) 24-hour volume
+      6) holders
+      7) age (below holders), then the price trend and any liquidity drain
+      8) tokenAddress
+      9) icon (image, already downloaded and decoded by prefetch_icons)
+      10) links (clickable)
+    Then inserts the black line.
+    """
+    # Number the tokens in order
+    st.markdown(f"### Token #{index}")
+
+    # Displaying the icon as an image
+    if icon is not None:
+        st.image(icon, caption="Token Icon", width=ICON_SIZE[0])
+
+    # Price (above market cap)
+    price = display_value(token.price)
+    st.markdown(f"**Price**: {price}")
+
+    # Token Metrics (Market Cap, Liquidity, 24 Hour Volume, and Holders)
+    market_cap = display_value(token.marketCap)
+    liquidity = display_value(token.liquidity)
+    volume = display_value(token.volume)
+    holders = display_value(token.holders)
+
+    st.markdown(f"**Market Cap**: {market_cap}")
+    st.markdown(f"**Liquidity**: {liquidity}")
+    st.markdown(f"**24h Volume**: {volume}")
+    st.markdown(f"**Holders**: {holders}")
+
+    # Age (below holders)
+    age = display_value(token.age)
+    st.markdown(f"**Age**: {age}")
+
+    # Trend over the last polls, from the token's recorded series
+    series = get_series_store().get(token.key())
+    if series is not None and len(series) > 1:
+        price_change = series.roc("price")
+        if price_change is not None:
+            st.markdown(f"**Price Trend**: {price_change:+.1%} over {min(ROC_WINDOW, len(series) - 1)} polls")
+        if series.draining:
+            st.markdown(f"**Liquidity Drain**: {series.indicator('liquidity_drain'):.0%} pulled")
+
+    # tokenAddress
+    st.markdown(f"**tokenAddress**:\n  {token.tokenAddress}")
+
+    # URL as clickable link
+    if token.url and token.url != "N/A":
+        add_hyperlink(token.url, token.url)
+    else:
+        st.markdown("**URL**: N/A")
+
+    # links - an empty tuple when the token has none
+    links_list = token.links
+    if links_list:
+        st.markdown("**Links**:")
+        for link in links_list:
+            add_hyperlink(link, link)
+    else:
+        st.markdown("**Links**: None")
+
+
+################################################################################
+# BACKGROUND & UI CONTROL
+################################################################################
+
+def background_search(tokens=None, enriched=False):
+    append_to_log("Starting token search...")
+
+    if tokens is None:
+        tokens = hub_tokens()  # Batches from the feed hub are enriched and recorded already
+        enriched = tokens is not None
+    if tokens is None:
+        tokens = get_token_data(on_error=append_to_log, chains=TOKEN_FILTER.chains)
+    if tokens:
+        if not enriched:
+            tokens = enrich_tokens(tokens, on_error=append_to_log)
+            record_tokens(tokens)
+
+        # Filter tokens with the compiled filter spec (market cap, holders, age and liquidity drain by default)
+        record_series(tokens)  # The drain rule and the ranking read each token's recorded series
+        filtered_tokens = TOKEN_FILTER.apply(tokens)
+        get_ranking().update(tokens, keep=TOKEN_FILTER.matches)
+
+        append_to_log(f"Found {len(filtered_tokens)} tokens that meet the criteria.")
+        display_top_tokens(get_ranking().top(5))
+    else:
+        append_to_log("No tokens found this round.")
+
+
+@st.cache_resource
+def get_ranking() -> Ranking:
+    """ Returns the process-wide token ranking, so scores carry over between polls and reruns. """
+    return load_ranking(FILTER_SPEC)
+
+
+def display_top_tokens(filtered_tokens: list):
+    icons = prefetch_icons(filtered_tokens[:5], size=ICON_SIZE, on_error=append_to_log)  # Download the page's icons concurrently
+    with metrics.timer("render"):
+        for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
+            display_token(token, i, icons.get(token.icon))
+
+
+def warm_start_process():
+    """
+    Shows the tokens found in earlier sessions until the first fetch.
+    """
+    ranking = get_ranking()
+    if not len(ranking):
+        ranking.update(warm_start_tokens(), keep=TOKEN_FILTER.matches)
+    filtered_tokens = ranking.top(5)
+    if filtered_tokens:
+        append_to_log(f"Showing the top {len(filtered_tokens)} tokens seen so far. Fetch for the latest.")
+        display_top_tokens(filtered_tokens)
+
+
+def fetch_process():
+    append_to_log("Fetching new token data...")
+    background_search()
+
+
+def poll_process():
+    """
+    Runs one scheduled poll if it's due and returns the delay (in seconds)
+    until the next one; until then the ranked tokens are shown again.
+    The schedule lives in session state so it adapts across reruns.
+    With a feed hub running, shows its latest batch and returns None instead.
+    """
+    hub = get_hub_client()
+    if hub is not None:
+        if hub.version != st.session_state.get("hub_version"):
+            append_to_log(f"Following the feed hub (update {hub.version})...")
+            st.session_state.hub_version = hub.version
+            background_search(hub.latest(), enriched=True)
+        else:
+            display_top_tokens(get_ranking().top(5))
+        return None
+
+    if "schedule" not in st.session_state:
+        st.session_state.schedule = AdaptiveSchedule(FETCH_INTERVAL)
+    schedule = st.session_state.schedule
+    if schedule.next_delay() > 0:
+        display_top_tokens(get_ranking().top(5))
+        return schedule.next_delay()
+
+    append_to_log("Polling for new token data...")
+    background_search(poll_once(fetch_token_profiles, schedule, on_error=append_to_log))
+    return schedule.next_delay()
+
+
+def main():
+    st.title("Nexgonic SOLETH Token Sniper")
+    st.subheader("Prolif SOL Sniper v1")
+
+    st.sidebar.header("Controls")
+    fetch_button = st.sidebar.button("Fetch Tokens")
+    auto_poll = st.sidebar.checkbox("Auto-Poll", help=f"Fetch continuously every ~{FETCH_INTERVAL}s, faster while "
+                                                      "new tokens arrive and slower when the API throttles us.")
+
+    next_poll = None
+    if auto_poll:
+        next_poll = poll_process()
+    elif fetch_button:
+        fetch_process()
+    else:
+        warm_start_process()
+
+    display_logs()
+    show_metrics_panel()
+
+    # Wait for the next poll (or the hub's next push), at most RERUN_WAIT at a time so a click or
+    # unticking Auto-Poll takes effect quickly; the rerun polls only once the schedule says so
+    if next_poll is not None:
+        time.sleep(min(next_poll, RERUN_WAIT))
+        st.rerun()
+    elif auto_poll:
+        hub = get_hub_client()  # Gone by now if the hub stopped; the rerun then polls locally
+        if hub is not None:
+            hub.wait_for_update(st.session_state.hub_version, timeout=RERUN_WAIT)
+        st.rerun()
+
+
+if __name__ == "__main__":
+    main()
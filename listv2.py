@@ -1,184 +1,234 @@
-import requests
-import webbrowser
-import streamlit as st
-from PIL import Image
-from io import BytesIO
-import base64
-
-# Set page config first, before any other Streamlit commands
-st.set_page_config(page_title="Soleth Ai Sniper v1 BETA", layout="wide")
-
-# 🔒 Password protection using session state
-PASSWORD = "early"
-
-if "authenticated" not in st.session_state:
-    st.session_state.authenticated = False
-
-# Fetch image dynamically for authentication page
-logo_url = "https://nextgenspeed.com/wp-content/uploads/2025/01/bannerlogo.png"
-response = requests.get(logo_url)
-
-if response.status_code == 200:
-    img = Image.open(BytesIO(response.content))
-    img_buffer = BytesIO()
-    img.save(img_buffer, format="PNG")
-    img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-
-    # Centered image at the top of the authentication page
-    st.markdown(f"""
-        <style>
-            .auth-logo-container {{
-                text-align: center;
-                margin-bottom: 20px;
-            }}
-            .auth-logo {{
-                width: 300px;
-                height: auto;
-                display: inline-block;
-            }}
-        </style>
-      
-    """, unsafe_allow_html=True)
-
-if not st.session_state.authenticated:
-    st.title("🔒 Access Restricted")
-    password = st.text_input("Enter Password", type="password")
-    
-    if st.button("Login"):
-        if password == PASSWORD:
-            st.session_state.authenticated = True  # Store authentication status
-            st.success("✅ Access granted! Welcome to Soleth Ai Sniper v1 BETA")
-            st.rerun()  # 🔄 Reload the app UI to show tokens
-        else:
-            st.warning("❌ Incorrect password. Try again.")
-
-    st.stop()  # Prevents the rest of the app from running until authenticated
-
-# ✅ If the password is correct, continue to fetch & display tokens
-st.success("✅ Access granted! Welcome to Soleth Ai Sniper v1 BETA")
-
-# Full-width image in main app
-st.markdown(f"""
-    <style>
-        .full-width-img {{
-            width: 100%;
-            height: auto;
-            display: block;
-            margin: 0 auto;
-            max-width: 100%;
-        }}
-    </style>
-    <div style="text-align: center;">
-        <img class="full-width-img" src="data:image/png;base64,{img_base64}" alt="Soleth Ai Sniper Logo">
-    </div>
-""", unsafe_allow_html=True)
-
-# ✅ API Configuration
-API_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/58.0.3029.110 Safari/537.36"
-    )
-}
-
-# ✅ Function to fetch token data
-def get_token_data(chain_filter=None) -> list:
-    try:
-        response = requests.get(API_URL, headers=HEADERS)
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract token list
-        if isinstance(data, dict) and "tokens" in data:
-            tokens = data["tokens"]
-        elif isinstance(data, list):
-            tokens = data
-        else:
-            return []
-
-        # ✅ Filter tokens by chain
-        if chain_filter:
-            tokens = [token for token in tokens if token.get("chainId", "").lower() == chain_filter.lower()]
-
-        return tokens
-    except requests.exceptions.RequestException as e:
-        st.error(f"❌ Error fetching data: {e}")
-        return []
-
-# ✅ Function to display tokens
-def update_token_display(token_data):
-    st.subheader(f"Fetched, analyzed, and scanned {len(token_data)} tokens...")
-
-    if len(token_data) == 0:
-        st.warning("⚠️ No tokens found for the selected chain.")
-
-    total_tokens = len(token_data)
-    progress_bar = st.progress(0)  # Initialize the progress bar
-
-    for idx, token in enumerate(token_data):
-        token_name = token.get('name', 'No Name Available')
-
-        # Construct the correct "More Info" URL based on the token's chain_id
-        if token.get('chainId') == 'solana':
-            more_info_url = f"https://dexscreener.com/solana/{token.get('tokenAddress')}"
-            chart_url = f"https://dexscreener.com/solana/{token.get('tokenAddress')}"
-        elif token.get('chainId') == 'ethereum':
-            more_info_url = f"https://coinmarketcap.com/dexscan/ethereum/{token.get('tokenAddress')}"
-            chart_url = f"https://dexscreener.com/ethereum/{token.get('tokenAddress')}"
-        else:
-            more_info_url = None  
-            chart_url = None  
-
-        st.write(f"**{token_name}**")  
-        st.write(f"Token Address: {token.get('tokenAddress', 'No Address Available')}")
-        st.write(f"Liquidity: {token.get('liquidity', 'N/A')}")
-        st.write(f"Volume: {token.get('volume', 'N/A')}")
-        st.write(f"Holders: {token.get('holders', 'N/A')}")
-
-        icon_url = token.get('icon', '')
-        if icon_url:
-            response = requests.get(icon_url)
-            img_data = Image.open(BytesIO(response.content))
-            img_data = img_data.resize((50, 50))
-            st.image(img_data)
-
-        token_address = token.get('tokenAddress', 'No Address Available')
-        st.text_input("Token Address", value=token_address, key=f"token_address_{idx}")
-
-        progress_bar.progress((idx + 1) / total_tokens) 
-
-# ✅ Sidebar Filter option for selecting chain
-chain_filter = st.sidebar.radio("Select Chain", ("All Chains", "Solana", "Ethereum"))
-
-# Convert filter value to match API
-if chain_filter == "Solana":
-    chain_filter = "solana"
-elif chain_filter == "Ethereum":
-    chain_filter = "ethereum"
-else:
-    chain_filter = None  # No filter if "All Chains" is selected
-
-# ✅ Refresh button
-refresh_button_clicked = st.button("Refresh Tokens")
-
-if refresh_button_clicked:
-    refresh_token_list = get_token_data(chain_filter)
-    update_token_display(refresh_token_list)
-else:
-    refresh_token_list = get_token_data(chain_filter)
-    update_token_display(refresh_token_list)  # Load tokens initially
-
-# ✅ Footer with social media links
-st.markdown("""
-    <footer style="text-align:center; padding: 10px; font-size: 14px; font-weight: bold; color: white !important; background-color: black;">
-        <p>&copy; 2025 NEXTGONIC. All rights reserved.</p>
-        <a href="https://x.com/nexgonic" target="_blank">
-            <i class="fab fa-twitter" style="font-size: 30px; color: white;"></i>
-        </a>
-        <a href="https://t.me/Nexgonic" target="_blank">
-            <i class="fab fa-telegram" style="font-size: 30px; color: white;"></i>
-        </a>
-    </footer>
-""", unsafe_allow_html=True)
+import os
+import time
+import webbrowser
+import requests
+import streamlit as st
+from PIL import Image
+from io import BytesIO
+import base64
+
+from dexscreener import TIMEOUT, fetch_sources, get_session
+import metrics
+from enrichment import enrich_tokens
+from feed_hub import hub_tokens
+from history import record_tokens, warm_start_tokens
+from icons import prefetch_icons
+from ranking import Ranking
+from timeseries import record_series
+from streamlit_metrics import show_metrics_panel
+from tokens import display_value
+from ttl_cache import TTLCache
+
+# Set page config first, before any other Streamlit commands
+st.set_page_config(page_title="Soleth Ai Sniper v1 BETA", layout="wide")
+
+# 🔒 Password protection using session state
+PASSWORD = "early"
+
+if "authenticated" not in st.session_state:
+    st.session_state.authenticated = False
+
+# ✅ Shared, process-wide caches (one copy for every browser session)
+TOKEN_CACHE_TTL = float(os.environ.get("SOLSNIPER_CACHE_TTL", "10"))  # Seconds a fetched token list is reused
+REFRESH_MIN_AGE = 2  # "Refresh Tokens" reuses data younger than this (seconds)
+LOGO_CACHE_TTL = 3600
+
+
+@st.cache_resource
+def get_token_cache() -> TTLCache:
+    return TTLCache(TOKEN_CACHE_TTL)
+
+
+@st.cache_resource
+def get_ranking() -> Ranking:
+    return Ranking()
+
+
+@st.cache_data(ttl=LOGO_CACHE_TTL, show_spinner=False)
+def load_logo_base64(logo_url: str):
+    """ Downloads the banner logo once per LOGO_CACHE_TTL and returns it base64-encoded, or None. """
+    try:
+        response = get_session().get(logo_url, timeout=TIMEOUT)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+
+    img = Image.open(BytesIO(response.content))
+    img_buffer = BytesIO()
+    img.save(img_buffer, format="PNG")
+    return base64.b64encode(img_buffer.getvalue()).decode()
+
+
+# Fetch image dynamically for authentication page
+logo_url = "https://nextgenspeed.com/wp-content/uploads/2025/01/bannerlogo.png"
+img_base64 = load_logo_base64(logo_url)
+
+if img_base64:
+
+    # Centered image at the top of the authentication page
+    st.markdown(f"""
+        <style>
+            .auth-logo-container {{
+                text-align: center;
+                margin-bottom: 20px;
+            }}
+            .auth-logo {{
+                width: 300px;
+                height: auto;
+                display: inline-block;
+            }}
+        </style>
+      
+    """, unsafe_allow_html=True)
+
+if not st.session_state.authenticated:
+    st.title("🔒 Access Restricted")
+    password = st.text_input("Enter Password", type="password")
+    
+    if st.button("Login"):
+        if password == PASSWORD:
+            st.session_state.authenticated = True  # Store authentication status
+            st.success("✅ Access granted! Welcome to Soleth Ai Sniper v1 BETA")
+            st.rerun()  # 🔄 Reload the app UI to show tokens
+        else:
+            st.warning("❌ Incorrect password. Try again.")
+
+    st.stop()  # Prevents the rest of the app from running until authenticated
+
+# ✅ If the password is correct, continue to fetch & display tokens
+st.success("✅ Access granted! Welcome to Soleth Ai Sniper v1 BETA")
+
+# Full-width image in main app
+if img_base64:
+    st.markdown(f"""
+    <style>
+        .full-width-img {{
+            width: 100%;
+            height: auto;
+            display: block;
+            margin: 0 auto;
+            max-width: 100%;
+        }}
+    </style>
+    <div style="text-align: center;">
+        <img class="full-width-img" src="data:image/png;base64,{img_base64}" alt="Soleth Ai Sniper Logo">
+    </div>
+""", unsafe_allow_html=True)
+
+# ✅ Loads the feed with market data and records it in the token history
+# (or takes the latest batch from a running feed hub, which did both already)
+def load_latest_tokens() -> list:
+    tokens = hub_tokens()
+    if tokens is not None:
+        return tokens
+    tokens = enrich_tokens(fetch_sources(limit=None))  # Profiles, boosts and per-chain searches, fetched concurrently
+    record_tokens(tokens)  # Queued for the history database
+    return tokens
+
+# ✅ Function to fetch token data
+# All sessions share one cached copy of the feed; concurrent misses trigger a
+# single upstream request. Chain filtering happens on the cached result.
+def fetch_tokens(chain_filter=None, force_refresh=False) -> list:
+    cache = get_token_cache()
+    try:
+        tokens = cache.get_or_load(
+            "latest", load_latest_tokens,
+            max_age=REFRESH_MIN_AGE if force_refresh else None,
+        )
+    except (requests.exceptions.RequestException, ValueError) as e:
+        st.error(f"❌ Error fetching data: {e}")
+        # Serve the last good list, or the most recent tokens from history
+        tokens = cache.get_stale("latest") or warm_start_tokens()
+
+    if chain_filter:
+        tokens = [token for token in tokens if token.chainId.lower() == chain_filter.lower()]
+
+    return tokens
+
+# ✅ Function to display tokens
+def update_token_display(token_data):
+    # Best tokens first (liquidity ratio, volume velocity, age), scored incrementally across fetches
+    record_series(token_data)  # Momentum and liquidity drain terms; re-recording a cached list adds nothing
+    ranking = get_ranking()
+    ranking.update(token_data)
+    token_data = ranking.order(token_data)
+
+    st.subheader(f"Fetched, analyzed, and scanned {len(token_data)} tokens...")
+
+    if len(token_data) == 0:
+        st.warning("⚠️ No tokens found for the selected chain.")
+
+    total_tokens = len(token_data)
+    progress_bar = st.progress(0)  # Initialize the progress bar
+
+    # Download and resize every icon of the batch concurrently before rendering
+    icons = prefetch_icons(token_data, size=(50, 50), exact=True)
+
+    render_started = time.perf_counter()
+    for idx, token in enumerate(token_data):
+        token_name = token.name or 'No Name Available'
+
+        # Construct the correct "More Info" URL based on the token's chain_id
+        if token.chainId == 'solana':
+            more_info_url = f"https://dexscreener.com/solana/{token.tokenAddress}"
+            chart_url = f"https://dexscreener.com/solana/{token.tokenAddress}"
+        elif token.chainId == 'ethereum':
+            more_info_url = f"https://coinmarketcap.com/dexscan/ethereum/{token.tokenAddress}"
+            chart_url = f"https://dexscreener.com/ethereum/{token.tokenAddress}"
+        else:
+            more_info_url = None  
+            chart_url = None  
+
+        st.write(f"**{token_name}**")  
+        st.write(f"Token Address: {token.tokenAddress or 'No Address Available'}")
+        st.write(f"Liquidity: {display_value(token.liquidity)}")
+        st.write(f"Volume: {display_value(token.volume)}")
+        st.write(f"Holders: {display_value(token.holders)}")
+
+        icon = icons.get(token.icon)
+        if icon is not None:
+            st.image(icon)
+
+        token_address = token.tokenAddress or 'No Address Available'
+        st.text_input("Token Address", value=token_address, key=f"token_address_{idx}")
+
+        progress_bar.progress((idx + 1) / total_tokens) 
+
+    metrics.observe("render", time.perf_counter() - render_started)
+
+# ✅ Sidebar Filter option for selecting chain
+chain_filter = st.sidebar.radio("Select Chain", ("All Chains", "Solana", "Ethereum"))
+
+# Convert filter value to match API
+if chain_filter == "Solana":
+    chain_filter = "solana"
+elif chain_filter == "Ethereum":
+    chain_filter = "ethereum"
+else:
+    chain_filter = None  # No filter if "All Chains" is selected
+
+# ✅ Refresh button
+refresh_button_clicked = st.button("Refresh Tokens")
+
+if refresh_button_clicked:
+    refresh_token_list = fetch_tokens(chain_filter, force_refresh=True)
+    update_token_display(refresh_token_list)
+else:
+    refresh_token_list = fetch_tokens(chain_filter)
+    update_token_display(refresh_token_list)  # Load tokens initially
+
+show_metrics_panel()
+
+# ✅ Footer with social media links
+st.markdown("""
+    <footer style="text-align:center; padding: 10px; font-size: 14px; font-weight: bold; color: white !important; background-color: black;">
+        <p>&copy; 2025 NEXTGONIC. All rights reserved.</p>
+        <a href="https://x.com/nexgonic" target="_blank">
+            <i class="fab fa-twitter" style="font-size: 30px; color: white;"></i>
+        </a>
+        <a href="https://t.me/Nexgonic" target="_blank">
+            <i class="fab fa-telegram" style="font-size: 30px; color: white;"></i>
+        </a>
+    </footer>
+""", unsafe_allow_html=True)
@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+METRICS_PORT = os.environ.get("SOLSNIPER_METRICS_PORT")  # Unset = no Prometheus endpoint
+METRICS_HOST = "127.0.0.1"
+METRIC_PREFIX = "solsniper"
+
+# Histogram bucket upper bounds (seconds), from sub-millisecond filters to slow HTTP
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_WINDOW = 1024  # Recent samples per stage kept for exact percentiles
+
+# Pipeline stages, in pipeline order (the summary lists them this way)
+STAGES = ("queue", "http", "decode", "enrich", "filter", "icon_fetch", "icon_decode", "render")
+
+_started_at = time.monotonic()
+_lock = threading.Lock()
+_histograms = {}  # stage -> Histogram
+_counters = {}  # (name, ((label, value), ...)) -> running total
+_server = None
+
+
+################################################################################
+# HISTOGRAMS & COUNTERS
+################################################################################
+
+class Histogram:
+    """
+    Cumulative bucket counts for Prometheus, plus the last SAMPLE_WINDOW
+    samples for p50/p95/p99 that reflect current behaviour rather than the
+    whole uptime. Callers hold the module lock.
+    """
+
+    __slots__ = ("counts", "count", "total", "recent")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def percentiles(self, *fractions) -> list:
+        ordered = sorted(self.recent)
+        if not ordered:
+            return [None] * len(fractions)
+        return [ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] for fraction in fractions]
+
+
+def observe(stage: str, seconds: float) -> None:
+    """ Records one duration for a pipeline stage. """
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    """ Adds 'amount' to a counter, e.g. increment("errors", kind="fetch"). """
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+@contextmanager
+def timer(stage: str):
+    """
+    Times a block into a stage histogram, including blocks that raise:
+        with metrics.timer("http"):
+            response = session.get(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+################################################################################
+# REPORTING
+################################################################################
+
+def _ordered_stages() -> list:
+    known = [stage for stage in STAGES if stage in _histograms]
+    return known + sorted(stage for stage in _histograms if stage not in STAGES)
+
+
+def stage_summary() -> list:
+    """
+    One row per stage seen so far: count, mean and recent p50/p95/p99 in ms.
+    """
+    rows = []
+    with _lock:
+        for stage in _ordered_stages():
+            histogram = _histograms[stage]
+            p50, p95, p99 = histogram.percentiles(0.50, 0.95, 0.99)
+            rows.append({
+                "stage": stage,
+                "count": histogram.count,
+                "mean_ms": round(1000 * histogram.total / histogram.count, 2),
+                "p50_ms": round(1000 * p50, 2),
+                "p95_ms": round(1000 * p95, 2),
+                "p99_ms": round(1000 * p99, 2),
+            })
+    return rows
+
+
+def counter_summary() -> list:
+    """
+    One row per counter: its total and average rate per second since startup.
+    """
+    uptime = max(time.monotonic() - _started_at, 1e-9)
+    with _lock:
+        items = sorted(_counters.items())
+    return [
+        {
+            "counter": name + "".join(f" {label}={value}" for label, value in labels),
+            "total": total,
+            "per_second": round(total / uptime, 3),
+        }
+        for (name, labels), total in items
+    ]
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+def render_prometheus() -> str:
+    """
+    Renders every histogram and counter in the Prometheus text exposition format.
+    """
+    lines = []
+    with _lock:
+        if _histograms:
+            name = f"{METRIC_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {name} Time spent in each pipeline stage.")
+            lines.append(f"# TYPE {name} histogram")
+            for stage in _ordered_stages():
+                histogram = _histograms[stage]
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+        typed = set()
+        for (counter, labels), total in sorted(_counters.items()):
+            name = f"{METRIC_PREFIX}_{counter}_total"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {total}")
+
+    return "\n".join(lines) + "\n"
+
+
+################################################################################
+# PROMETHEUS ENDPOINT
+################################################################################
+
+def _metrics_handler():
+    # http.server is imported here, only when the endpoint is enabled: it costs ~30 ms at startup
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MetricsHandler
+
+
+def start_metrics_server(port=METRICS_PORT, host: str = METRICS_HOST):
+    """
+    Serves /metrics on a daemon thread, once per process. Does nothing and
+    returns None when no port is configured (SOLSNIPER_METRICS_PORT).
+    """
+    global _server
+
+    if _server is not None or not port:
+        return _server
+
+    from http.server import ThreadingHTTPServer
+
+    try:
+        server = ThreadingHTTPServer((host, int(port)), _metrics_handler())
+    except OSError as e:  # e.g. another front-end already owns the port
+        print(f"Metrics endpoint not started on port {port}: {e}")
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    _server = server
+    return server
@@ -0,0 +1,307 @@
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs
+
+from PIL import Image
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+CHAINS = ("solana", "ethereum", "bsc", "base")
+PROFILES_PATH = "/token-profiles/latest/v1"
+BOOSTS_LATEST_PATH = "/token-boosts/latest/v1"
+BOOSTS_TOP_PATH = "/token-boosts/top/v1"
+SEARCH_PATH = "/latest/dex/search"  # ?q={chainId}
+TOKENS_PATH = "/tokens/v1/"  # /tokens/v1/{chainId}/{address,address,...}
+ICON_PATH = "/icons/"
+
+
+class MockConfig:
+    """
+    Knobs for the stand-in API:
+      tokens      profiles per response
+      latency     seconds added to every request (plus up to 'jitter')
+      error_rate  fraction of requests answered with HTTP 500
+      churn       fraction of the list replaced by new tokens per request
+      icon_size   edge length (px) of the generated icons
+    """
+
+    def __init__(self, tokens: int = 30, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 churn: float = 0.1, icon_size: int = 256, seed: int = 0):
+        self.tokens = tokens
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.churn = churn
+        self.icon_size = icon_size
+        self.seed = seed
+
+
+################################################################################
+# FAKE DATA
+################################################################################
+
+class TokenFeed:
+    """
+    A deterministic, churning list of token profiles shaped like the
+    token-profiles/latest/v1 response, newest first. Like the real API the
+    profiles carry no market data; that is served per token as pairs by
+    tokens/v1 and drifts a little on every request.
+    """
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.base_url = ""
+        self._random = random.Random(config.seed)
+        self._next_id = 0
+        self._markets = {}  # (chainId, tokenAddress) -> market data of the token's pair
+        self._profiles = [self._new_profile() for _ in range(config.tokens)]
+        # Boosted tokens: a few of the latest profiles plus older ones, with boost amounts
+        self._boosts = [
+            dict(profile, amount=self._random.randint(10, 500), totalAmount=self._random.randint(10, 5000))
+            for profile in self._profiles[:3] + [self._new_profile() for _ in range(config.tokens)]
+        ]
+        self._icons = {}
+        self._lock = threading.Lock()
+
+    def _new_profile(self) -> dict:
+        rng = self._random
+        token_id = self._next_id
+        self._next_id += 1
+
+        chain = rng.choice(CHAINS)
+        address = f"Mock{token_id:08d}{rng.getrandbits(64):016x}"
+        self._markets[(chain, address)] = {
+            "pairAddress": f"Pair{token_id:08d}",
+            "marketCap": round(rng.uniform(1e3, 2e7), 2),
+            "priceUsd": rng.uniform(1e-6, 2),
+            "liquidity": {"usd": round(rng.uniform(1e3, 1e6), 2)},
+            "volume": {"h24": round(rng.uniform(0, 1e6), 2)},
+            "pairCreatedAt": int((time.time() - rng.uniform(0, 5) * 86400) * 1000),
+        }
+        return {
+            "url": f"https://dexscreener.com/{chain}/{address.lower()}",
+            "chainId": chain,
+            "tokenAddress": address,
+            "icon": f"{ICON_PATH}{token_id}.png",  # Made absolute per request, see profiles()
+            "header": f"{ICON_PATH}{token_id}.png",
+            "description": "Mock token " * rng.randint(1, 20),
+            "name": f"Mock Token {token_id}",
+            "links": [
+                {"type": "twitter", "url": f"https://x.com/mock{token_id}"},
+                {"label": "Website", "url": f"https://mock{token_id}.example"},
+            ][: rng.randint(0, 2)],
+        }
+
+    def profiles(self) -> list:
+        """ Applies one round of churn and returns the current list. """
+        with self._lock:
+            replaced = int(round(len(self._profiles) * self.config.churn))
+            if replaced:
+                fresh = [self._new_profile() for _ in range(replaced)]
+                self._profiles = fresh + self._profiles[:-replaced]
+            profiles = list(self._profiles)
+
+        return [dict(p, icon=self.base_url + p["icon"], header=self.base_url + p["header"]) for p in profiles]
+
+    def boosts(self, top: bool = False) -> list:
+        """ Returns the boosted tokens, most recent first or ('top') by total boost amount. """
+        with self._lock:
+            boosts = list(self._boosts)
+        if top:
+            boosts.sort(key=lambda boost: boost["totalAmount"], reverse=True)
+        return [dict(b, icon=self.base_url + b["icon"], header=self.base_url + b["header"]) for b in boosts]
+
+    def search(self, query: str) -> list:
+        """ Returns the pairs of up to 30 tokens on the chain named by 'query', newest first. """
+        with self._lock:
+            addresses = [address for chain, address in reversed(self._markets) if chain == query][:30]
+        pairs = self.pairs(query, addresses)
+        for pair in pairs:
+            token_id = int(pair["pairAddress"][len("Pair"):])
+            pair["url"] = f"https://dexscreener.com/{query}/{pair['pairAddress'].lower()}"
+            pair["baseToken"]["name"] = f"Mock Token {token_id}"
+            pair["info"] = {"imageUrl": f"{self.base_url}{ICON_PATH}{token_id}.png", "websites": [], "socials": []}
+        return pairs
+
+    def pairs(self, chain_id: str, addresses: list) -> list:
+        """ Returns one pair per known token, with prices moved by up to +-5%. """
+        pairs = []
+        with self._lock:
+            for address in addresses:
+                market = self._markets.get((chain_id, address))
+                if market is None:
+                    continue
+
+                drift = self._random.uniform(0.95, 1.05)
+                market["priceUsd"] *= drift
+                market["marketCap"] = round(market["marketCap"] * drift, 2)
+                pairs.append({
+                    "chainId": chain_id,
+                    "pairAddress": market["pairAddress"],
+                    "baseToken": {"address": address, "symbol": "MOCK"},
+                    "priceUsd": f"{market['priceUsd']:.8f}",
+                    "marketCap": market["marketCap"],
+                    "fdv": market["marketCap"],
+                    "liquidity": dict(market["liquidity"]),
+                    "volume": dict(market["volume"]),
+                    "pairCreatedAt": market["pairCreatedAt"],
+                })
+        return pairs
+
+    def icon(self, token_id: int) -> bytes:
+        """ Returns a PNG for 'token_id', generated once and then reused. """
+        with self._lock:
+            data = self._icons.get(token_id)
+        if data is not None:
+            return data
+
+        size = self.config.icon_size
+        rng = random.Random(token_id)
+        img = Image.new("RGB", (size, size), tuple(rng.randrange(256) for _ in range(3)))
+        img.paste(tuple(rng.randrange(256) for _ in range(3)), (size // 4, size // 4, 3 * size // 4, 3 * size // 4))
+
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        data = buffer.getvalue()
+        with self._lock:
+            self._icons[token_id] = data
+        return data
+
+
+################################################################################
+# HTTP SERVER
+################################################################################
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockDexscreener/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this Nagle + delayed ACK add ~40 ms each
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def do_GET(self):
+        server = self.server
+        config = server.feed.config
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+
+        if config.error_rate and random.random() < config.error_rate:
+            self._send(500, b'{"error":"mock failure"}', "application/json")
+            return
+
+        path, _, query = self.path.partition("?")
+        if path == PROFILES_PATH:
+            body = json.dumps(server.feed.profiles()).encode("utf-8")
+            self._send(200, body, "application/json")
+
+        elif path in (BOOSTS_LATEST_PATH, BOOSTS_TOP_PATH):
+            body = json.dumps(server.feed.boosts(top=path == BOOSTS_TOP_PATH)).encode("utf-8")
+            self._send(200, body, "application/json")
+
+        elif path == SEARCH_PATH:
+            chain_id = parse_qs(query).get("q", [""])[0]
+            body = json.dumps({"schemaVersion": "1.0.0", "pairs": server.feed.search(chain_id)}).encode("utf-8")
+            self._send(200, body, "application/json")
+
+        elif path.startswith(TOKENS_PATH):
+            chain_id, _, addresses = path[len(TOKENS_PATH):].partition("/")
+            addresses = [address for address in addresses.split(",") if address]
+            if not chain_id or not 0 < len(addresses) <= 30:
+                self._send(400, b'{"error":"expected /tokens/v1/{chainId}/{1-30 addresses}"}', "application/json")
+                return
+            body = json.dumps(server.feed.pairs(chain_id, addresses)).encode("utf-8")
+            self._send(200, body, "application/json")
+
+        elif path.startswith(ICON_PATH) and path.endswith(".png"):
+            try:
+                token_id = int(path[len(ICON_PATH):-len(".png")])
+            except ValueError:
+                self._send(404, b"not found", "text/plain")
+                return
+
+            etag = f'"mock-{token_id}-{config.icon_size}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", None, {"ETag": etag})
+                return
+            self._send(200, server.feed.icon(token_id), "image/png", {"ETag": etag})
+
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type, headers: dict = None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockConfig):
+        super().__init__(address, MockHandler)
+        self.feed = TokenFeed(config)
+        self.feed.base_url = self.base_url
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early (streamed parsing) reset the connection; that's expected
+        pass
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_mock_server(config: MockConfig = None, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    """
+    Starts the stand-in API on a daemon thread (port 0 picks a free port)
+    and returns the server; point SOLSNIPER_API_BASE at server.base_url.
+    """
+    server = MockServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-dexscreener", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve Dexscreener-shaped token profiles and icons locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tokens", type=int, default=30, help="profiles per response")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with HTTP 500")
+    parser.add_argument("--churn", type=float, default=0.1, help="fraction of tokens replaced per request")
+    parser.add_argument("--icon-size", type=int, default=256, help="icon edge length in px")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(args.tokens, args.latency, args.jitter, args.error_rate, args.churn, args.icon_size, args.seed)
+    server = MockServer((args.host, args.port), config)
+    print(f"Mock Dexscreener on {server.base_url} (SOLSNIPER_API_BASE={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import threading
+import time
+
+from seen import token_key
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+FETCH_INTERVAL = 10  # Default interval (in seconds) between consecutive fetches
+MIN_INTERVAL = 2  # Fastest the scheduler will poll while new tokens keep arriving
+MAX_INTERVAL = 60  # Slowest the scheduler will poll when nothing changes
+MAX_BACKOFF = 300  # Upper bound for backoff after 429 / 5xx responses
+
+SPEEDUP = 0.5  # Interval multiplier when a poll brings new tokens
+SLOWDOWN = 1.25  # Interval multiplier when a poll is unchanged
+BACKOFF = 2.0  # Interval multiplier per consecutive throttled / failed poll
+
+
+def error_status(error):
+    """
+    Returns the HTTP status code and Retry-After value (in seconds) carried by
+    a requests exception, or (None, None) for network-level failures.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None, None
+
+    retry_after = response.headers.get("Retry-After")
+    try:
+        retry_after = float(retry_after) if retry_after is not None else None
+    except ValueError:
+        retry_after = None  # HTTP-date form; fall back to exponential backoff
+
+    return response.status_code, retry_after
+
+
+################################################################################
+# ADAPTIVE SCHEDULE
+################################################################################
+
+class AdaptiveSchedule:
+    """
+    Decides when the next poll should fire.
+    The interval shrinks towards 'min_interval' while polls keep bringing new
+    tokens, grows towards 'max_interval' while responses are unchanged and
+    backs off exponentially on 429 / 5xx / network errors, honouring
+    Retry-After. Deadlines are kept on a fixed grid (monotonic clock), so a
+    slow fetch skips the ticks it missed instead of stacking them up.
+    """
+
+    def __init__(self, interval: float = FETCH_INTERVAL, min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL, max_backoff: float = MAX_BACKOFF):
+        self.base_interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_backoff = max_backoff
+
+        self.interval = interval
+        self.errors_in_row = 0
+        self.next_due = time.monotonic()  # First poll fires immediately
+
+        self._last_keys = None
+
+    def record_tokens(self, tokens: list) -> int:
+        """
+        Adapts the interval to a successful poll and returns how many tokens
+        were not in the previous response.
+        """
+        keys = {token_key(token) for token in tokens}
+        new_count = len(keys) if self._last_keys is None else len(keys - self._last_keys)
+        self._last_keys = keys
+
+        self.errors_in_row = 0
+        if new_count:
+            self.interval = max(self.min_interval, min(self.interval, self.base_interval) * SPEEDUP)
+        else:
+            self.interval = min(self.max_interval, max(self.interval, self.base_interval) * SLOWDOWN)
+
+        self._advance()
+        return new_count
+
+    def record_error(self, error) -> None:
+        """
+        Backs off after a failed poll. 429 and 5xx responses (and network
+        errors) back off exponentially; other HTTP errors keep the interval.
+        """
+        status, retry_after = error_status(error)
+
+        if status is None or status == 429 or status >= 500:
+            self.errors_in_row += 1
+            backoff = max(self.interval, self.base_interval) * (BACKOFF ** self.errors_in_row)
+            if retry_after is not None:
+                backoff = max(backoff, retry_after)
+            self._advance(min(self.max_backoff, backoff))
+        else:
+            self._advance()
+
+    def _advance(self, delay=None) -> None:
+        now = time.monotonic()
+
+        if delay is not None:
+            self.next_due = now + delay
+            return
+
+        # Drift correction: stay on the grid, skipping any ticks already missed
+        self.next_due += self.interval
+        if self.next_due <= now:
+            missed = int((now - self.next_due) // self.interval) + 1
+            self.next_due += missed * self.interval
+
+    def next_delay(self) -> float:
+        """
+        Seconds to wait before the next poll should fire.
+        """
+        return max(0.0, self.next_due - time.monotonic())
+
+
+def poll_once(fetch, schedule: AdaptiveSchedule, on_error=print) -> list:
+    """
+    Runs one poll through 'schedule': calls fetch(), records the outcome and
+    returns the tokens (an empty list when the fetch failed).
+    """
+    try:
+        tokens = fetch()
+    except Exception as e:
+        schedule.record_error(e)
+        on_error(f"Error fetching data: {e}")
+        return []
+
+    schedule.record_tokens(tokens)
+    return tokens
+
+
+################################################################################
+# BACKGROUND POLLER
+################################################################################
+
+class Poller:
+    """
+    Calls fetch() on a daemon thread following an AdaptiveSchedule and hands
+    every successful response to on_tokens(tokens), on that same thread.
+    """
+
+    def __init__(self, fetch, on_tokens, schedule: AdaptiveSchedule = None, on_error=print):
+        self.fetch = fetch
+        self.on_tokens = on_tokens
+        self.schedule = schedule or AdaptiveSchedule()
+        self.on_error = on_error
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self.schedule.next_due = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.schedule.next_delay()):
+            tokens = poll_once(self.fetch, self.schedule, self.on_error)
+            if tokens and not self._stop.is_set():
+                try:
+                    self.on_tokens(tokens)
+                except Exception as e:
+                    self.on_error(f"Error processing polled tokens: {e}")
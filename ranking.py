@@ -0,0 +1,254 @@
+import dataclasses
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from filters import FilterSpecError, load_filter_spec
+from timeseries import get_series_store
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+RANK_MAX_ENTRIES = 20000  # Tokens ranked at once; the lowest scores go first beyond this
+RANK_MAX_IDLE = 10 * 60  # Seconds a token can go unpolled before it leaves the ranking
+RESCORE_INTERVAL = 30  # Seconds between rescores of tokens that weren't polled, so their age keeps counting
+
+# Used when a spec has no "score" section
+DEFAULT_TERMS = [
+    {"metric": "liquidity_ratio", "weight": 1.0},
+    {"metric": "volume_velocity", "weight": 1.0},
+    {"metric": "holder_growth", "weight": 0.5},
+    {"metric": "age_decay", "weight": 1.0, "half_life": 1.0},
+    {"metric": "momentum", "weight": 0.5},
+    {"metric": "liquidity_drain", "weight": -2.0},
+]
+
+
+################################################################################
+# METRICS
+################################################################################
+# Each metric maps (token, previous sample or None, seconds since it, its
+# term, its TokenSeries or None) to a number around 0..1, so weights are
+# comparable. Missing data scores 0.
+
+def liquidity_ratio(token, previous, elapsed, term, series) -> float:
+    """ Liquidity per dollar of market cap (1 = fully backed), capped at 1. """
+    if not token.liquidity or not token.marketCap:
+        return 0.0
+    return min(1.0, token.liquidity / token.marketCap)
+
+
+def volume_velocity(token, previous, elapsed, term, series) -> float:
+    """ 24h volume per day of age, on a log scale where $1M/day scores 1. """
+    if not token.volume:
+        return 0.0
+    days = max(token.age or 1.0, 1 / 24)  # Pairs younger than an hour count as an hour old
+    return math.log10(1 + token.volume / days) / 6
+
+
+def holder_growth(token, previous, elapsed, term, series) -> float:
+    """ Relative holder growth per hour since the previous sample, capped at 1. """
+    if previous is None or not elapsed or not token.holders or not previous.holders:
+        return 0.0
+    growth = (token.holders - previous.holders) / previous.holders
+    return max(-1.0, min(1.0, growth * 3600 / elapsed))
+
+
+def age_decay(token, previous, elapsed, term, series) -> float:
+    """ Halves every 'half_life' days of age (1 for a brand-new pair). """
+    if token.age is None:
+        return 0.0
+    return 0.5 ** (token.age / term.get("half_life", 1.0))
+
+
+def momentum(token, previous, elapsed, term, series) -> float:
+    """ Price rate of change over the last ROC_WINDOW polls, capped at +-1. """
+    change = series.roc("price") if series is not None else None
+    return 0.0 if change is None else max(-1.0, min(1.0, change))
+
+
+def liquidity_drain(token, previous, elapsed, term, series) -> float:
+    """ Fraction of liquidity lost over the last ROC_WINDOW polls; give it a negative weight. """
+    drain = series.indicator("liquidity_drain") if series is not None else None
+    return drain or 0.0
+
+
+METRICS = {
+    "liquidity_ratio": liquidity_ratio,
+    "volume_velocity": volume_velocity,
+    "holder_growth": holder_growth,
+    "age_decay": age_decay,
+    "momentum": momentum,
+    "liquidity_drain": liquidity_drain,
+}
+
+
+def _check_term(term: dict) -> dict:
+    if term.get("metric") not in METRICS:
+        raise FilterSpecError(f"Unknown score metric: {term.get('metric')!r}")
+    weight = term.get("weight", 1.0)
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+        raise FilterSpecError(f"Weight of {term['metric']!r} must be a number")
+    return term
+
+
+################################################################################
+# RANKING
+################################################################################
+
+class Ranking:
+    """
+    Keeps every token it's given ranked by a weighted sum of METRICS (some
+    read the token's series, so record_series() the batch first):
+      "score": {"terms": [{"metric": "liquidity_ratio", "weight": 1.0}, ...]}
+    (a section of a filter spec; DEFAULT_TERMS when it's missing).
+    update() rescores only the tokens in the new poll, each against its own
+    previous sample, and moves them within an always-sorted index, so
+    top(k) reads the best k in O(k) however many tokens are tracked.
+    Tokens missing from the polls are rescored every RESCORE_INTERVAL with
+    their age advanced to the time of the read (and dropped once they fail
+    the last 'keep' predicate), then dropped after 'max_idle' seconds.
+    """
+
+    def __init__(self, terms: list = None, max_entries: int = RANK_MAX_ENTRIES, series=None,
+                 max_idle: float = RANK_MAX_IDLE):
+        self.terms = [_check_term(term) for term in (terms or DEFAULT_TERMS)]
+        self.max_entries = max_entries
+        self.max_idle = max_idle
+        self.series = series or get_series_store()  # Momentum and drain read the tokens' recorded series
+
+        self._entries = {}  # key -> (sort key, token, observed_at, scored_at)
+        self._order = []  # (-score, sequence, key), best first
+        self._scored = OrderedDict()  # key -> None, least recently scored first
+        self._sequence = 0  # Tie-breaker: among equal scores, the earlier ranked token stays ahead
+        self._keep = None  # The last update's 'keep', re-applied to rescored tokens
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def score_token(self, token, previous=None, elapsed: float = None) -> float:
+        series = self.series.get(token.key())
+        return sum(
+            term.get("weight", 1.0) * METRICS[term["metric"]](token, previous, elapsed, term, series)
+            for term in self.terms
+        )
+
+    def score(self, key) -> float:
+        """ Returns a tracked token's current score (None when it isn't tracked). """
+        entry = self._entries.get(key)
+        return -entry[0][0] if entry else None
+
+    def update(self, tokens: list, keep=None) -> None:
+        """
+        Scores a poll's tokens and moves each one to its new rank. With a
+        'keep' predicate (e.g. TokenFilter.matches), tokens failing it are
+        dropped from the ranking instead.
+        """
+        now = time.time()
+        with self._lock:
+            self._keep = keep
+            for token in tokens:
+                key = token.key()
+                entry = self._entries.get(key)
+                previous, elapsed = None, None
+                if entry is not None:
+                    self._remove(entry[0])
+                    previous, elapsed = entry[1], now - entry[2]
+                if keep is not None and not keep(token):
+                    self._entries.pop(key, None)
+                    self._scored.pop(key, None)
+                    continue
+                self._insert(key, token, now, now, previous, elapsed)
+
+            while len(self._order) > self.max_entries:
+                _, _, key = self._order.pop()
+                del self._entries[key]
+                del self._scored[key]
+
+    def _insert(self, key, token, observed_at: float, scored_at: float, previous=None, elapsed: float = None) -> None:
+        self._sequence += 1
+        sort_key = (-self.score_token(token, previous, elapsed), self._sequence, key)
+        insort(self._order, sort_key)
+        self._entries[key] = (sort_key, token, observed_at, scored_at)
+        self._scored.pop(key, None)
+        self._scored[key] = None
+
+    def _refresh(self, now: float) -> None:
+        """
+        Rescores tokens last scored RESCORE_INTERVAL or more ago, with their
+        age advanced to 'now', dropping those idle for over max_idle or
+        failing the last 'keep' predicate. Only due tokens are visited.
+        """
+        while self._scored:
+            key = next(iter(self._scored))
+            sort_key, token, observed_at, scored_at = self._entries[key]
+            if now - scored_at < RESCORE_INTERVAL:
+                break
+
+            self._remove(sort_key)
+            del self._scored[key]
+            if token.age is not None:
+                token = dataclasses.replace(token, age=token.age + (now - scored_at) / 86400)
+            if now - observed_at > self.max_idle or (self._keep is not None and not self._keep(token)):
+                del self._entries[key]
+                continue
+            self._insert(key, token, observed_at, now)
+
+    def discard(self, key) -> None:
+        """ Stops tracking a token. """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._remove(entry[0])
+                del self._scored[key]
+
+    def _remove(self, sort_key: tuple) -> None:
+        index = bisect_left(self._order, sort_key)
+        if index < len(self._order) and self._order[index] == sort_key:
+            del self._order[index]
+
+    def top(self, k: int = None, predicate=None) -> list:
+        """
+        Returns the k best tokens (all of them when k is None), best first,
+        optionally only those for which predicate(token) holds.
+        """
+        entries = self._entries
+        with self._lock:
+            self._refresh(time.time())
+            if predicate is None:
+                return [entries[key][1] for _, _, key in self._order[:k]]
+
+            best = []
+            for _, _, key in self._order:
+                token = entries[key][1]
+                if predicate(token):
+                    best.append(token)
+                    if k is not None and len(best) >= k:
+                        break
+            return best
+
+    def order(self, tokens: list) -> list:
+        """ Returns 'tokens' best first by their ranked scores (untracked ones are scored on the spot). """
+        with self._lock:
+            self._refresh(time.time())
+
+        def sort_key(token):
+            score = self.score(token.key())
+            return -(score if score is not None else self.score_token(token))
+
+        return sorted(tokens, key=sort_key)
+
+
+def load_ranking(name_or_path: str) -> Ranking:
+    """
+    Builds a Ranking from the "score" section of a filter spec (see filters.py).
+    """
+    score = load_filter_spec(name_or_path).get("score") or {}
+    return Ranking(score.get("terms"))
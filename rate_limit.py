@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+from icon_cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): the bucket is only shared between threads
+    fcntl = None
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+RATE_LIMIT_DIR = os.path.join(CACHE_DIR, "ratelimit")
+
+# Priorities: lower numbers are served first
+HIGH = 0  # Latest-profile polling
+LOW = 1  # Enrichment, icons, logos
+
+LOW_PRIORITY_RESERVE = 2  # Tokens low-priority calls must leave in the bucket for high-priority ones
+MAX_SLEEP = 0.25  # Longest nap between attempts, so waiters notice freed capacity quickly
+WAITER_TTL = 2.0  # A registered high-priority waiter that hasn't checked in for this long is gone
+
+
+################################################################################
+# SHARED TOKEN BUCKET
+################################################################################
+
+class TokenBucket:
+    """
+    A token bucket whose state lives in a small JSON file guarded by flock,
+    so every process on the host (Tk app, Streamlit servers, headless
+    daemons) draws from the same budget:
+      rate      tokens added per second
+      capacity  burst size
+    acquire() blocks until a token is available instead of failing. While a
+    high-priority caller is waiting, or when fewer than LOW_PRIORITY_RESERVE
+    tokens are left, low-priority callers keep waiting.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, directory: str = RATE_LIMIT_DIR):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.path = os.path.join(directory, f"{name}.json")
+        self._thread_lock = threading.Lock()  # flock doesn't exclude threads sharing a process
+        self._state = None  # Used when the state file can't be opened
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _update(self, change):
+        """
+        Runs change(state, now) -> result with the bucket refilled up to
+        'now', under both locks, and saves the state it leaves behind.
+        """
+        with self._thread_lock:
+            try:
+                f = open(self.path, "a+", encoding="utf-8")
+            except OSError:
+                f = None
+
+            try:
+                if f is not None and fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+
+                state = None
+                if f is not None:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "null")
+                    except ValueError:
+                        state = None  # Torn or foreign file: start over
+                if not isinstance(state, dict):
+                    state = self._state or {"tokens": self.capacity, "updated": time.time(), "waiters": {}}
+
+                now = time.time()
+                elapsed = max(0.0, now - state["updated"])  # Negative while a 429 penalty is in force
+                if now >= state["updated"]:
+                    state["tokens"] = min(self.capacity, state["tokens"] + elapsed * self.rate)
+                    state["updated"] = now
+                state["waiters"] = {k: v for k, v in state.get("waiters", {}).items() if v > now}
+
+                result = change(state, now)
+
+                self._state = state
+                if f is not None:
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                return result
+            finally:
+                if f is not None:
+                    f.close()  # Also releases the flock
+
+    def acquire(self, priority: int = LOW, timeout: float = None) -> bool:
+        """
+        Takes one token, waiting as long as needed (up to 'timeout' seconds).
+        Returns False if the timeout ran out first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiter_id = f"{os.getpid()}-{threading.get_ident()}"
+
+        def try_take(state, now):
+            high_waiting = any(key != waiter_id for key in state["waiters"])
+            needed = 1 if priority == HIGH else 1 + LOW_PRIORITY_RESERVE
+
+            if state["updated"] <= now and state["tokens"] >= needed and (priority == HIGH or not high_waiting):
+                state["tokens"] -= 1
+                state["waiters"].pop(waiter_id, None)
+                return 0.0
+
+            if priority == HIGH:
+                state["waiters"][waiter_id] = now + WAITER_TTL  # Holds low-priority callers back
+            shortfall = max(0.0, needed - state["tokens"]) / self.rate
+            return max(shortfall, state["updated"] - now, 0.01)
+
+        while True:
+            wait = self._update(try_take)
+            if wait == 0.0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._update(lambda state, now: state["waiters"].pop(waiter_id, None))
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(min(wait, MAX_SLEEP))
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Empties the bucket and pauses refilling for 'seconds', e.g. after a
+        429, so no process on the host sends anything until it's over.
+        """
+        def pause(state, now):
+            state["tokens"] = 0.0
+            state["updated"] = max(state["updated"], now + seconds)
+
+        self._update(pause)
@@ -1,388 +1,900 @@
-import sys
-import webbrowser
-import requests
-import tkinter as tk
-from tkinter import ttk
-from PIL import Image, ImageTk
-from io import BytesIO
-import ttkbootstrap as ttkb
-
-################################################################################
-# GLOBAL CONSTANTS & CONFIG
-################################################################################
-
-API_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
-FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/58.0.3029.110 Safari/537.36"
-    )
-}
-
-# Global variables for hyperlink handling
-hyperlinks_map = {}
-hyperlink_id = 0
-
-# Global variable to store filtered tokens
-filtered_tokens = []
-tokens_displayed = 0  # Keep track of how many tokens have been displayed
-
-################################################################################
-# FETCHING TOKEN DATA
-################################################################################
-
-def get_token_data() -> list:
-    """
-    Fetches token data from Dexscreener, returns a list of token dictionaries.
-    Only extracts these fields:
-      url (clickable link)
-      tokenAddress
-      icon (image)
-      links
-      price
-      marketCap
-      liquidity
-      volume
-      holders
-      age
-      chainId
-    """
-    try:
-        response = requests.get(API_URL, headers=HEADERS)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if isinstance(data, dict) and "tokens" in data:
-            tokens = data["tokens"]
-        elif isinstance(data, list):
-            tokens = data
-        else:
-            return []  # If the response isn't as expected
-
-        return tokens[:30] if tokens else []  # Return the first 30 tokens
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
-        return []
-
-
-################################################################################
-# BACKGROUND & UI CONTROL
-################################################################################
-
-def background_search():
-    print("Starting token search...")
-
-    tokens = get_token_data()
-
-    # Log the number of fetched tokens but not their raw data
-    print(f"Fetched {len(tokens)} tokens.")
-    if tokens:
-        # Filter tokens based on market cap, holders, age, and chainId being 'solana' or 'ethereum'
-        global filtered_tokens
-        filtered_tokens = [
-            token for token in tokens
-            if token.get("marketCap", 0) < 10000000 and  # Relaxed filter
-               token.get("holders", 0) < 5000 and  # Relaxed filter
-               token.get("age", 0) < 2 and
-               token.get("chainId", "") in ["solana", "ethereum"]  # Filter for Solana or Ethereum chainId
-        ]
-
-        print(f"After filtering, {len(filtered_tokens)} tokens found.")
-
-        # Display the top 5 tokens
-        if filtered_tokens:
-            print(f"Displaying top 5 filtered tokens...")
-            global tokens_displayed
-            tokens_displayed = 5
-            for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
-                display_token(token, i)
-        else:
-            print("No tokens found after filtering.")
-
-        # Enable the "Show More" button if there are more tokens left
-        if len(filtered_tokens) > 5:
-            show_more_button.config(state=tk.NORMAL)
-
-    else:
-        print("No tokens found this round.")
-
-    # Re-enable the fetch button after processing
-    fetch_button.config(state=tk.NORMAL)
-
-
-def refresh_token_list():
-    """
-    Refreshes the token list by calling the background search and updating the display.
-    """
-    fetch_process()
-
-
-def fetch_process():
-    print("Fetching new token data...")
-    background_search()
-
-
-def start_process():
-    fetch_button.config(state=tk.DISABLED)  # Disable the Fetch button while processing
-    fetch_process()
-
-
-def show_more_tokens():
-    """
-    Displays the next batch of filtered tokens (after the first 5).
-    """
-    global tokens_displayed
-    remaining_tokens = filtered_tokens[tokens_displayed:tokens_displayed + 5]
-
-    for i, token in enumerate(remaining_tokens, start=tokens_displayed + 1):
-        display_token(token, i)
-
-    tokens_displayed += len(remaining_tokens)
-
-    # Disable the "Show More" button if there are no more tokens to show
-    if tokens_displayed >= len(filtered_tokens):
-        show_more_button.config(state=tk.DISABLED)
-
-
-################################################################################
-# DISPLAYING TOKEN INFO
-################################################################################
-
-def display_token(token: dict, index: int):
-    """
-    Inserts token info into a card layout within the scrolledtext widget in the order:
-      1) token name (bold)
-      2) tokenAddress
-      3) icon (image)
-      4) links (clickable)
-    """
-    card_frame = ttkb.Frame(results_frame, bootstyle="dark", padding=20, borderwidth=2, relief="solid", width=700)
-    card_frame.pack(pady=20, fill=tk.X, anchor="center")  # Ensure it fills the width of the window
-
-    # Token name (bold)
-    token_name_label = ttkb.Label(card_frame, text=f"Token #{index}: {token.get('tokenAddress', 'N/A')}",
-                                  font=("Helvetica", 16, "bold"), foreground="lightblue", background="")
-    token_name_label.pack(pady=(0, 15))
-
-    # Displaying the icon as an image
-    icon_url = token.get("icon", "")
-    if icon_url:
-        try:
-            # Fetch the icon image
-            response = requests.get(icon_url)
-            if response.status_code == 200 and 'image' in response.headers['Content-Type']:
-                img_data = response.content
-                img = Image.open(BytesIO(img_data))
-                img.thumbnail((100, 100))  # Resize the image to fit within a smaller space
-                img_tk = ImageTk.PhotoImage(img)
-
-                # Display the image in the Tkinter window
-                label_img = ttkb.Label(card_frame, image=img_tk)
-                label_img.image = img_tk  # Keep a reference to the image
-                label_img.pack(pady=(0, 15))
-            else:
-                print(f"Error loading icon: {icon_url} - Not a valid image")
-        except Exception as e:
-            print(f"Error loading icon: {e}")
-
-    # Token Address
-    token_address_label = ttkb.Label(card_frame, text=f"Address: {token.get('tokenAddress', 'N/A')}",
-                                     font=("Helvetica", 12), foreground="lightgreen", background="")
-    token_address_label.pack(pady=(0, 15))
-
-    # URL as clickable link
-    url_label = ttkb.Label(card_frame, text="URL:", font=("Helvetica", 12, "bold"), foreground="cyan", background="")
-    url_label.pack(pady=(0, 5))
-    if token["url"] and token["url"] != "N/A":
-        add_hyperlink(token["url"], token["url"], parent=card_frame)
-    else:
-        no_url_label = ttkb.Label(card_frame, text="N/A", font=("Helvetica", 12), foreground="gray", background="")
-        no_url_label.pack(pady=(0, 5))
-
-    # Links section - clickable
-    links_list = token.get("links", [])
-    if links_list:
-        links_label = ttkb.Label(card_frame, text="Links:", font=("Helvetica", 12, "bold"), foreground="magenta", background="")
-        links_label.pack(pady=(0, 5))
-        for link in links_list:
-            add_hyperlink(link, link, parent=card_frame)
-    else:
-        no_links_label = ttkb.Label(card_frame, text="None", font=("Helvetica", 12), foreground="gray", background="")
-        no_links_label.pack(pady=(0, 5))
-
-
-################################################################################
-# ADD HYPERLINK FUNCTION
-################################################################################
-
-def add_hyperlink(url: str, display_text: str, parent: ttkb.Frame) -> None:
-    """
-    Inserts 'display_text' as a clickable link in the given parent frame
-    which, when clicked, opens 'url' in the default web browser.
-    """
-    global hyperlink_id
-
-    tag_name = f"hyper-{hyperlink_id}"
-    hyperlink_id += 1
-
-    # Create a label with custom styling to look like a link
-    link_label = ttkb.Label(parent, text=display_text, font=("Helvetica", 12, "underline"), foreground="#1E90FF", background="")
-    link_label.pack(pady=(0, 5))
-
-    # Store the URL for the link
-    hyperlinks_map[tag_name] = url
-
-    def click_callback(event, tag=tag_name):
-        link_url = hyperlinks_map[tag]
-        webbrowser.open(link_url)
-
-    # Bind the click event to the label
-    link_label.bind("<Button-1>", click_callback)
-
-
-################################################################################
-# MAIN UI SETUP
-################################################################################
-
-root = ttkb.Window(themename="darkly")  # Set dark theme using ttkbootstrap
-
-root.title("Web 3.0 Dexscreener Tokens")
-root.geometry("950x1250")  # Change window size to 950x1250
-
-# Create a container frame with a sleek shadow effect and rounded corners
-frame = ttkb.Frame(root, bootstyle="dark", padding=20)
-frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
-
-# Fetch the logo image from URL and resize it to 250px width
-logo_url = "https://nextgenspeed.com/wa/uilogo.png"
-response = requests.get(logo_url)
-logo_image = Image.open(BytesIO(response.content))
-
-# Resize the image to a width of 250px while maintaining the aspect ratio
-width = 250
-height = int((width / logo_image.width) * logo_image.height)
-logo_image = logo_image.resize((width, height), Image.Resampling.LANCZOS)
-
-# Convert the image to a Tkinter-compatible format
-logo_tk = ImageTk.PhotoImage(logo_image)
-
-# Add the logo image in the header and center it with no background or border
-header_logo_label = ttkb.Label(frame, image=logo_tk, relief="flat", borderwidth=0)  # No border or relief
-header_logo_label.image = logo_tk  # Keep a reference to the image
-header_logo_label.pack(pady=30)  # Adjust the padding as needed
-
-# Header Section (added)
-header_frame = ttkb.Frame(frame, bootstyle="dark")
-header_frame.pack(pady=20)
-
-# Title Label: Proliv Token Tracker
-title_label = ttkb.Label(header_frame, text="Proliv Token Tracker", font=("Helvetica", 20, "bold"), foreground="white", background="")
-title_label.pack()
-
-# Slogan Label: Ai Tracked Newest SOL/ETH Pairs
-slogan_label = ttkb.Label(header_frame, text="Ai Tracked Newest SOL/ETH Pairs", font=("Helvetica", 12), foreground="white", background="")
-slogan_label.pack()
-
-# Button Frame for controls
-button_frame = ttkb.Frame(frame, bootstyle="dark")
-button_frame.pack(pady=20)
-
-# Use grid layout to space buttons evenly
-button_frame.grid_columnconfigure(0, weight=1)
-button_frame.grid_columnconfigure(1, weight=1)
-button_frame.grid_columnconfigure(2, weight=1)
-
-# Updated button styles with neon colors
-fetch_button = ttkb.Button(button_frame, text="Fetch Tokens", command=start_process, bootstyle="primary",
-                           padding=(12, 5), width=20, style="success")  # Neon blue for "Fetch Tokens"
-fetch_button.grid(row=0, column=0, padx=10)
-
-show_more_button = ttkb.Button(button_frame, text="Show More", command=show_more_tokens, bootstyle="info",
-                               padding=(12, 5), width=20, style="info")  # Neon purple for "Show More"
-show_more_button.grid(row=0, column=1, padx=10)
-show_more_button.config(state=tk.DISABLED)
-
-# Change Refresh button to purple/pink color
-refresh_button = ttkb.Button(button_frame, text="Refresh", command=refresh_token_list, bootstyle="secondary",
-                             padding=(12, 5), width=20, style="")  # Purple/Pink for "Refresh"
-refresh_button.grid(row=0, column=2, padx=10)
-
-# Create a canvas to hold the scrollable frame for token results
-canvas = tk.Canvas(frame)
-scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-scrollable_frame = ttkb.Frame(canvas)
-
-# Configure the scrollbar and canvas
-canvas.configure(yscrollcommand=scrollbar.set)
-scrollbar.pack(side="right", fill="y")
-canvas.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
-canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-# Make the results frame scrollable
-scrollable_frame.bind(
-    "<Configure>",
-    lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-)
-
-# Bind the mouse wheel scroll to the canvas
-def on_canvas_scroll(event):
-    canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-
-# Bind the mouse wheel event to the entire window
-canvas.bind_all("<MouseWheel>", on_canvas_scroll)
-
-results_frame = scrollable_frame  # This frame will hold the tokens
-
-# Footer with copyright and social links
-footer_frame = ttkb.Frame(root, bootstyle="dark", padding=10)
-footer_frame.pack(fill=tk.X, side=tk.BOTTOM)
-
-# Copyright text
-copyright_label = ttkb.Label(footer_frame, text="© Nexgonic", font=("Helvetica", 12), bootstyle="light", background="")
-copyright_label.pack(pady=(5, 0))
-
-# Social Media Links (Twitter (X), Telegram, Website)
-social_frame = ttkb.Frame(footer_frame)
-social_frame.pack(pady=(5, 0))
-
-# Twitter (X), Telegram, Website Icons
-twitter_icon = ttkb.Label(social_frame, text="🐦", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
-twitter_icon.pack(side=tk.LEFT, padx=10)
-telegram_icon = ttkb.Label(social_frame, text="📱", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
-telegram_icon.pack(side=tk.LEFT, padx=10)
-website_icon = ttkb.Label(social_frame, text="🌐", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
-website_icon.pack(side=tk.LEFT, padx=10)
-
-# Links
-twitter_icon.bind("<Button-1>", lambda e: webbrowser.open("https://x.com/nexgonic"))
-telegram_icon.bind("<Button-1>", lambda e: webbrowser.open("https://telegram.com/nexgonicai"))
-website_icon.bind("<Button-1>", lambda e: webbrowser.open("https://nexgonic.com"))
-
-# Create a frame to center the whitelist banner
-whitelist_frame = ttkb.Frame(footer_frame)
-whitelist_frame.pack(fill=tk.X, pady=(5, 0))
-
-# Whitelist Sign-Up Banner centered in the frame
-whitelist_banner = ttkb.Label(whitelist_frame, text="White List Sign Up For Upcoming Releases", font=("Helvetica", 12), bootstyle="info", background="")
-whitelist_banner.pack(pady=(5, 0), ipadx=20, ipady=5, anchor="center")
-
-
-running = False
-
-
-# Start the Tkinter event loop
-def main():
-    try:
-        root.mainloop()
-    except KeyboardInterrupt:
-        print("Script interrupted by user (KeyboardInterrupt). Exiting gracefully...")
-        sys.exit(0)
-
-
-if __name__ == "__main__":
-    main()
+import time
+STARTED_AT = time.perf_counter()  # Cold-start reference, taken before anything heavy is imported
+
+import os
+import sys
+import queue
+import threading
+import webbrowser
+from collections import OrderedDict
+import tkinter as tk
+import ttkbootstrap as ttkb
+
+# requests (dexscreener, icons) is imported on first use, off the UI thread; PIL already comes with ttkbootstrap
+from feed_hub import get_hub_client, hub_tokens
+from filters import load_filter
+import metrics
+from icon_cache import CACHE_DIR
+from poller import AdaptiveSchedule, Poller
+from ranking import load_ranking
+from seen import SeenSet, token_key
+from timeseries import record_series
+from tokens import Token
+from virtual_list import VirtualList
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
+QUEUE_POLL_MS = 50  # How often (in ms) the UI thread drains finished fetch results
+
+CARD_HEIGHT = 420  # Fixed card height (px) so the list can recycle card widgets
+CARD_GAP = 20  # Vertical space between cards
+MAX_CARD_LINKS = 4  # Links shown per card
+PHOTO_CACHE_SIZE = 64  # Tk images kept alive for recently displayed icons
+ICON_SIZE = (100, 100)  # Card icons are decoded straight to this size, off the UI thread
+
+# Memory bounds, so a window left polling for days stays the same size
+MAX_RETAINED_TOKENS = int(os.environ.get("SOLSNIPER_MAX_TOKENS", "1000"))  # Older tokens are dropped with their icons
+ICON_MEMORY_BUDGET = int(os.environ.get("SOLSNIPER_ICON_BUDGET_MB", "32")) * 1024 * 1024  # Decoded card icons kept
+
+# Header logo: shown from a pre-resized PNG (cached copy, else bundled asset) and refreshed in the background
+LOGO_URL = "https://nextgenspeed.com/wa/uilogo.png"
+LOGO_WIDTH = 250
+LOGO_CACHE_PATH = os.path.join(CACHE_DIR, f"uilogo_{LOGO_WIDTH}.png")
+LOGO_BUNDLED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", f"uilogo_{LOGO_WIDTH}.png")
+LOGO_REFRESH_AFTER = 24 * 3600  # Seconds before the cached logo is downloaded again
+
+# Seconds from launch until the window is idle on screen; SOLSNIPER_STARTUP_CHECK=1 measures it and exits
+# (tests/test_startup.py runs that check when a display is available)
+STARTUP_BUDGET = 1.5
+
+# Filter spec (name in filter_specs/ or path to a JSON/YAML file), compiled once
+FILTER_SPEC = os.environ.get("SOLSNIPER_FILTER", "sol_eth")
+TOKEN_FILTER = load_filter(FILTER_SPEC)
+TOKEN_RANKING = load_ranking(FILTER_SPEC)  # Scores from the spec's "score" section; the displayed cards are kept best first
+
+# Global variables for hyperlink handling
+hyperlinks_map = {}
+hyperlink_id = 0
+
+# Widgets, created by build_window()
+root = None
+header_logo_label = fetch_button = show_more_button = auto_poll_button = token_list = None
+
+# Global variable to store filtered tokens, newest first
+filtered_tokens = []
+tokens_displayed = 0  # Keep track of how many tokens have been displayed (always a prefix of filtered_tokens)
+token_numbers = {}  # (chainId, tokenAddress) -> card number, in the order tokens were discovered
+token_counter = 0
+token_icons = OrderedDict()  # (chainId, tokenAddress) -> decoded icon (PIL image), least recently used first
+token_icons_bytes = 0  # Approximate memory held by token_icons
+token_photos = OrderedDict()  # (chainId, tokenAddress) -> Tk image, least recently used first
+
+# Tokens seen across fetches and polls, so each one only yields a delta
+seen_tokens = SeenSet()
+
+# "Show More" source once the polled tokens run out (token_pages.TokenPages), created on first use
+token_pages = None
+token_pages_lock = threading.Lock()
+
+# Finished card data handed from the fetch worker thread to the Tk main thread
+results_queue = queue.Queue()
+fetch_in_progress = False  # Only read and written on the Tk main thread
+
+################################################################################
+# BACKGROUND & UI CONTROL
+################################################################################
+
+def background_search():
+    """
+    Runs on the fetch worker thread: fetches, filters and decodes the icons
+    of the first page, then hands the finished card data to the UI thread
+    through results_queue. Never touches Tk widgets.
+    """
+    from dexscreener import get_token_data
+
+    print("Starting token search...")
+    tokens = hub_tokens()  # A running feed hub (feed_hub.py) already polls for every viewer
+    if tokens is not None:
+        process_tokens(tokens, enriched=True)
+    else:
+        process_tokens(get_token_data(chains=TOKEN_FILTER.chains))
+
+
+def fetch_latest_tokens() -> list:
+    """
+    Fetch function for the poller; defers importing requests to the poller thread.
+    """
+    from dexscreener import fetch_token_profiles
+
+    return fetch_token_profiles()
+
+
+def process_tokens(tokens: list, enriched: bool = False):
+    """
+    Diffs a fetched batch against every token seen before, filters only the
+    new and changed ones and decodes their icons on the calling (worker,
+    poller or hub client) thread, then posts the delta for the UI.
+    Batches from the feed hub are 'enriched' and recorded already.
+    """
+    from enrichment import enrich_tokens
+    from history import record_tokens
+
+    # Log the number of fetched tokens but not their raw data
+    print(f"Fetched {len(tokens)} tokens.")
+    if not tokens:
+        print("No tokens found this round.")
+        return
+
+    if not enriched:
+        tokens = enrich_tokens(tokens)  # Profiles carry no market data; resolve it 30 tokens per request
+        record_tokens(tokens)  # Queued; written to the history database by its own thread
+    record_series(tokens)  # Per-token history for the ranking's momentum and drain terms
+    delta = seen_tokens.diff(tokens)
+    print(f"{len(delta.new)} new, {len(delta.changed)} changed, {len(delta.dropped)} dropped since the last fetch.")
+
+    # Filter tokens with the compiled filter spec (market cap, holders, age and chainId by default)
+    new_found = TOKEN_FILTER.apply(delta.new)
+    changed_found = TOKEN_FILTER.apply(delta.changed)
+    still_matching = {token_key(token) for token in changed_found}
+    unmatched = [token_key(token) for token in delta.changed if token_key(token) not in still_matching]
+    TOKEN_RANKING.update(delta.new + delta.changed, keep=TOKEN_FILTER.matches)
+    new_found = TOKEN_RANKING.order(new_found)
+
+    print(f"After filtering, {len(new_found)} new tokens found.")
+    if not new_found and not changed_found and not unmatched:
+        return
+
+    from icons import prefetch_icons
+
+    icons = prefetch_icons(new_found + changed_found, size=ICON_SIZE)  # Download the icons concurrently
+    results_queue.put(("delta", new_found, changed_found, unmatched, icons))
+
+
+def background_warm_start():
+    """
+    Runs on a background thread at startup: shows the tokens discovered in
+    earlier sessions (from the history database) until the first fetch, and
+    marks them as seen so that fetch only reports what's new since.
+    """
+    from history import warm_start_tokens
+    from icons import prefetch_icons
+
+    tokens = warm_start_tokens()
+    if not tokens:
+        return
+
+    seen_tokens.diff(tokens)
+    TOKEN_RANKING.update(tokens, keep=TOKEN_FILTER.matches)
+    found = TOKEN_RANKING.order(TOKEN_FILTER.apply(tokens))
+    print(f"Warm start: {len(found)} of {len(tokens)} tokens from history match the filter.")
+    if found:
+        icons = prefetch_icons(found[:5], size=ICON_SIZE)  # The rest are decoded on "Show More"
+        results_queue.put(("delta", found, [], [], icons))
+
+
+def background_show_more(remaining_tokens: list):
+    """
+    Runs on the fetch worker thread: decodes the icons of the next page, or
+    takes the next page from the paginated source once 'remaining_tokens'
+    (the polled tokens not shown yet) are used up.
+    """
+    from icons import prefetch_icons
+
+    if remaining_tokens:
+        icons = prefetch_icons(remaining_tokens, size=ICON_SIZE)  # Usually warm, see prefetch_next_page()
+    else:
+        remaining_tokens, icons = get_token_pages().next_page()
+        print(f"Loaded {len(remaining_tokens)} more tokens from upstream.")
+    results_queue.put(("more", remaining_tokens, icons))
+
+
+def background_prefetch(upcoming_tokens: list):
+    """
+    Runs on a background thread: prepares the page "Show More" would show
+    next, so it appears without waiting on the network.
+    """
+    from icons import prefetch_icons
+
+    if upcoming_tokens:
+        prefetch_icons(upcoming_tokens, size=ICON_SIZE, on_error=lambda message: None)  # Into the icon cache
+    else:
+        get_token_pages().prefetch()
+
+
+def get_token_pages():
+    """
+    Returns the paginated "Show More" source, skipping the tokens already listed.
+    """
+    global token_pages
+
+    with token_pages_lock:
+        if token_pages is None:
+            from token_pages import TokenPages
+
+            token_pages = TokenPages(
+                TOKEN_FILTER, icon_size=ICON_SIZE, exclude=[token_key(token) for token in filtered_tokens]
+            )
+        return token_pages
+
+
+def run_in_background(target, *args):
+    """
+    Runs 'target' on a daemon worker thread and always reports back with a
+    "done" message, so the UI can re-enable its controls even on errors.
+    """
+    def worker():
+        try:
+            target(*args)
+        except Exception as e:
+            print(f"Error in background fetch: {e}")
+        finally:
+            results_queue.put(("done",))
+
+    threading.Thread(target=worker, name="fetch-worker", daemon=True).start()
+
+
+def process_results():
+    """
+    Drains results_queue on the Tk main thread and renders whatever the worker
+    has finished. Reschedules itself with root.after, so the UI keeps running
+    at full frame rate while a fetch is in progress.
+    """
+    global fetch_in_progress
+
+    try:
+        while True:
+            message = results_queue.get_nowait()
+            kind = message[0]
+
+            if kind == "delta":
+                _, new_tokens, changed_tokens, unmatched, icons = message
+                with metrics.timer("render"):
+                    apply_delta(new_tokens, changed_tokens, unmatched, icons)
+                update_show_more_button()
+                prefetch_next_page()
+
+            elif kind == "more":
+                _, more_tokens, icons = message
+                with metrics.timer("render"):
+                    show_more_cards(more_tokens, icons)
+                prefetch_next_page()
+
+            elif kind == "logo":
+                show_logo()
+
+            elif kind == "done":
+                fetch_in_progress = False
+
+                # Re-enable the fetch button after processing
+                fetch_button.config(state=tk.NORMAL)
+                update_show_more_button()
+
+    except queue.Empty:
+        pass
+
+    root.after(QUEUE_POLL_MS, process_results)
+
+
+def apply_delta(new_tokens: list, changed_tokens: list, unmatched: list, icons: dict):
+    """
+    Patches the card view with one fetch's delta instead of rebuilding it:
+    changed tokens are replaced in place, new tokens (and changed ones that
+    only match the filter now) are added to the displayed cards (or, on an
+    empty view, the first 5 are displayed), and the cards of 'unmatched'
+    keys, changed tokens that stopped matching, are removed. The displayed
+    cards are then re-sorted by TOKEN_RANKING, so a delta takes its rank
+    among the older cards. Only the cards in the viewport are rebound.
+    """
+    global filtered_tokens, tokens_displayed, token_counter
+
+    store_icons(new_tokens + changed_tokens, icons)
+
+    if unmatched:
+        unmatched = set(unmatched)
+        tokens_displayed -= sum(1 for token in filtered_tokens[:tokens_displayed] if token_key(token) in unmatched)
+        filtered_tokens = [token for token in filtered_tokens if token_key(token) not in unmatched]
+        for key in unmatched:
+            token_numbers.pop(key, None)
+            forget_icon(key)
+
+    if changed_tokens:
+        positions = {token_key(token): i for i, token in enumerate(filtered_tokens)}
+        matching_now = []
+        for token in changed_tokens:
+            key = token_key(token)
+            if key in positions:
+                filtered_tokens[positions[key]] = token
+            else:
+                matching_now.append(token)
+        new_tokens = new_tokens + matching_now
+
+    if not new_tokens:
+        rank_displayed()
+        token_list.set_count(tokens_displayed)
+        return
+
+    # Number new tokens in discovery order, oldest first
+    for token in reversed(new_tokens):
+        token_counter += 1
+        token_numbers[token_key(token)] = token_counter
+
+    filtered_tokens = new_tokens + filtered_tokens
+    trim_tokens()
+
+    if tokens_displayed == 0:
+        # Display the top 5 tokens
+        print(f"Displaying top 5 filtered tokens...")
+        tokens_displayed = min(5, len(new_tokens))
+        rank_displayed()
+        token_list.set_count(tokens_displayed)
+    else:
+        # Rank newly discovered tokens among the ones already displayed
+        tokens_displayed = min(tokens_displayed + len(new_tokens), len(filtered_tokens))
+        rank_displayed()
+        first_visible = int(token_list.canvas.canvasy(0) // token_list.stride)
+        new_keys = {token_key(token) for token in new_tokens}
+        inserted_above = sum(1 for token in filtered_tokens[:first_visible] if token_key(token) in new_keys)
+        token_list.set_count(tokens_displayed, inserted_above=inserted_above)
+
+
+def rank_displayed():
+    """
+    Re-sorts the displayed cards best first by their TOKEN_RANKING scores;
+    the tokens not shown yet keep their place for "Show More".
+    """
+    filtered_tokens[:tokens_displayed] = TOKEN_RANKING.order(filtered_tokens[:tokens_displayed])
+
+
+def show_more_cards(more_tokens: list, icons: dict):
+    """
+    Displays the next page below the current cards. Tokens from the paginated
+    source that aren't listed yet are appended to filtered_tokens first.
+    """
+    global tokens_displayed, token_counter
+
+    store_icons(more_tokens, icons)
+
+    listed = {token_key(token) for token in filtered_tokens}
+    for token in more_tokens:
+        key = token_key(token)
+        if key not in listed:
+            listed.add(key)
+            token_counter += 1
+            token_numbers[key] = token_counter
+            filtered_tokens.append(token)
+
+    tokens_displayed = min(tokens_displayed + len(more_tokens), len(filtered_tokens))
+    token_list.set_count(tokens_displayed)
+
+
+def prefetch_next_page():
+    """
+    Starts preparing the next "Show More" page while the user reads this one.
+    """
+    if filtered_tokens:
+        upcoming_tokens = filtered_tokens[tokens_displayed:tokens_displayed + 5]
+        threading.Thread(target=background_prefetch, args=(upcoming_tokens,), name="prefetch", daemon=True).start()
+
+
+def trim_tokens():
+    """
+    Drops the oldest tokens beyond MAX_RETAINED_TOKENS, along with their
+    card numbers, icons and Tk images.
+    """
+    if len(filtered_tokens) <= MAX_RETAINED_TOKENS:
+        return
+
+    kept = {token_key(token) for token in filtered_tokens[:MAX_RETAINED_TOKENS]}
+    for token in filtered_tokens[MAX_RETAINED_TOKENS:]:
+        key = token_key(token)
+        if key not in kept:  # A token forgotten by seen_tokens and found again is listed twice
+            token_numbers.pop(key, None)
+            forget_icon(key)
+    del filtered_tokens[MAX_RETAINED_TOKENS:]
+
+
+def store_icons(tokens: list, icons: dict):
+    """
+    Keeps the decoded icons of 'tokens' for their cards, dropping stale Tk images.
+    """
+    for token in tokens:
+        icon = icons.get(token.icon)
+        if icon is not None:
+            remember_icon(token_key(token), icon)
+
+
+def icon_bytes(icon) -> int:
+    return icon.width * icon.height * len(icon.getbands())
+
+
+def remember_icon(key: tuple, icon):
+    """
+    Keeps a token's decoded icon, evicting the least recently used ones
+    beyond ICON_MEMORY_BUDGET (they're reloaded from the icon cache if needed).
+    """
+    global token_icons_bytes
+
+    forget_icon(key)
+    token_icons[key] = icon
+    token_icons_bytes += icon_bytes(icon)
+    while token_icons_bytes > ICON_MEMORY_BUDGET and len(token_icons) > 1:
+        _, evicted = token_icons.popitem(last=False)
+        token_icons_bytes -= icon_bytes(evicted)
+
+
+def forget_icon(key: tuple):
+    """ Drops a token's decoded icon and Tk image. """
+    global token_icons_bytes
+
+    icon = token_icons.pop(key, None)
+    if icon is not None:
+        token_icons_bytes -= icon_bytes(icon)
+    token_photos.pop(key, None)
+
+
+def update_show_more_button():
+    """
+    Enables the "Show More" button if there are more tokens left (listed, or
+    still upstream) and no fetch is running.
+    """
+    more_upstream = filtered_tokens and (token_pages is None or not token_pages.exhausted)
+    if not fetch_in_progress and (tokens_displayed < len(filtered_tokens) or more_upstream):
+        show_more_button.config(state=tk.NORMAL)
+    else:
+        show_more_button.config(state=tk.DISABLED)
+
+
+def poll_without_hub(hub):
+    """
+    Runs on the hub client's thread when the feed hub auto-poll follows goes
+    away: stops following it and polls locally instead.
+    """
+    hub.on_update = hub.on_disconnect = None
+    print("Lost the feed hub; auto-poll continues locally.")
+    poller.start()
+
+
+def toggle_auto_poll():
+    """
+    Starts or stops continuous polling at FETCH_INTERVAL (adapted by the
+    scheduler to how fast new tokens arrive and to API throttling). When a
+    feed hub is running, its pushed updates are shown instead of polling.
+    """
+    hub = get_hub_client()
+    if poller.running or (hub is not None and hub.on_update is not None):
+        poller.stop()
+        if hub is not None:
+            hub.on_update = hub.on_disconnect = None
+        auto_poll_button.config(text="Auto-Poll: Off")
+        print("Auto-poll stopped.")
+    elif hub is not None:
+        hub.on_update = lambda tokens: process_tokens(tokens, enriched=True)
+        hub.on_disconnect = lambda: poll_without_hub(hub)
+        auto_poll_button.config(text="Auto-Poll: On")
+        print(f"Auto-poll following the feed hub at {hub.path}.")
+    else:
+        poller.start()
+        auto_poll_button.config(text="Auto-Poll: On")
+        print(f"Auto-poll started (every ~{FETCH_INTERVAL}s, adaptive).")
+
+
+def refresh_token_list():
+    """
+    Refreshes the token list by calling the background search and updating the display.
+    """
+    fetch_process()
+
+
+def fetch_process():
+    global fetch_in_progress, token_pages
+
+    if fetch_in_progress:
+        return  # A fetch is already running on the worker thread
+
+    print("Fetching new token data...")
+    token_pages = None  # "Show More" starts over from the newest upstream data
+    fetch_in_progress = True
+    fetch_button.config(state=tk.DISABLED)  # Disable the Fetch button while processing
+    show_more_button.config(state=tk.DISABLED)
+    run_in_background(background_search)
+
+
+def start_process():
+    fetch_process()
+
+
+def show_more_tokens():
+    """
+    Displays the next batch of filtered tokens (after the first 5).
+    Icons are decoded on the worker thread; the cards appear once they're ready.
+    """
+    global fetch_in_progress
+
+    if fetch_in_progress:
+        return
+
+    remaining_tokens = filtered_tokens[tokens_displayed:tokens_displayed + 5]
+    fetch_in_progress = True
+    show_more_button.config(state=tk.DISABLED)
+    run_in_background(background_show_more, remaining_tokens)
+
+
+################################################################################
+# DISPLAYING TOKEN INFO
+################################################################################
+
+class TokenCard:
+    """
+    A card's widgets, built once by the virtual list and rebound to a
+    different token as the user scrolls. Shows, in order:
+      1) token name (bold)
+      2) icon (image, already downloaded and decoded by prefetch_icons)
+      3) tokenAddress
+      4) URL (clickable)
+      5) links (clickable, up to MAX_CARD_LINKS)
+    """
+
+    def __init__(self, parent):
+        self.frame = ttkb.Frame(parent, bootstyle="dark", padding=20, borderwidth=2, relief="solid")
+        self.frame.pack_propagate(False)  # Fixed height, so rows can be recycled
+        self.token = None
+
+        # Token name (bold)
+        self.name_label = ttkb.Label(self.frame, font=("Helvetica", 16, "bold"), foreground="lightblue", background="")
+        self.name_label.pack(pady=(0, 15))
+
+        # Icon; empty when the token has none
+        self.icon_label = ttkb.Label(self.frame)
+        self.icon_label.pack(pady=(0, 15))
+
+        # Token Address
+        self.address_label = ttkb.Label(self.frame, font=("Helvetica", 12), foreground="lightgreen", background="")
+        self.address_label.pack(pady=(0, 15))
+
+        # URL as clickable link
+        url_label = ttkb.Label(self.frame, text="URL:", font=("Helvetica", 12, "bold"), foreground="cyan", background="")
+        url_label.pack(pady=(0, 5))
+        self.url_link = add_hyperlink(None, "N/A", parent=self.frame)
+
+        # Links section - clickable
+        links_label = ttkb.Label(self.frame, text="Links:", font=("Helvetica", 12, "bold"), foreground="magenta", background="")
+        links_label.pack(pady=(0, 5))
+        self.link_labels = [add_hyperlink(None, "", parent=self.frame) for _ in range(MAX_CARD_LINKS)]
+
+
+def bind_card(card: TokenCard, index: int):
+    """
+    Fills a recycled card with the token at 'index' in filtered_tokens.
+    """
+    token = filtered_tokens[index]
+    if card.token is token:
+        return  # Already showing this exact record
+    card.token = token
+
+    card.name_label.config(text=f"Token #{token_numbers.get(token_key(token), index + 1)}: {token.tokenAddress or 'N/A'}")
+
+    img_tk = get_token_photo(token)
+    card.icon_label.config(image=img_tk if img_tk is not None else "")
+    card.icon_label.image = img_tk  # Keep a reference to the image
+
+    card.address_label.config(text=f"Address: {token.tokenAddress or 'N/A'}")
+
+    if token.url and token.url != "N/A":
+        update_hyperlink(card.url_link, token.url, token.url)
+    else:
+        update_hyperlink(card.url_link, None, "N/A")
+
+    links_list = token.links[:MAX_CARD_LINKS]
+    for i, link_label in enumerate(card.link_labels):
+        if i < len(links_list):
+            update_hyperlink(link_label, links_list[i], links_list[i])
+        else:
+            update_hyperlink(link_label, None, "None" if i == 0 else "")
+
+
+def get_token_photo(token: Token):
+    """
+    Returns the Tk image for a token's icon, creating it on first use.
+    Only the most recently used PhotoImages are kept alive.
+    """
+    key = token_key(token)
+    img_tk = token_photos.get(key)
+    if img_tk is not None:
+        token_photos.move_to_end(key)
+        return img_tk
+
+    icon = token_icons.get(key)
+    if icon is not None:
+        token_icons.move_to_end(key)
+    elif token.icon:
+        # Evicted under ICON_MEMORY_BUDGET: reload the thumbnail from the icon cache
+        from icon_cache import get_icon_cache
+        from icons import icon_variant
+
+        cached = get_icon_cache().get(token.icon, icon_variant(ICON_SIZE))
+        if cached is None:
+            return None
+        icon = cached.image
+        remember_icon(key, icon)
+    else:
+        return None
+
+    from PIL import ImageTk
+
+    img_tk = ImageTk.PhotoImage(icon)
+    token_photos[key] = img_tk
+    while len(token_photos) > PHOTO_CACHE_SIZE:
+        token_photos.popitem(last=False)
+    return img_tk
+
+
+################################################################################
+# ADD HYPERLINK FUNCTION
+################################################################################
+
+def add_hyperlink(url, display_text: str, parent: ttkb.Frame) -> ttkb.Label:
+    """
+    Inserts 'display_text' as a clickable link in the given parent frame
+    which, when clicked, opens 'url' in the default web browser.
+    Returns the label so recycled cards can point it at another URL.
+    """
+    global hyperlink_id
+
+    tag_name = f"hyper-{hyperlink_id}"
+    hyperlink_id += 1
+
+    # Create a label with custom styling to look like a link
+    link_label = ttkb.Label(parent, text=display_text, font=("Helvetica", 12, "underline"), foreground="#1E90FF", background="")
+    link_label.pack(pady=(0, 5))
+    link_label.hyperlink_tag = tag_name
+
+    # Store the URL for the link
+    update_hyperlink(link_label, url, display_text)
+
+    def click_callback(event, tag=tag_name):
+        link_url = hyperlinks_map.get(tag)
+        if link_url:
+            webbrowser.open(link_url)
+
+    # Bind the click event to the label
+    link_label.bind("<Button-1>", click_callback)
+    return link_label
+
+
+def update_hyperlink(link_label: ttkb.Label, url, display_text: str) -> None:
+    """
+    Points an existing link label at 'url'; with no URL it shows plain gray text.
+    """
+    tag_name = link_label.hyperlink_tag
+    if url:
+        hyperlinks_map[tag_name] = url
+        link_label.config(text=display_text, font=("Helvetica", 12, "underline"), foreground="#1E90FF")
+    else:
+        hyperlinks_map.pop(tag_name, None)
+        link_label.config(text=display_text, font=("Helvetica", 12), foreground="gray")
+
+
+################################################################################
+# HEADER LOGO
+################################################################################
+
+def show_logo():
+    """
+    Shows the pre-resized logo from the cache (or the bundled asset) using
+    Tk's native PNG support, so startup needs neither PIL nor the network.
+    """
+    for path in (LOGO_CACHE_PATH, LOGO_BUNDLED_PATH):
+        if not os.path.exists(path):
+            continue
+        try:
+            logo_tk = tk.PhotoImage(file=path)
+        except tk.TclError as e:
+            print(f"Error loading logo {path}: {e}")
+            continue
+
+        header_logo_label.config(image=logo_tk)
+        header_logo_label.image = logo_tk  # Keep a reference to the image
+        return
+
+
+def refresh_logo():
+    """
+    Runs on a background thread once the window is up: re-downloads the logo
+    if the cached copy is missing or stale, resizes it to LOGO_WIDTH and
+    saves it atomically, then asks the UI thread to show it. Importing
+    requests here also warms it up for the first fetch.
+    """
+    try:
+        if os.path.exists(LOGO_CACHE_PATH) and time.time() - os.path.getmtime(LOGO_CACHE_PATH) < LOGO_REFRESH_AFTER:
+            return
+
+        download_logo(LOGO_CACHE_PATH)
+    except Exception as e:
+        print(f"Error refreshing logo: {e}")
+        return
+
+    results_queue.put(("logo",))
+
+
+def download_logo(path: str):
+    """
+    Downloads LOGO_URL, resizes it to LOGO_WIDTH and saves it to 'path'
+    atomically. Also regenerates the bundled asset:
+      python -c "import script; script.download_logo(script.LOGO_BUNDLED_PATH)"
+    """
+    from io import BytesIO
+    from PIL import Image
+    from dexscreener import TIMEOUT, get_session
+
+    response = get_session().get(LOGO_URL, timeout=TIMEOUT)
+    response.raise_for_status()
+    logo_image = Image.open(BytesIO(response.content))
+
+    # Resize the image to LOGO_WIDTH while maintaining the aspect ratio
+    height = int((LOGO_WIDTH / logo_image.width) * logo_image.height)
+    logo_image = logo_image.resize((LOGO_WIDTH, height), Image.Resampling.LANCZOS)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    logo_image.save(tmp_path, format="PNG")
+    os.replace(tmp_path, path)
+
+
+################################################################################
+# MAIN UI SETUP
+################################################################################
+
+def build_window():
+    """
+    Builds the main window. Called from main() rather than at import time,
+    so the icon decode workers, which re-import this module when they start,
+    don't open windows of their own.
+    """
+    global root, header_logo_label, fetch_button, show_more_button, auto_poll_button, token_list
+
+    root = ttkb.Window(themename="darkly")  # Set dark theme using ttkbootstrap
+
+    root.title("Web 3.0 Dexscreener Tokens")
+    root.geometry("950x1250")  # Change window size to 950x1250
+
+    # Create a container frame with a sleek shadow effect and rounded corners
+    frame = ttkb.Frame(root, bootstyle="dark", padding=20)
+    frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
+
+    # Add the logo image in the header and center it with no background or border.
+    # It comes from disk, never the network: a missing logo is filled in once refresh_logo() has downloaded it
+    header_logo_label = ttkb.Label(frame, relief="flat", borderwidth=0)  # No border or relief
+    header_logo_label.pack(pady=30)  # Adjust the padding as needed
+    show_logo()
+
+    # Header Section (added)
+    header_frame = ttkb.Frame(frame, bootstyle="dark")
+    header_frame.pack(pady=20)
+
+    # Title Label: Proliv Token Tracker
+    title_label = ttkb.Label(header_frame, text="Proliv Token Tracker", font=("Helvetica", 20, "bold"), foreground="white", background="")
+    title_label.pack()
+
+    # Slogan Label: Ai Tracked Newest SOL/ETH Pairs
+    slogan_label = ttkb.Label(header_frame, text="Ai Tracked Newest SOL/ETH Pairs", font=("Helvetica", 12), foreground="white", background="")
+    slogan_label.pack()
+
+    # Button Frame for controls
+    button_frame = ttkb.Frame(frame, bootstyle="dark")
+    button_frame.pack(pady=20)
+
+    # Use grid layout to space buttons evenly
+    button_frame.grid_columnconfigure(0, weight=1)
+    button_frame.grid_columnconfigure(1, weight=1)
+    button_frame.grid_columnconfigure(2, weight=1)
+    button_frame.grid_columnconfigure(3, weight=1)
+
+    # Updated button styles with neon colors
+    fetch_button = ttkb.Button(button_frame, text="Fetch Tokens", command=start_process, bootstyle="primary",
+                               padding=(12, 5), width=20, style="success")  # Neon blue for "Fetch Tokens"
+    fetch_button.grid(row=0, column=0, padx=10)
+
+    show_more_button = ttkb.Button(button_frame, text="Show More", command=show_more_tokens, bootstyle="info",
+                                   padding=(12, 5), width=20, style="info")  # Neon purple for "Show More"
+    show_more_button.grid(row=0, column=1, padx=10)
+    show_more_button.config(state=tk.DISABLED)
+
+    # Change Refresh button to purple/pink color
+    refresh_button = ttkb.Button(button_frame, text="Refresh", command=refresh_token_list, bootstyle="secondary",
+                                 padding=(12, 5), width=20, style="")  # Purple/Pink for "Refresh"
+    refresh_button.grid(row=0, column=2, padx=10)
+
+    # Toggle for continuous, adaptive polling
+    auto_poll_button = ttkb.Button(button_frame, text="Auto-Poll: Off", command=toggle_auto_poll, bootstyle="warning",
+                                   padding=(12, 5), width=20)
+    auto_poll_button.grid(row=0, column=3, padx=10)
+
+    # Virtualized, scrollable list of token cards: only enough cards to fill the
+    # viewport are created, and they are rebound to other tokens while scrolling
+    token_list = VirtualList(frame, CARD_HEIGHT, TokenCard, bind_card, gap=CARD_GAP)
+    token_list.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
+    canvas = token_list.canvas
+
+    # Bind the mouse wheel scroll to the canvas
+    def on_canvas_scroll(event):
+        canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+
+    # Bind the mouse wheel event to the entire window
+    canvas.bind_all("<MouseWheel>", on_canvas_scroll)
+
+    # Footer with copyright and social links
+    footer_frame = ttkb.Frame(root, bootstyle="dark", padding=10)
+    footer_frame.pack(fill=tk.X, side=tk.BOTTOM)
+
+    # Copyright text
+    copyright_label = ttkb.Label(footer_frame, text="© Nexgonic", font=("Helvetica", 12), bootstyle="light", background="")
+    copyright_label.pack(pady=(5, 0))
+
+    # Social Media Links (Twitter (X), Telegram, Website)
+    social_frame = ttkb.Frame(footer_frame)
+    social_frame.pack(pady=(5, 0))
+
+    # Twitter (X), Telegram, Website Icons
+    twitter_icon = ttkb.Label(social_frame, text="🐦", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
+    twitter_icon.pack(side=tk.LEFT, padx=10)
+    telegram_icon = ttkb.Label(social_frame, text="📱", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
+    telegram_icon.pack(side=tk.LEFT, padx=10)
+    website_icon = ttkb.Label(social_frame, text="🌐", font=("Helvetica", 16, "bold"), bootstyle="light", background="")
+    website_icon.pack(side=tk.LEFT, padx=10)
+
+    # Links
+    twitter_icon.bind("<Button-1>", lambda e: webbrowser.open("https://x.com/nexgonic"))
+    telegram_icon.bind("<Button-1>", lambda e: webbrowser.open("https://telegram.com/nexgonicai"))
+    website_icon.bind("<Button-1>", lambda e: webbrowser.open("https://nexgonic.com"))
+
+    # Create a frame to center the whitelist banner
+    whitelist_frame = ttkb.Frame(footer_frame)
+    whitelist_frame.pack(fill=tk.X, pady=(5, 0))
+
+    # Whitelist Sign-Up Banner centered in the frame
+    whitelist_banner = ttkb.Label(whitelist_frame, text="White List Sign Up For Upcoming Releases", font=("Helvetica", 12), bootstyle="info", background="")
+    whitelist_banner.pack(pady=(5, 0), ipadx=20, ipady=5, anchor="center")
+
+
+running = False
+
+# Continuous polling runs on its own thread and feeds the same results queue
+poller = Poller(fetch_latest_tokens, process_tokens, AdaptiveSchedule(FETCH_INTERVAL))
+
+
+def report_startup():
+    """
+    Prints how long the window took to come up. With SOLSNIPER_STARTUP_CHECK=1
+    the app then quits, exiting non-zero if it went over STARTUP_BUDGET.
+    """
+    elapsed = time.perf_counter() - STARTED_AT
+    print(f"Window ready in {elapsed:.3f}s (budget {STARTUP_BUDGET}s).")
+
+    if os.environ.get("SOLSNIPER_STARTUP_CHECK") == "1":
+        root.destroy()
+        sys.exit(0 if elapsed <= STARTUP_BUDGET else 1)
+
+
+# Start the Tkinter event loop
+def main():
+    build_window()
+    root.after(QUEUE_POLL_MS, process_results)  # Start draining fetch results
+    root.after_idle(report_startup)  # First idle moment: the window has been drawn
+    threading.Thread(target=refresh_logo, name="logo-refresh", daemon=True).start()
+    threading.Thread(target=background_warm_start, name="warm-start", daemon=True).start()
+    metrics.start_metrics_server()  # Prometheus endpoint, when SOLSNIPER_METRICS_PORT is set
+    try:
+        root.mainloop()
+    except KeyboardInterrupt:
+        print("Script interrupted by user (KeyboardInterrupt). Exiting gracefully...")
+        sys.exit(0)
+    finally:
+        from history import flush_history
+        flush_history()  # Batches the writer thread hasn't committed yet
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+SEEN_MAX_ENTRIES = 50000  # Hard cap on remembered tokens
+SEEN_WINDOW = 24 * 3600  # Tokens not seen for this many seconds are forgotten
+
+# Result of comparing one poll with everything seen before
+TokenDelta = namedtuple("TokenDelta", ["new", "changed", "dropped"])
+
+
+def token_key(token) -> tuple:
+    """
+    Identifies a token across polls by (chainId, tokenAddress); the same
+    key as Token.key(), so keys from either can be mixed.
+    """
+    return token.key()
+
+
+def fingerprint(token) -> int:
+    """
+    Hashes every field of a Token record, to detect changed tokens.
+    """
+    return hash(token)
+
+
+################################################################################
+# SEEN SET
+################################################################################
+
+class SeenSet:
+    """
+    Remembers every token seen across polls, keyed by (chainId, tokenAddress),
+    and turns each new poll into a TokenDelta:
+      new      tokens never seen before (or forgotten since)
+      changed  tokens seen before whose fields differ
+      dropped  keys that were in the previous poll but not in this one
+    Memory is bounded: entries expire after 'window' seconds without being
+    seen, and the least recently seen entries go first beyond 'max_entries'.
+    Safe to share between the fetch worker and poller threads.
+    """
+
+    def __init__(self, max_entries: int = SEEN_MAX_ENTRIES, window: float = SEEN_WINDOW):
+        self.max_entries = max_entries
+        self.window = window
+
+        self._entries = OrderedDict()  # key -> (fingerprint, last_seen), oldest first
+        self._previous = set()  # Keys in the previous poll
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def diff(self, tokens: list) -> TokenDelta:
+        """
+        Records a poll and returns what changed since the tokens were last seen.
+        """
+        now = time.monotonic()
+        new, changed, current = [], [], set()
+
+        with self._lock:
+            for token in tokens:
+                key = token_key(token)
+                if key in current:
+                    continue  # Duplicate within the same response
+                current.add(key)
+
+                token_print = fingerprint(token)
+                entry = self._entries.pop(key, None)
+                if entry is None:
+                    new.append(token)
+                elif entry[0] != token_print:
+                    changed.append(token)
+                self._entries[key] = (token_print, now)  # Re-inserted as most recently seen
+
+            dropped = [key for key in self._previous if key not in current]
+            self._previous = current
+            self._expire(now)
+
+        return TokenDelta(new, changed, dropped)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._entries:
+            key, (_, last_seen) = next(iter(self._entries.items()))
+            if last_seen >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
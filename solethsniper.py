@@ -1,192 +1,235 @@
-import sys
-import requests
-import streamlit as st
-from PIL import Image
-from io import BytesIO
-import webbrowser
-
-################################################################################
-# GLOBAL CONSTANTS & CONFIG
-################################################################################
-
-API_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
-FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/58.0.3029.110 Safari/537.36"
-    )
-}
-
-# Global variables for filtered tokens
-filtered_tokens = []
-tokens_displayed = 0  # Keep track of how many tokens have been displayed
-
-################################################################################
-# FETCHING TOKEN DATA
-################################################################################
-
-def get_token_data() -> list:
-    """
-    Fetches token data from Dexscreener, returns a list of token dictionaries.
-    Only extracts these fields:
-      url (clickable link)
-      tokenAddress
-      icon (image)
-      links
-      price
-      marketCap
-      liquidity
-      volume
-      holders
-      age
-      chainId
-    """
-    try:
-        response = requests.get(API_URL, headers=HEADERS)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if isinstance(data, dict) and "tokens" in data:
-            tokens = data["tokens"]
-        elif isinstance(data, list):
-            tokens = data
-        else:
-            return []  # If the response isn't as expected
-
-        return tokens[:30] if tokens else []  # Return the first 30 tokens
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
-        return []
-
-
-################################################################################
-# BACKGROUND & UI CONTROL
-################################################################################
-
-def background_search():
-    print("Starting token search...")
-
-    tokens = get_token_data()
-
-    # Log the number of fetched tokens but not their raw data
-    print(f"Fetched {len(tokens)} tokens.")
-    if tokens:
-        # Filter tokens based on market cap, holders, age, and chainId being 'solana' or 'ethereum'
-        global filtered_tokens
-        filtered_tokens = [
-            token for token in tokens
-            if token.get("marketCap", 0) < 10000000 and  # Relaxed filter
-               token.get("holders", 0) < 5000 and  # Relaxed filter
-               token.get("age", 0) < 2 and
-               token.get("chainId", "") in ["solana", "ethereum"]  # Filter for Solana or Ethereum chainId
-        ]
-
-        print(f"After filtering, {len(filtered_tokens)} tokens found.")
-
-        # Display the top 5 tokens
-        if filtered_tokens:
-            print(f"Displaying top 5 filtered tokens...")
-            global tokens_displayed
-            tokens_displayed = 5
-            for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
-                display_token(token, i)
-        else:
-            print("No tokens found after filtering.")
-
-        # Show more button becomes visible if there are more than 5 tokens
-        if len(filtered_tokens) > 5:
-            st.button("Show More", on_click=show_more_tokens)
-
-    else:
-        print("No tokens found this round.")
-
-
-def show_more_tokens():
-    """
-    Displays the next batch of filtered tokens (after the first 5).
-    """
-    global tokens_displayed
-    remaining_tokens = filtered_tokens[tokens_displayed:tokens_displayed + 5]
-
-    for i, token in enumerate(remaining_tokens, start=tokens_displayed + 1):
-        display_token(token, i)
-
-    tokens_displayed += len(remaining_tokens)
-
-
-################################################################################
-# DISPLAYING TOKEN INFO
-################################################################################
-
-def display_token(token: dict, index: int):
-    """
-    Inserts token info into a card layout.
-    """
-    st.markdown(f"### Token #{index}: {token.get('tokenAddress', 'N/A')}")
-    st.markdown(f"**Address:** {token.get('tokenAddress', 'N/A')}")
-
-    # Displaying the icon as an image
-    icon_url = token.get("icon", "")
-    if icon_url:
-        try:
-            # Fetch the icon image
-            response = requests.get(icon_url)
-            if response.status_code == 200 and 'image' in response.headers['Content-Type']:
-                img_data = response.content
-                img = Image.open(BytesIO(img_data))
-                img.thumbnail((100, 100))  # Resize the image to fit within a smaller space
-                st.image(img, width=100)
-            else:
-                print(f"Error loading icon: {icon_url} - Not a valid image")
-        except Exception as e:
-            print(f"Error loading icon: {e}")
-
-    # URL as clickable link
-    url = token.get("url", "")
-    if url:
-        st.markdown(f"[Visit Token URL]({url})")
-
-    # Links section - clickable
-    links_list = token.get("links", [])
-    if links_list:
-        st.markdown("**Links:**")
-        for link in links_list:
-            st.markdown(f"[{link}]({link})")
-    else:
-        st.markdown("**Links:** None")
-
-
-################################################################################
-# MAIN UI SETUP
-################################################################################
-
-def main():
-    st.set_page_config(page_title="Web 3.0 Dexscreener Tokens", layout="wide")
-
-    st.title("Web 3.0 Dexscreener Tokens")
-    st.subheader("Ai Tracked Newest SOL/ETH Pairs")
-
-    st.markdown("### Controls")
-    st.button("Fetch Tokens", on_click=background_search)
-    st.button("Refresh", on_click=background_search)
-
-    st.markdown("### Token Results")
-    # Initial empty placeholder to render the results dynamically
-    if not filtered_tokens:
-        st.write("No tokens available. Click 'Fetch Tokens' to get started.")
-
-    if filtered_tokens:
-        for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
-            display_token(token, i)
-
-    st.markdown("### Footer")
-    st.markdown("© Nexgonic")
-    st.markdown("[Twitter](https://x.com/nexgonic) | [Telegram](https://telegram.com/nexgonicai) | [Website](https://nexgonic.com)")
-
-if __name__ == "__main__":
-    main()
+import os
+import sys
+import time
+import streamlit as st
+import webbrowser
+
+from dexscreener import fetch_token_profiles, get_token_data
+from enrichment import enrich_tokens
+from feed_hub import get_hub_client, hub_tokens
+from filters import load_filter
+from history import record_tokens, warm_start_tokens
+import metrics
+from icons import prefetch_icons
+from poller import AdaptiveSchedule, poll_once
+from ranking import Ranking, load_ranking
+from streamlit_metrics import show_metrics_panel
+from timeseries import record_series
+from token_pages import TokenPages
+from tokens import Token
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+FETCH_INTERVAL = 10  # Interval (in seconds) between consecutive fetches
+RERUN_WAIT = 2  # Longest (in seconds) auto-poll blocks the script between reruns, so the controls stay responsive
+ICON_SIZE = (100, 100)  # Icons are decoded straight to the size they're shown at
+
+# Filter spec (name in filter_specs/ or path to a JSON/YAML file), compiled once
+FILTER_SPEC = os.environ.get("SOLSNIPER_FILTER", "sol_eth")
+TOKEN_FILTER = load_filter(FILTER_SPEC)
+
+# Global variables for filtered tokens
+filtered_tokens = []
+tokens_displayed = 0  # Keep track of how many tokens have been displayed
+
+################################################################################
+# BACKGROUND & UI CONTROL
+################################################################################
+
+def background_search(tokens=None, enriched=False):
+    """
+    Filters and displays a batch of tokens, fetching one first when 'tokens'
+    isn't given (button callbacks). Batches from the feed hub are 'enriched'
+    and recorded already.
+    """
+    print("Starting token search...")
+
+    from_button = tokens is None
+    if from_button:
+        st.session_state.pop("token_pages", None)  # "Show More" starts over from the newest upstream data
+    if tokens is None:
+        tokens = hub_tokens()
+        enriched = tokens is not None
+    if tokens is None:
+        tokens = get_token_data(chains=TOKEN_FILTER.chains)
+
+    # Log the number of fetched tokens but not their raw data
+    print(f"Fetched {len(tokens)} tokens.")
+    if tokens:
+        # Filter tokens with the compiled filter spec (market cap, holders, age and chainId by default)
+        global filtered_tokens
+        if not enriched:
+            tokens = enrich_tokens(tokens)
+            record_tokens(tokens)
+        record_series(tokens)  # Before filtering and ranking, which can read the series
+        matched = TOKEN_FILTER.apply(tokens)
+        ranking = get_ranking()
+        ranking.update(tokens, keep=TOKEN_FILTER.matches)
+        filtered_tokens = ranking.top()  # Every matching token seen so far, best first
+
+        print(f"After filtering, {len(matched)} tokens found ({len(filtered_tokens)} ranked).")
+
+        # Display the top 5 tokens
+        if filtered_tokens:
+            print(f"Displaying top 5 filtered tokens...")
+            global tokens_displayed
+            tokens_displayed = 5
+            icons = prefetch_icons(filtered_tokens[:5], size=ICON_SIZE)  # Download the page's icons concurrently
+            with metrics.timer("render"):
+                for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
+                    display_token(token, i, icons.get(token.icon))
+
+            if from_button:
+                st.session_state.results_shown = True  # So the run that follows doesn't list them again
+        else:
+            print("No tokens found after filtering.")
+
+        # Show more button becomes visible if there are more than 5 tokens (listed, or still upstream)
+        if filtered_tokens and (len(filtered_tokens) > 5 or not get_token_pages().exhausted):
+            st.button("Show More", on_click=show_more_tokens)
+
+    else:
+        print("No tokens found this round.")
+
+
+def get_token_pages() -> TokenPages:
+    """ Returns this session's paginated "Show More" source, kept across reruns. """
+    if "token_pages" not in st.session_state:
+        st.session_state.token_pages = TokenPages(
+            TOKEN_FILTER, icon_size=ICON_SIZE, exclude=[token.key() for token in filtered_tokens]
+        )
+    return st.session_state.token_pages
+
+
+def show_more_tokens():
+    """
+    Displays the next batch of filtered tokens (after the first 5), taking
+    further pages from upstream once the listed ones run out. The page after
+    is prepared in the background while this one is read.
+    """
+    global tokens_displayed
+    remaining_tokens = filtered_tokens[tokens_displayed:tokens_displayed + 5]
+    if remaining_tokens:
+        icons = prefetch_icons(remaining_tokens, size=ICON_SIZE)
+    else:
+        remaining_tokens, icons = get_token_pages().next_page()  # Usually prefetched already
+        filtered_tokens.extend(remaining_tokens)
+
+    with metrics.timer("render"):
+        for i, token in enumerate(remaining_tokens, start=tokens_displayed + 1):
+            display_token(token, i, icons.get(token.icon))
+
+    tokens_displayed += len(remaining_tokens)
+    if tokens_displayed >= len(filtered_tokens):
+        get_token_pages().prefetch()
+
+
+################################################################################
+# DISPLAYING TOKEN INFO
+################################################################################
+
+def display_token(token: Token, index: int, icon=None):
+    """
+    Inserts token info into a card layout.
+    'icon' is the token's image, already downloaded and decoded by prefetch_icons.
+    """
+    st.markdown(f"### Token #{index}: {token.tokenAddress or 'N/A'}")
+    st.markdown(f"**Address:** {token.tokenAddress or 'N/A'}")
+
+    # Displaying the icon as an image
+    if icon is not None:
+        st.image(icon, width=ICON_SIZE[0])
+
+    # URL as clickable link
+    url = token.url
+    if url:
+        st.markdown(f"[Visit Token URL]({url})")
+
+    # Links section - clickable
+    links_list = token.links
+    if links_list:
+        st.markdown("**Links:**")
+        for link in links_list:
+            st.markdown(f"[{link}]({link})")
+    else:
+        st.markdown("**Links:** None")
+
+
+################################################################################
+# MAIN UI SETUP
+################################################################################
+
+@st.cache_resource
+def get_ranking() -> Ranking:
+    """ Returns the process-wide token ranking, so scores carry over between polls and reruns. """
+    return load_ranking(FILTER_SPEC)
+
+
+def get_schedule() -> AdaptiveSchedule:
+    """ Returns this session's polling schedule, kept across reruns. """
+    if "schedule" not in st.session_state:
+        st.session_state.schedule = AdaptiveSchedule(FETCH_INTERVAL)
+    return st.session_state.schedule
+
+
+def main():
+    st.set_page_config(page_title="Web 3.0 Dexscreener Tokens", layout="wide")
+
+    st.title("Web 3.0 Dexscreener Tokens")
+    st.subheader("Ai Tracked Newest SOL/ETH Pairs")
+
+    st.markdown("### Controls")
+    st.button("Fetch Tokens", on_click=background_search)
+    st.button("Refresh", on_click=background_search)
+    auto_poll = st.checkbox("Auto-Poll", help=f"Fetch continuously every ~{FETCH_INTERVAL}s, faster while new "
+                                              "tokens arrive and slower when the API throttles us.")
+
+    # Open with the tokens found in earlier sessions rather than an empty page. Every rerun
+    # starts from a fresh module, so the shared ranking (not filtered_tokens) tells whether
+    # that already happened in this process; later polls keep it current.
+    global filtered_tokens
+    ranking = get_ranking()
+    if not len(ranking):
+        ranking.update(warm_start_tokens(), keep=TOKEN_FILTER.matches)
+    if not filtered_tokens:
+        filtered_tokens = ranking.top()
+    results_shown = st.session_state.pop("results_shown", False)  # By a Fetch/Refresh callback, above
+
+    st.markdown("### Token Results")
+    # Auto-poll reruns every RERUN_WAIT at most; in between polls the ranked tokens below are shown
+    hub = get_hub_client()
+    if auto_poll and hub is not None and hub.version != st.session_state.get("hub_version"):
+        st.session_state.hub_version = hub.version
+        background_search(hub.latest(), enriched=True)  # The feed hub polls for every viewer
+    elif auto_poll and hub is None and get_schedule().next_delay() == 0:
+        background_search(poll_once(fetch_token_profiles, get_schedule()))
+
+    # Initial empty placeholder to render the results dynamically
+    elif not filtered_tokens:
+        st.write("No tokens available. Click 'Fetch Tokens' to get started.")
+
+    elif filtered_tokens and not results_shown:
+        icons = prefetch_icons(filtered_tokens[:5], size=ICON_SIZE)
+        with metrics.timer("render"):
+            for i, token in enumerate(filtered_tokens[:5], start=1):  # Display top 5 filtered tokens
+                display_token(token, i, icons.get(token.icon))
+
+    st.markdown("### Footer")
+    st.markdown("© Nexgonic")
+    st.markdown("[Twitter](https://x.com/nexgonic) | [Telegram](https://telegram.com/nexgonicai) | [Website](https://nexgonic.com)")
+
+    show_metrics_panel()
+
+    # Wait for the next poll (or the hub's next push), at most RERUN_WAIT at a time so a click or
+    # unticking Auto-Poll takes effect quickly; the rerun polls only once the schedule says so
+    if auto_poll and hub is not None:
+        hub.wait_for_update(st.session_state.hub_version, timeout=RERUN_WAIT)
+        st.rerun()
+    elif auto_poll:
+        time.sleep(min(get_schedule().next_delay(), RERUN_WAIT))
+        st.rerun()
+
+if __name__ == "__main__":
+    main()
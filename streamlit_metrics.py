@@ -0,0 +1,34 @@
+import streamlit as st
+
+import metrics
+
+################################################################################
+# STREAMLIT METRICS PANEL
+################################################################################
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """
+    Starts the Prometheus endpoint once per Streamlit server process, not
+    once per session or rerun. No-op unless SOLSNIPER_METRICS_PORT is set.
+    """
+    return metrics.start_metrics_server()
+
+
+def show_metrics_panel(container=st.sidebar) -> None:
+    """
+    Shows per-stage latency percentiles and counters in a collapsed expander.
+    """
+    start_metrics_endpoint()
+
+    with container.expander("⏱️ Pipeline Metrics"):
+        stages = metrics.stage_summary()
+        if not stages:
+            st.caption("No timings recorded yet.")
+            return
+
+        st.dataframe(stages, hide_index=True, use_container_width=True)
+
+        counters = metrics.counter_summary()
+        if counters:
+            st.dataframe(counters, hide_index=True, use_container_width=True)
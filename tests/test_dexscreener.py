@@ -0,0 +1,79 @@
+import pytest
+
+import dexscreener
+from dexscreener import SEARCH_CHAINS, get_token_data, merge_tokens, search_chains
+from mock_dexscreener import (
+    BOOSTS_LATEST_PATH, BOOSTS_TOP_PATH, PROFILES_PATH, SEARCH_PATH, MockConfig, start_mock_server,
+)
+from tokens import Token
+
+EVM_ADDRESS = "0xAbCdEf0123456789aBcDeF0123456789AbCdEf01"
+SOLANA_ADDRESS = "So11111111111111111111111111111111111111112"
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    server = start_mock_server(MockConfig(tokens=30, churn=0.0))
+    monkeypatch.setattr(dexscreener, "API_URL", f"{server.base_url}{PROFILES_PATH}")
+    monkeypatch.setattr(dexscreener, "BOOSTS_LATEST_URL", f"{server.base_url}{BOOSTS_LATEST_PATH}")
+    monkeypatch.setattr(dexscreener, "BOOSTS_TOP_URL", f"{server.base_url}{BOOSTS_TOP_PATH}")
+    monkeypatch.setattr(dexscreener, "SEARCH_URL", f"{server.base_url}{SEARCH_PATH}")
+    yield server
+    server.shutdown()
+
+
+def test_merge_dedupes_evm_addresses_across_sources():
+    profile = Token(tokenAddress=EVM_ADDRESS, chainId="ethereum", icon="profile.png")
+    other = Token(tokenAddress="0x01", chainId="ethereum")
+    pair = Token(tokenAddress=EVM_ADDRESS.lower(), chainId="ethereum", icon="pair.png", price=1.5, liquidity=100.0)
+
+    merged = merge_tokens([[profile, other], [pair]])
+
+    assert len(merged) == 2
+    assert merged[0].tokenAddress == EVM_ADDRESS  # The first listing's position and spelling win
+    assert merged[0].icon == "profile.png"
+    assert (merged[0].price, merged[0].liquidity) == (1.5, 100.0)  # Filled in from the pair search
+    assert merged[1] is other
+
+
+def test_merge_keeps_solana_addresses_case_sensitive():
+    lower = Token(tokenAddress=SOLANA_ADDRESS.lower(), chainId="solana")
+    exact = Token(tokenAddress=SOLANA_ADDRESS, chainId="solana")
+
+    assert merge_tokens([[exact], [lower]]) == [exact, lower]
+    assert merge_tokens([[exact], [exact]]) == [exact]
+
+
+def test_merge_keeps_chains_apart():
+    on_ethereum = Token(tokenAddress=EVM_ADDRESS, chainId="ethereum")
+    on_base = Token(tokenAddress=EVM_ADDRESS, chainId="base")
+
+    assert merge_tokens([[on_ethereum], [on_base]]) == [on_ethereum, on_base]
+
+
+def test_key_lowercases_only_evm_addresses():
+    assert Token(tokenAddress=EVM_ADDRESS, chainId="bsc").key() == ("bsc", EVM_ADDRESS.lower())
+    assert Token(tokenAddress=SOLANA_ADDRESS, chainId="solana").key() == ("solana", SOLANA_ADDRESS)
+
+
+def test_search_chains_follow_the_filter():
+    assert search_chains(frozenset(["Solana", "ethereum"])) == ("ethereum", "solana")
+    assert search_chains(None) == SEARCH_CHAINS
+    assert "bsc" not in SEARCH_CHAINS
+
+
+def test_get_token_data_truncates_the_merge(mock_api):
+    errors = []
+
+    tokens = get_token_data(limit=10, on_error=errors.append, chains=["solana"])
+
+    assert not errors
+    assert len(tokens) == 10
+    assert len({token.key() for token in tokens}) == 10
+
+
+def test_get_token_data_chain_filter(mock_api):
+    tokens = get_token_data(limit=5, chain_filter="ethereum", on_error=print)
+
+    assert 0 < len(tokens) <= 5
+    assert {token.chainId for token in tokens} == {"ethereum"}
@@ -0,0 +1,99 @@
+import pytest
+
+import timeseries
+from filters import FilterSpecError, TokenFilter, load_filter
+from timeseries import SeriesStore
+from tokens import Token
+
+
+def rule_filter(op: str, value: float, default: float = 0, field: str = "marketCap") -> TokenFilter:
+    return TokenFilter({"rules": [{"field": field, "op": op, "value": value, "default": default}]})
+
+
+@pytest.mark.parametrize("op, below, equal, above", [
+    ("<", True, False, False),
+    ("<=", True, True, False),
+    (">", False, False, True),
+    (">=", False, True, True),
+    ("==", False, True, False),
+    ("!=", True, False, True),
+])
+def test_operators(op, below, equal, above):
+    matches = rule_filter(op, 100).matches
+
+    assert matches(Token(marketCap=99.0)) is below
+    assert matches(Token(marketCap=100.0)) is equal
+    assert matches(Token(marketCap=101.0)) is above
+
+
+def test_missing_value_takes_the_default():
+    assert rule_filter("<", 100).matches(Token(marketCap=None))  # Default 0
+    assert not rule_filter("<", 100, default=1000).matches(Token(marketCap=None))
+    assert rule_filter(">", 100, default=1000).matches(Token())
+
+
+def test_zero_is_not_treated_as_missing():
+    assert not rule_filter(">", 100, default=1000).matches(Token(marketCap=0.0))
+
+
+def test_all_rules_must_hold():
+    token_filter = TokenFilter({"rules": [
+        {"field": "marketCap", "op": "<", "value": 100},
+        {"field": "holders", "op": ">=", "value": 10},
+    ]})
+
+    assert token_filter.matches(Token(marketCap=50.0, holders=10.0))
+    assert not token_filter.matches(Token(marketCap=50.0, holders=9.0))
+    assert not token_filter.matches(Token(marketCap=150.0, holders=10.0))
+
+
+def test_chains_are_case_insensitive():
+    token_filter = TokenFilter({"chains": ["Solana"]})
+
+    assert token_filter.matches(Token(chainId="solana"))
+    assert token_filter.matches(Token(chainId="SOLANA"))
+    assert not token_filter.matches(Token(chainId="ethereum"))
+    assert not token_filter.matches(Token(chainId=""))
+
+
+def test_indicator_rules_read_the_series(monkeypatch):
+    monkeypatch.setattr(timeseries, "_series_store", SeriesStore())
+    token_filter = rule_filter("<", 0.5, field="liquidity_drain")
+    samples = [Token(tokenAddress="a", chainId="solana", liquidity=liquidity) for liquidity in (1000.0, 900.0, 400.0)]
+    store = timeseries.get_series_store()
+
+    assert token_filter.matches(samples[0])  # No series yet: the default applies
+
+    store.record(samples[:1], observed_at=0.0)
+    store.record(samples[1:2], observed_at=1.0)
+    assert token_filter.matches(samples[1])  # Drained 10%
+
+    store.record(samples[2:], observed_at=2.0)
+    assert not token_filter.matches(samples[2])  # Drained 60% within ROC_WINDOW polls
+
+
+def test_apply_keeps_order():
+    tokens = [Token(tokenAddress=str(i), marketCap=float(i)) for i in range(10)]
+
+    matched = rule_filter(">=", 5).apply(tokens)
+    assert [token.tokenAddress for token in matched] == ["5", "6", "7", "8", "9"]
+
+
+@pytest.mark.parametrize("rule", [
+    {"field": "nope", "op": "<", "value": 1},
+    {"field": "marketCap", "op": "=~", "value": 1},
+    {"field": "marketCap", "op": "<", "value": "1"},
+    {"field": "marketCap", "op": "<", "value": True},
+    {"field": "marketCap", "op": "<", "value": 1, "default": None},
+])
+def test_malformed_rules_are_rejected(rule):
+    with pytest.raises(FilterSpecError):
+        TokenFilter({"rules": [rule]})
+
+
+@pytest.mark.parametrize("name", ["sol_eth", "strict"])
+def test_shipped_specs_compile(name):
+    token_filter = load_filter(name)
+
+    assert token_filter.matches(Token(chainId="solana", marketCap=1000.0, holders=10.0, age=0.5))
+    assert not token_filter.matches(Token(chainId="solana", marketCap=1e9, holders=10.0, age=0.5))
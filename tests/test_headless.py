@@ -0,0 +1,83 @@
+import socket
+import sqlite3
+import tempfile
+
+import pytest
+
+import dexscreener
+import headless
+import history
+from mock_dexscreener import PROFILES_PATH, TOKENS_PATH, MockConfig, start_mock_server
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    server = start_mock_server(MockConfig(tokens=30, churn=0.0))
+    monkeypatch.setattr(dexscreener, "API_URL", f"{server.base_url}{PROFILES_PATH}")
+    monkeypatch.setattr(dexscreener, "TOKENS_URL", f"{server.base_url}{TOKENS_PATH.rstrip('/')}")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def history_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "history.sqlite3")
+    monkeypatch.setattr(history, "HISTORY_DB", path)
+    monkeypatch.setattr(history, "HISTORY_ENABLED", True)
+    monkeypatch.setattr(history, "_history_store", None)
+    return path
+
+
+def count_rows(path: str, table: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_once_writes_history_before_exiting(mock_api, history_db, tmp_path):
+    output = tmp_path / "tokens.jsonl"
+
+    assert headless.main(["--once", "--no-warm-start", "--output", str(output)]) == 0
+
+    assert count_rows(history_db, "tokens") == 30
+    assert count_rows(history_db, "snapshots") == 30  # Every mock token has a pair with market data
+
+
+def test_second_run_dedupes_against_history(mock_api, history_db, tmp_path):
+    first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+
+    headless.main(["--once", "--output", str(first)])
+    headless.main(["--once", "--output", str(second)])
+
+    assert first.read_text()
+    assert second.read_text() == ""  # Everything was seen by the first run
+
+
+def test_socket_sink_drops_lines_between_reconnects(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(headless.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(headless.time, "sleep", lambda seconds: pytest.fail("the sink slept"))
+    attempts = []
+    monkeypatch.setattr(headless, "log", attempts.append)
+
+    with tempfile.TemporaryDirectory() as directory:  # Short enough for AF_UNIX
+        path = f"{directory}/consumer.sock"
+        sink = headless.UnixSocketSink(path)
+        for i in range(10):
+            sink.write(f"{i}\n")
+        assert len(attempts) == 1  # One failed attempt; the other lines were dropped
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        try:
+            sink.write("dropped\n")  # The consumer is back, but the retry isn't due yet
+            now[0] += headless.SOCKET_RETRY_DELAY
+            sink.write("sent\n")
+
+            connection, _ = server.accept()
+            sink.close()
+            with connection:
+                assert connection.makefile().read() == "sent\n"
+        finally:
+            server.close()
+        assert len(attempts) == 1
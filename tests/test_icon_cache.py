@@ -0,0 +1,24 @@
+from icon_cache import IconCache
+
+
+def disk_bytes(cache: IconCache) -> int:
+    return sum(size for _, size, _ in cache._scan())
+
+
+def test_overwrites_are_counted_once(tmp_path):
+    cache = IconCache(directory=str(tmp_path), max_bytes=10_000)
+    cache.put_png("https://cdn/icon.png", "100x100", b"a" * 1000)
+    cache.put_png("https://cdn/other.png", "100x100", b"b" * 1000)
+
+    for size in (3000, 500, 2000):  # The same icon refreshed with new content
+        cache.put_png("https://cdn/icon.png", "100x100", b"c" * size)
+
+    assert cache._disk_bytes == disk_bytes(cache) == 3000
+
+
+def test_evicts_down_to_the_budget(tmp_path):
+    cache = IconCache(directory=str(tmp_path), max_bytes=2500, memory_entries=0)
+    for i in range(3):
+        cache.put_png(f"https://cdn/{i}.png", "100x100", bytes(1000))
+
+    assert cache._disk_bytes == disk_bytes(cache) <= 2500 * 0.9
@@ -0,0 +1,46 @@
+import os
+import random
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import icons
+
+
+@pytest.fixture
+def decode_pool(monkeypatch):
+    monkeypatch.setattr(icons, "DECODE_PROCESSES", 1)
+    monkeypatch.setattr(icons, "_decode_pool", None)
+    yield
+    if icons._decode_pool is not None:
+        icons._decode_pool.shutdown(cancel_futures=True)
+
+
+def noise_png(width: int = 200, height: int = 200) -> bytes:
+    rng = random.Random(0)
+    img = Image.frombytes("RGB", (width, height), bytes(rng.getrandbits(8) for _ in range(width * height * 3)))
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_decode_icon_replaces_a_broken_pool(decode_pool):
+    data = noise_png()
+    assert len(data) >= icons.PROCESS_DECODE_MIN_BYTES
+
+    broken = icons.get_decode_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result(timeout=30)  # Kills the worker
+
+    thumbnail = icons.decode_icon(data, (50, 50))
+    with Image.open(BytesIO(thumbnail)) as img:
+        assert img.size == (50, 50)
+
+    pool = icons.get_decode_pool()
+    assert pool is not broken
+    assert pool.submit(pow, 2, 10).result(timeout=30) == 1024
+
+    icons.replace_decode_pool(broken)  # Late callers holding the old pool leave the new one alone
+    assert icons.get_decode_pool() is pool
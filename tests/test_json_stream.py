@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_items
+
+ITEMS = [
+    {"tokenAddress": "So11111111111111111111111111111111111111112", "chainId": "solana"},
+    {"name": "Crème 🚀 トークン", "links": [{"url": "https://x.com/a"}], "nested": {"a": [1, 2, {"b": None}]}},
+    1.5,
+    -12e-3,
+    1234567890,
+    "a string with \"quotes\" and \\u00e9 é",
+    True,
+    None,
+    [],
+    {},
+]
+BODY = json.dumps(ITEMS, ensure_ascii=False).encode("utf-8")
+
+
+def split(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+def test_array_in_any_chunk_size(size):
+    assert list(iter_json_items(split(BODY, size))) == ITEMS
+
+
+def test_every_split_point():
+    # Numbers, escapes and multi-byte UTF-8 cut at every possible boundary
+    for cut in range(1, len(BODY)):
+        assert list(iter_json_items([BODY[:cut], BODY[cut:]])) == ITEMS, cut
+
+
+def test_numbers_cut_at_chunk_edges():
+    assert list(iter_json_items([b"[1", b"2.", b"5e", b"1, 3", b"]"])) == [125.0, 3]
+    assert list(iter_json_items([b"[1", b"]"])) == [1]
+
+
+def test_whitespace_and_empty_array():
+    assert list(iter_json_items([b" \n\t[ ", b" ]\r\n"])) == []
+    assert list(iter_json_items([b"[", b" 1 ,", b"\n2 ]"])) == [1, 2]
+    assert list(iter_json_items([])) == []
+    assert list(iter_json_items([b"  "])) == []
+
+
+def test_top_level_object_with_key():
+    body = json.dumps({"schemaVersion": "1.0.0", "tokens": ITEMS}, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_items(split(body, 1), key="tokens")) == ITEMS
+
+
+def test_top_level_object_without_list():
+    body = b'{"tokens": {"not": "a list"}, "other": [1]}'
+    assert list(iter_json_items(split(body, 1), key="tokens")) == []
+    assert list(iter_json_items(split(body, 1), key="missing")) == []
+    assert list(iter_json_items(split(body, 1))) == []
+
+
+@pytest.mark.parametrize("body", [
+    b'[{"a": 1}, {"b": 2}',
+    b'[{"a": 1}, {"b": 2},',
+    b'[{"a": 1}, {"b": ',
+    b'[1, 2',
+    b'[',
+])
+def test_truncated_array_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_items(split(body, 1)))
+
+
+@pytest.mark.parametrize("body", [b'[1 2]', b'[1,, 2]', b'"text"', b'[{"a": }]'])
+def test_malformed_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_items(split(body, 3)))
+
+
+def test_stops_reading_when_consumer_stops():
+    chunks = split(BODY, 1)
+    consumed = []
+
+    def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    items = iter_json_items(source())
+    assert [next(items), next(items)] == ITEMS[:2]
+    assert len(consumed) < len(chunks)
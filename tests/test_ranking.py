@@ -0,0 +1,143 @@
+import pytest
+
+import ranking
+from ranking import RESCORE_INTERVAL, Ranking
+from timeseries import SeriesStore
+from tokens import Token
+
+LIQUIDITY = [{"metric": "liquidity_ratio", "weight": 1.0}]
+AGE = [{"metric": "age_decay", "weight": 1.0, "half_life": 1.0}]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ranking.time, "time", clock)
+    return clock
+
+
+def make_token(address: str, liquidity: float = None, age: float = None, marketCap: float = 100.0) -> Token:
+    return Token(tokenAddress=address, chainId="solana", liquidity=liquidity, marketCap=marketCap, age=age)
+
+
+def addresses(tokens: list) -> list:
+    return [token.tokenAddress for token in tokens]
+
+
+def test_top_returns_best_first(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    ranks.update([make_token("a", 10), make_token("b", 90), make_token("c", 50)])
+
+    assert addresses(ranks.top()) == ["b", "c", "a"]
+    assert addresses(ranks.top(2)) == ["b", "c"]
+    assert ranks.score(make_token("b").key()) == pytest.approx(0.9)
+
+
+def test_update_moves_a_token_to_its_new_rank(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    ranks.update([make_token("a", 10), make_token("b", 90), make_token("c", 50)])
+    ranks.update([make_token("a", 95)])
+
+    assert addresses(ranks.top()) == ["a", "b", "c"]
+    assert len(ranks) == 3
+
+
+def test_equal_scores_keep_the_earlier_token_ahead(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    ranks.update([make_token("a", 50)])
+    ranks.update([make_token("b", 50)])
+
+    assert addresses(ranks.top()) == ["a", "b"]
+
+
+def test_top_with_predicate(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    ranks.update([make_token(str(i), i) for i in range(10)])
+
+    odd = ranks.top(2, predicate=lambda token: int(token.tokenAddress) % 2)
+    assert addresses(odd) == ["9", "7"]
+
+
+def test_order_sorts_by_ranked_score(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    tracked = [make_token("a", 10), make_token("b", 90)]
+    ranks.update(tracked)
+
+    untracked = make_token("c", 50)  # Scored on the spot
+    assert addresses(ranks.order(tracked + [untracked])) == ["b", "c", "a"]
+
+
+def test_keep_drops_failing_tokens(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    keep = lambda token: token.liquidity >= 20
+    ranks.update([make_token("a", 10), make_token("b", 90)], keep=keep)
+    assert addresses(ranks.top()) == ["b"]
+
+    # A tracked token that stops passing is dropped too
+    ranks.update([make_token("b", 15)], keep=keep)
+    assert len(ranks) == 0
+    assert make_token("b").key() not in ranks
+
+
+def test_max_entries_drops_the_lowest_scores(clock):
+    ranks = Ranking(LIQUIDITY, max_entries=2, series=SeriesStore())
+    ranks.update([make_token("a", 10), make_token("b", 90), make_token("c", 50)])
+
+    assert addresses(ranks.top()) == ["b", "c"]
+    assert make_token("a").key() not in ranks
+
+
+def test_discard(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore())
+    ranks.update([make_token("a", 10), make_token("b", 90)])
+    ranks.discard(make_token("b").key())
+
+    assert addresses(ranks.top()) == ["a"]
+    ranks.discard(make_token("b").key())  # Untracked keys are ignored
+
+
+def test_unpolled_tokens_are_rescored_after_the_interval(clock):
+    ranks = Ranking(AGE, series=SeriesStore())
+    ranks.update([make_token("old", age=1.0), make_token("young", age=0.0)])
+    key = make_token("old").key()
+    assert ranks.score(key) == pytest.approx(0.5)
+
+    clock.now += RESCORE_INTERVAL - 1
+    ranks.top()
+    assert ranks.score(key) == pytest.approx(0.5)  # Not due yet
+
+    clock.now += 1
+    ranks.top()
+    assert ranks.score(key) == pytest.approx(0.5 ** (1 + RESCORE_INTERVAL / 86400))
+
+
+def test_rescore_reapplies_keep(clock):
+    ranks = Ranking(AGE, series=SeriesStore())
+    keep = lambda token: token.age < 1.0
+    ranks.update([make_token("a", age=1.0 - RESCORE_INTERVAL / 86400 / 2), make_token("b", age=0.0)], keep=keep)
+    assert len(ranks) == 2
+
+    clock.now += RESCORE_INTERVAL
+    assert addresses(ranks.top()) == ["b"]  # 'a' aged past the filter
+
+
+def test_idle_tokens_expire_after_max_idle(clock):
+    ranks = Ranking(LIQUIDITY, series=SeriesStore(), max_idle=RESCORE_INTERVAL * 3)
+    ranks.update([make_token("a", 10), make_token("b", 90)])
+
+    for _ in range(3):
+        clock.now += RESCORE_INTERVAL
+        ranks.update([make_token("a", 10)])  # Only 'a' keeps being polled
+        assert make_token("b").key() in ranks
+
+    clock.now += RESCORE_INTERVAL
+    assert addresses(ranks.top()) == ["a"]
+    assert make_token("b").key() not in ranks
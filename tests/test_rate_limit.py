@@ -0,0 +1,142 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rate_limit
+from rate_limit import HIGH, LOW, LOW_PRIORITY_RESERVE, WAITER_TTL, TokenBucket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeClock:
+    """ Stands in for the time module; sleep() advances both clocks. """
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+        self.slept = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def level(bucket: TokenBucket) -> float:
+    with open(bucket.path, encoding="utf-8") as f:
+        return json.load(f)["tokens"]
+
+
+def take(bucket: TokenBucket, count: int, priority: int = HIGH) -> int:
+    return sum(bucket.acquire(priority, timeout=0) for _ in range(count))
+
+
+def test_refills_at_rate(clock, tmp_path):
+    bucket = TokenBucket("api", rate=2.0, capacity=5, directory=str(tmp_path))
+
+    assert take(bucket, 10) == 5
+    clock.now += 1.0
+    assert take(bucket, 10) == 2  # Two tokens a second
+
+    clock.now += 0.25
+    assert take(bucket, 1) == 0
+    clock.now += 0.25
+    assert take(bucket, 1) == 1
+
+
+def test_burst_is_capped_at_capacity(clock, tmp_path):
+    bucket = TokenBucket("api", rate=2.0, capacity=5, directory=str(tmp_path))
+    take(bucket, 5)
+
+    clock.now += 3600
+    assert take(bucket, 1) == 1
+    assert level(bucket) == pytest.approx(4.0)  # Refilled to 5, not 7200
+    assert take(bucket, 10) == 4
+
+
+def test_acquire_waits_for_a_token(clock, tmp_path):
+    bucket = TokenBucket("api", rate=2.0, capacity=1, directory=str(tmp_path))
+    take(bucket, 1)
+
+    assert bucket.acquire(HIGH)
+    assert clock.slept == pytest.approx(0.5)
+
+
+def test_acquire_times_out(clock, tmp_path):
+    bucket = TokenBucket("api", rate=0.1, capacity=1, directory=str(tmp_path))
+    take(bucket, 1)
+
+    assert not bucket.acquire(HIGH, timeout=2.0)
+    assert clock.slept == pytest.approx(2.0)
+
+
+def test_low_priority_leaves_the_reserve(clock, tmp_path):
+    bucket = TokenBucket("api", rate=1.0, capacity=5, directory=str(tmp_path))
+
+    assert take(bucket, 10, LOW) == 5 - LOW_PRIORITY_RESERVE
+    assert take(bucket, 10, HIGH) == LOW_PRIORITY_RESERVE  # High priority may take the reserve
+
+
+def test_waiting_high_priority_caller_holds_low_back(clock, tmp_path):
+    bucket = TokenBucket("api", rate=1.0, capacity=5, directory=str(tmp_path))
+    bucket._update(lambda state, now: state["waiters"].update({"other-process": now + WAITER_TTL}))
+
+    assert take(bucket, 1, LOW) == 0
+    assert take(bucket, 1, HIGH) == 1
+
+    clock.now += WAITER_TTL  # The waiter stopped checking in
+    assert take(bucket, 1, LOW) == 1
+
+
+def test_penalty_pauses_refilling(clock, tmp_path):
+    bucket = TokenBucket("api", rate=10.0, capacity=5, directory=str(tmp_path))
+    bucket.penalize(5.0)
+
+    assert level(bucket) == 0.0
+    clock.now += 4.9
+    assert take(bucket, 1) == 0  # Still paused, although 49 tokens' worth of time passed
+
+    start = clock.now
+    assert bucket.acquire(HIGH)
+    assert clock.now - start == pytest.approx(0.1 + 1 / 10.0, abs=0.02)  # End of the pause, then one refill
+
+
+def test_instances_share_the_state_file(clock, tmp_path):
+    first = TokenBucket("api", rate=1.0, capacity=4, directory=str(tmp_path))
+    second = TokenBucket("api", rate=1.0, capacity=4, directory=str(tmp_path))
+
+    assert take(first, 3) == 3
+    assert take(second, 3) == 1
+    second.penalize(10.0)
+    clock.now += 5
+    assert take(first, 1) == 0
+
+
+def test_processes_share_one_budget(tmp_path):
+    script = (
+        "import sys\n"
+        "import rate_limit\n"
+        "bucket = rate_limit.TokenBucket('shared', rate=0.001, capacity=10, directory=sys.argv[1])\n"
+        "print(sum(bucket.acquire(rate_limit.HIGH, timeout=0) for _ in range(8)))\n"
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script, str(tmp_path)], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    taken = [int(process.communicate(timeout=30)[0]) for process in processes]
+
+    assert sum(taken) == 10  # 16 attempts, one burst of 10 between both processes
@@ -0,0 +1,98 @@
+import pytest
+
+import seen
+from seen import SeenSet, token_key
+from tokens import Token
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(seen, "time", clock)
+    return clock
+
+
+def make_token(address: str, price: float = None, chain: str = "solana") -> Token:
+    return Token(tokenAddress=address, chainId=chain, price=price)
+
+
+def addresses(tokens: list) -> list:
+    return [token.tokenAddress for token in tokens]
+
+
+def test_first_poll_is_all_new(clock):
+    delta = SeenSet().diff([make_token("a"), make_token("b")])
+
+    assert addresses(delta.new) == ["a", "b"]
+    assert delta.changed == [] and delta.dropped == []
+
+
+def test_classifies_new_changed_and_dropped(clock):
+    seen_set = SeenSet()
+    seen_set.diff([make_token("a", 1.0), make_token("b", 1.0), make_token("c", 1.0)])
+
+    delta = seen_set.diff([make_token("a", 1.0), make_token("b", 2.0), make_token("d", 1.0)])
+
+    assert addresses(delta.new) == ["d"]
+    assert addresses(delta.changed) == ["b"]
+    assert delta.dropped == [("solana", "c")]
+    assert len(seen_set) == 4  # 'c' is still remembered, only not in the latest poll
+
+
+def test_unchanged_poll_is_empty(clock):
+    seen_set = SeenSet()
+    tokens = [make_token("a", 1.0), make_token("b", 1.0)]
+    seen_set.diff(tokens)
+
+    assert seen_set.diff(list(tokens)) == ([], [], [])
+
+
+def test_duplicates_within_a_poll_count_once(clock):
+    delta = SeenSet().diff([make_token("a", 1.0), make_token("a", 2.0)])
+
+    assert addresses(delta.new) == ["a"]
+    assert delta.new[0].price == 1.0
+
+
+def test_evm_addresses_match_in_any_case(clock):
+    seen_set = SeenSet()
+    seen_set.diff([make_token("0xABC", chain="ethereum")])
+
+    delta = seen_set.diff([make_token("0xabc", chain="ethereum")])
+    assert delta.new == []
+    assert token_key(make_token("0xABC", chain="ethereum")) == make_token("0xabc", chain="ethereum").key()
+
+
+def test_tokens_are_forgotten_after_the_window(clock):
+    seen_set = SeenSet(window=60)
+    seen_set.diff([make_token("a"), make_token("b")])
+
+    clock.now += 30
+    seen_set.diff([make_token("b")])  # Refreshes 'b' only
+
+    clock.now += 31
+    seen_set.diff([make_token("b")])
+    assert ("solana", "a") not in seen_set
+    assert ("solana", "b") in seen_set
+
+    assert addresses(seen_set.diff([make_token("a"), make_token("b")]).new) == ["a"]  # New again
+
+
+def test_cap_drops_the_least_recently_seen(clock):
+    seen_set = SeenSet(max_entries=3)
+    seen_set.diff([make_token("a"), make_token("b"), make_token("c")])
+    seen_set.diff([make_token("a")])  # 'a' becomes the most recently seen
+
+    seen_set.diff([make_token("d")])
+
+    assert len(seen_set) == 3
+    assert ("solana", "b") not in seen_set
+    assert all(("solana", address) in seen_set for address in "acd")
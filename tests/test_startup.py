@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def has_display() -> bool:
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+    except Exception:  # No tkinter, or no display to open a window on
+        return False
+    return True
+
+
+def test_bundled_logo_is_pre_resized():
+    pytest.importorskip("ttkbootstrap")
+    Image = pytest.importorskip("PIL.Image")
+    import script
+
+    if not os.path.exists(script.LOGO_BUNDLED_PATH):
+        pytest.skip("no bundled logo; build it with script.download_logo(script.LOGO_BUNDLED_PATH)")
+    with Image.open(script.LOGO_BUNDLED_PATH) as logo:
+        assert logo.format == "PNG"
+        assert logo.width == script.LOGO_WIDTH
+
+
+@pytest.mark.skipif(not has_display(), reason="needs a display")
+def test_cold_start_within_budget(tmp_path):
+    pytest.importorskip("ttkbootstrap")
+    env = dict(
+        os.environ,
+        SOLSNIPER_STARTUP_CHECK="1",  # script.py reports the time to an idle window, then exits 1 if over budget
+        SOLSNIPER_CACHE_DIR=str(tmp_path),  # Cold: no cached logo, icons or history
+        SOLSNIPER_API_BASE="http://127.0.0.1:9",  # Startup must not wait on the API
+    )
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "script.py")],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert "Window ready" in result.stdout, result.stdout + result.stderr
+    assert result.returncode == 0, result.stdout
@@ -0,0 +1,121 @@
+import pytest
+
+from timeseries import EWMA_ALPHA, LIQUIDITY_DRAIN_THRESHOLD, ROC_WINDOW, SeriesStore, TokenSeries
+from tokens import Token
+
+
+def sample(price: float = None, liquidity: float = None, address: str = "a") -> Token:
+    return Token(tokenAddress=address, chainId="solana", price=price, liquidity=liquidity)
+
+
+def test_appends_in_order():
+    series = TokenSeries(length=8)
+    for i in range(3):
+        assert series.append(sample(price=float(i)), observed_at=float(i))
+
+    assert len(series) == 3
+    assert series.history("price") == [0.0, 1.0, 2.0]
+    assert series.value("price") == 2.0
+    assert series.value("price", back=2) == 0.0
+    assert series.value("price", back=3) is None
+
+
+def test_wraps_around_keeping_the_newest_samples():
+    series = TokenSeries(length=4)
+    for i in range(10):
+        series.append(sample(price=float(i)), observed_at=float(i))
+
+    assert len(series) == 4
+    assert series.history("price") == [6.0, 7.0, 8.0, 9.0]
+    assert series.value("price", back=3) == 6.0
+    assert series.value("price", back=4) is None
+
+
+def test_repeated_samples_are_skipped():
+    series = TokenSeries(length=8)
+
+    assert series.append(sample(price=1.0), observed_at=0.0)
+    assert not series.append(sample(price=1.0), observed_at=1.0)  # Same values (missing ones included)
+    assert series.append(sample(price=1.0, liquidity=5.0), observed_at=2.0)
+    assert series.append(sample(price=1.0), observed_at=3.0)  # Only the newest sample counts
+
+    assert len(series) == 3
+    assert series.history("liquidity") == [None, 5.0, None]
+
+
+def test_missing_values_dont_move_the_ewma():
+    series = TokenSeries(length=8)
+    series.append(sample(price=10.0), observed_at=0.0)
+    series.append(sample(liquidity=1.0), observed_at=1.0)
+    assert series.indicator("price_ewma") == 10.0
+
+    series.append(sample(price=20.0), observed_at=2.0)
+    assert series.indicator("price_ewma") == pytest.approx(10.0 + EWMA_ALPHA * 10.0)
+    assert series.indicator("volume_ewma") is None
+
+
+def test_roc_against_the_window():
+    series = TokenSeries(length=16)
+    assert series.roc("price") is None
+
+    series.append(sample(price=100.0), observed_at=0.0)
+    assert series.roc("price") is None  # One sample: nothing to compare with
+
+    series.append(sample(price=110.0), observed_at=1.0)
+    assert series.roc("price") == pytest.approx(0.1)  # Against the oldest sample while under the window
+
+    for i in range(ROC_WINDOW):
+        series.append(sample(price=200.0 + i), observed_at=2.0 + i)
+    assert series.roc("price") == pytest.approx((200.0 + ROC_WINDOW - 1) / 110.0 - 1)
+    assert series.roc("price", window=1) == pytest.approx(1 / (200.0 + ROC_WINDOW - 2))
+
+
+def test_roc_is_none_without_a_base():
+    series = TokenSeries(length=8)
+    series.append(sample(price=0.0), observed_at=0.0)
+    series.append(sample(price=1.0), observed_at=1.0)
+    assert series.roc("price") is None
+
+    series.append(sample(), observed_at=2.0)
+    assert series.roc("price") is None  # Newest value missing
+
+
+def test_liquidity_drain():
+    series = TokenSeries(length=16)
+    series.append(sample(liquidity=1000.0), observed_at=0.0)
+    series.append(sample(liquidity=1200.0), observed_at=1.0)
+    assert series.indicator("liquidity_drain") == 0.0  # Growth isn't a negative drain
+    assert not series.draining
+
+    series.append(sample(liquidity=1000.0 * (1 - LIQUIDITY_DRAIN_THRESHOLD)), observed_at=2.0)
+    assert series.indicator("liquidity_drain") == pytest.approx(LIQUIDITY_DRAIN_THRESHOLD)
+    assert series.draining
+
+
+def test_drain_is_measured_within_the_window():
+    series = TokenSeries(length=32)
+    series.append(sample(liquidity=1000.0), observed_at=0.0)
+    for i in range(ROC_WINDOW):
+        series.append(sample(liquidity=500.0 + i), observed_at=1.0 + i)
+    assert series.draining
+
+    series.append(sample(liquidity=499.0), observed_at=100.0)  # The 1000 sample left the window
+    assert series.indicator("liquidity_drain") == pytest.approx(1 / 500.0)
+    assert not series.draining
+
+
+def test_unknown_indicator():
+    with pytest.raises(KeyError):
+        TokenSeries().indicator("price_median")
+
+
+def test_store_evicts_the_least_recently_updated():
+    store = SeriesStore(length=4, max_tokens=2)
+    store.record([sample(price=1.0, address="a"), sample(price=1.0, address="b")], observed_at=0.0)
+    store.record([sample(price=2.0, address="a")], observed_at=1.0)
+    store.record([sample(price=1.0, address="c")], observed_at=2.0)
+
+    assert len(store) == 2
+    assert store.get(("solana", "b")) is None
+    assert store.get(("solana", "a")).history("price") == [1.0, 2.0]
+    assert store.get(("solana", "c")).indicator("samples") == 1
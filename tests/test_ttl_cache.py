@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache, "time", clock)
+    return clock
+
+
+class CountingLoader:
+    def __init__(self, release: threading.Event = None):
+        self.calls = 0
+        self.release = release
+
+    def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            assert self.release.wait(5)
+        return f"value {self.calls}"
+
+
+def test_concurrent_misses_load_once():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+    loader = CountingLoader(release)
+    results = []
+
+    def worker():
+        results.append(cache.get_or_load("tokens", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.1, release.set).start()  # Let every thread reach the cold key first
+    for thread in threads:
+        thread.join(5)
+
+    assert loader.calls == 1
+    assert results == ["value 1"] * 16
+
+
+def test_loader_errors_reach_every_waiter():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        assert release.wait(5)
+        raise ValueError("upstream down")
+
+    def worker():
+        try:
+            cache.get_or_load("tokens", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.1, release.set).start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 4
+    assert cache.get("tokens") is None  # Nothing cached; the next call loads again
+    assert cache.get_or_load("tokens", lambda: "recovered") == "recovered"
+
+
+def test_reloads_after_the_ttl(clock):
+    cache = TTLCache(ttl=10)
+    loader = CountingLoader()
+
+    assert cache.get_or_load("tokens", loader) == "value 1"
+    clock.now += 9.9
+    assert cache.get_or_load("tokens", loader) == "value 1"
+    assert cache.get("tokens") == "value 1"
+
+    clock.now += 0.1
+    assert cache.get("tokens") is None
+    assert cache.get_stale("tokens") == "value 1"
+    assert cache.get_or_load("tokens", loader) == "value 2"
+    assert loader.calls == 2
+
+
+def test_max_age_overrides_the_ttl(clock):
+    cache = TTLCache(ttl=10)
+    loader = CountingLoader()
+    cache.get_or_load("tokens", loader)
+
+    clock.now += 3
+    assert cache.age("tokens") == pytest.approx(3)
+    assert cache.get_or_load("tokens", loader, max_age=5) == "value 1"
+    assert cache.get_or_load("tokens", loader, max_age=2) == "value 2"
+
+
+def test_least_recently_used_entries_go_first(clock):
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
@@ -0,0 +1,196 @@
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+SERIES_FIELDS = ("price", "marketCap", "liquidity", "volume", "holders")
+SERIES_LENGTH = 64  # Samples kept per token (one per poll)
+SERIES_MAX_TOKENS = 5000  # Tokens tracked at once; the least recently updated go first beyond this
+
+EWMA_ALPHA = 0.3  # Weight of the newest sample in the moving averages
+ROC_WINDOW = 6  # Rate of change is measured against the sample this many polls back
+LIQUIDITY_DRAIN_THRESHOLD = 0.3  # Losing this fraction of liquidity within ROC_WINDOW polls counts as a drain
+
+# Values filters and ranking can read per token (see TokenSeries.indicator)
+INDICATORS = frozenset(
+    [f"{field}_ewma" for field in SERIES_FIELDS]
+    + [f"{field}_roc" for field in SERIES_FIELDS]
+    + ["liquidity_drain", "samples"]
+)
+
+_NAN = float("nan")
+
+
+################################################################################
+# PER-TOKEN RING BUFFER
+################################################################################
+
+class TokenSeries:
+    """
+    The last SERIES_LENGTH samples of one token's market fields, in
+    preallocated arrays used as a ring buffer, plus an EWMA per field
+    updated as each sample arrives. Memory is fixed per token, and
+    appending or reading any indicator is O(1).
+    Missing values are stored as NaN and don't move the EWMA. A sample equal
+    to the newest one isn't stored: market data is cached for a while (see
+    enrichment.ENRICH_TTL) and every session records what it sees, so the
+    repeats would otherwise fill ROC_WINDOW and delay the drain signal.
+    """
+
+    __slots__ = ("times", "values", "ewma", "head", "count")
+
+    def __init__(self, length: int = SERIES_LENGTH):
+        self.times = array("d", [_NAN]) * length
+        self.values = array("d", [_NAN]) * (length * len(SERIES_FIELDS))  # Sample-major: one row per sample
+        self.ewma = array("d", [_NAN]) * len(SERIES_FIELDS)
+        self.head = 0  # Slot the next sample goes into
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def length(self) -> int:
+        return len(self.times)
+
+    def append(self, token, observed_at: float) -> bool:
+        """ Records a sample; returns False when it repeats the newest one and was skipped. """
+        width = len(SERIES_FIELDS)
+        values = [getattr(token, field) for field in SERIES_FIELDS]
+        values = [_NAN if value is None else float(value) for value in values]
+        if self.count:
+            newest = ((self.head - 1) % self.length) * width
+            previous = self.values[newest:newest + width]
+            if all(a == b or (math.isnan(a) and math.isnan(b)) for a, b in zip(values, previous)):
+                return False
+
+        row = self.head * width
+        self.times[self.head] = observed_at
+        for i, value in enumerate(values):
+            self.values[row + i] = value
+            if not math.isnan(value):
+                average = self.ewma[i]
+                self.ewma[i] = value if math.isnan(average) else average + EWMA_ALPHA * (value - average)
+
+        self.head = (self.head + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+        return True
+
+    def value(self, field: str, back: int = 0):
+        """ Returns a field's value 'back' samples before the newest one (None if missing or not recorded). """
+        if back >= self.count:
+            return None
+        slot = (self.head - 1 - back) % self.length
+        value = self.values[slot * len(SERIES_FIELDS) + SERIES_FIELDS.index(field)]
+        return None if math.isnan(value) else value
+
+    def roc(self, field: str, window: int = ROC_WINDOW):
+        """
+        Rate of change of a field against the sample 'window' polls back (or
+        the oldest one kept), as a fraction: 0.1 = up 10%.
+        """
+        back = min(window, self.count - 1)
+        if back < 1:
+            return None
+        current, past = self.value(field), self.value(field, back)
+        if current is None or not past:
+            return None
+        return (current - past) / past
+
+    def indicator(self, name: str):
+        """ Returns one of INDICATORS, or None while there isn't enough data. """
+        if name == "samples":
+            return self.count
+        if name == "liquidity_drain":
+            change = self.roc("liquidity")
+            return None if change is None else max(0.0, -change)
+
+        field, _, kind = name.rpartition("_")
+        if kind == "ewma":
+            average = self.ewma[SERIES_FIELDS.index(field)]
+            return None if math.isnan(average) else average
+        if kind == "roc":
+            return self.roc(field)
+        raise KeyError(name)
+
+    @property
+    def draining(self) -> bool:
+        """ True when liquidity fell by LIQUIDITY_DRAIN_THRESHOLD or more within ROC_WINDOW polls. """
+        drain = self.indicator("liquidity_drain")
+        return drain is not None and drain >= LIQUIDITY_DRAIN_THRESHOLD
+
+    def history(self, field: str) -> list:
+        """ Returns the recorded values of a field, oldest first (None where missing). """
+        return [self.value(field, back) for back in range(self.count - 1, -1, -1)]
+
+
+################################################################################
+# SERIES STORE
+################################################################################
+
+class SeriesStore:
+    """
+    A TokenSeries per (chainId, tokenAddress), for at most 'max_tokens'
+    tokens, so total memory is fixed however long the session runs.
+    """
+
+    def __init__(self, length: int = SERIES_LENGTH, max_tokens: int = SERIES_MAX_TOKENS):
+        self.length = length
+        self.max_tokens = max_tokens
+        self._series = OrderedDict()  # key -> TokenSeries, least recently updated first
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def record(self, tokens: list, observed_at: float = None) -> None:
+        """ Appends one poll's values to each token's series. """
+        observed_at = time.time() if observed_at is None else observed_at
+        with self._lock:
+            for token in tokens:
+                key = token.key()
+                series = self._series.pop(key, None)
+                if series is None:
+                    series = TokenSeries(self.length)
+                series.append(token, observed_at)
+                self._series[key] = series
+
+            while len(self._series) > self.max_tokens:
+                self._series.popitem(last=False)
+
+    def get(self, key):
+        """ Returns a token's TokenSeries, or None if it was never recorded. """
+        return self._series.get(key)
+
+
+_series_store = None
+_series_lock = threading.Lock()
+
+
+def get_series_store() -> SeriesStore:
+    """
+    Returns the process-wide series store, creating it on first use.
+    """
+    global _series_store
+
+    with _series_lock:
+        if _series_store is None:
+            _series_store = SeriesStore()
+
+    return _series_store
+
+
+def record_series(tokens: list) -> None:
+    """ Records a polled (and enriched) batch in the process-wide series store. """
+    get_series_store().record(tokens)
+
+
+def indicator(token, name: str):
+    """ Returns one of a token's INDICATORS from the process-wide store (None without data). """
+    series = get_series_store().get(token.key())
+    return None if series is None else series.indicator(name)
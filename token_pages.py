@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+
+from dexscreener import API_URL, BOOSTS_LATEST_URL, BOOSTS_TOP_URL, PAIR_BATCH_SIZE, fetch_token_list
+from enrichment import enrich_tokens
+from icons import prefetch_icons
+from seen import token_key
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+PAGE_SIZE = 5  # Tokens per "Show More" page
+
+# Endpoints read, in order, once the tokens already on screen run out. The full
+# profiles response is read this time (polls stop after TOKEN_LIMIT), then boosts.
+PAGE_SOURCES = (API_URL, BOOSTS_LATEST_URL, BOOSTS_TOP_URL)
+
+
+################################################################################
+# PAGINATED SOURCE
+################################################################################
+
+class TokenPages:
+    """
+    Pages of matching tokens beyond what polling shows, pulled lazily:
+    each source in PAGE_SOURCES is fetched only once the previous ones are
+    used up, and tokens are enriched PAIR_BATCH_SIZE at a time and filtered
+    as pages are requested. Whenever a page is handed out the next one
+    (tokens and decoded icons) is prepared on a background thread, so the
+    next "Show More" is usually served straight from memory.
+    Tokens whose key is in 'exclude' (already displayed) are skipped.
+    """
+
+    def __init__(self, token_filter, page_size: int = PAGE_SIZE, icon_size=None, exclude=(),
+                 sources=PAGE_SOURCES, on_error=print):
+        self.token_filter = token_filter
+        self.page_size = page_size
+        self.icon_size = icon_size
+        self.sources = sources
+        self.on_error = on_error
+        self.exhausted = False
+
+        self._seen = set(exclude)
+        self._matches = self._iter_matches()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pages")  # The generator isn't thread-safe
+        self._next = None  # Future of the prepared page
+
+    def _iter_matches(self):
+        for url in self.sources:
+            try:
+                tokens = fetch_token_list(url, None)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.on_error(f"Error fetching more tokens: {e}")
+                continue
+
+            fresh = []
+            for token in tokens:
+                key = token_key(token)
+                if key not in self._seen:
+                    self._seen.add(key)
+                    fresh.append(token)
+
+            for i in range(0, len(fresh), PAIR_BATCH_SIZE):
+                batch = enrich_tokens(fresh[i:i + PAIR_BATCH_SIZE], on_error=self.on_error)
+                yield from self.token_filter.apply(batch)
+
+    def _load_page(self) -> tuple:
+        tokens = list(islice(self._matches, self.page_size))
+        if len(tokens) < self.page_size:
+            self.exhausted = True
+        icons = prefetch_icons(tokens, size=self.icon_size, on_error=self.on_error) if tokens else {}
+        return tokens, icons
+
+    def prefetch(self) -> None:
+        """ Starts preparing the next page in the background, if it isn't already. """
+        if self._next is None and not self.exhausted:
+            self._next = self._executor.submit(self._load_page)
+
+    def next_page(self) -> tuple:
+        """
+        Returns the next page as (tokens, icons by URL), waiting for it if the
+        prefetch hasn't finished, and starts prefetching the one after.
+        An empty list means every source is used up.
+        """
+        self.prefetch()
+        if self._next is None:
+            return [], {}
+
+        future, self._next = self._next, None
+        page = future.result()
+        self.prefetch()
+        return page
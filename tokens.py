@@ -0,0 +1,159 @@
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+from itertools import islice
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+# Dexscreener chainIds with hex (case-insensitive) addresses, which sources spell in any
+# letter case; addresses on other chains (e.g. Solana's base58) are case-sensitive
+EVM_CHAINS = frozenset([
+    "ethereum", "bsc", "base", "arbitrum", "polygon", "avalanche", "optimism", "blast", "linea", "zksync",
+    "fantom", "cronos", "pulsechain", "mantle", "scroll", "sonic", "abstract", "berachain", "unichain", "celo",
+])
+
+
+################################################################################
+# TOKEN RECORD
+################################################################################
+
+@dataclass(frozen=True, slots=True)
+class Token:
+    """
+    Compact, immutable record holding only the token fields the front-ends
+    read. Field names match the Dexscreener JSON keys. Numeric fields are
+    floats, or None when the API didn't provide them; the market fields
+    are filled in by enrichment.enrich_tokens (age in days since the
+    token's first pair was created).
+    """
+
+    tokenAddress: str = ""
+    chainId: str = ""
+    url: str = None
+    icon: str = None
+    name: str = None
+    links: tuple = ()
+    price: float = None
+    marketCap: float = None
+    liquidity: float = None
+    volume: float = None
+    holders: float = None
+    age: float = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Token":
+        """
+        Builds a Token straight from one decoded JSON object, dropping every
+        field the app doesn't use (description, header, ...).
+        """
+        return cls(
+            tokenAddress=data.get("tokenAddress") or "",
+            chainId=sys.intern(data.get("chainId") or ""),  # Few distinct values; share them
+            url=data.get("url"),
+            icon=data.get("icon"),
+            name=data.get("name"),
+            links=parse_links(data.get("links")),
+            price=to_number(data.get("price", data.get("priceUsd"))),
+            marketCap=to_number(data.get("marketCap")),
+            liquidity=to_number(data.get("liquidity"), "usd"),
+            volume=to_number(data.get("volume"), "h24"),
+            holders=to_number(data.get("holders")),
+            age=to_number(data.get("age")),
+        )
+
+    @classmethod
+    def from_pair(cls, pair: dict, now: float = None) -> "Token":
+        """
+        Builds a Token for the base token of one trading pair (search
+        results), with that pair's market data; age is in days since the
+        pair was created.
+        """
+        base = pair.get("baseToken") or {}
+        info = pair.get("info") or {}
+        now = time.time() if now is None else now
+        created_at = to_number(pair.get("pairCreatedAt"))  # Milliseconds since the epoch
+        market_cap = to_number(pair.get("marketCap"))
+        return cls(
+            tokenAddress=base.get("address") or "",
+            chainId=sys.intern(pair.get("chainId") or ""),
+            url=pair.get("url"),
+            icon=info.get("imageUrl"),
+            name=base.get("name"),
+            links=parse_links((info.get("websites") or []) + (info.get("socials") or [])),
+            price=to_number(pair.get("priceUsd")),
+            marketCap=market_cap if market_cap is not None else to_number(pair.get("fdv")),
+            liquidity=to_number(pair.get("liquidity"), "usd"),
+            volume=to_number(pair.get("volume"), "h24"),
+            age=None if created_at is None else max(0.0, (now - created_at / 1000) / 86400),
+        )
+
+    def key(self) -> tuple:
+        """ Identifies the token across polls and sources (see canonical_address). """
+        return self.chainId, canonical_address(self.chainId, self.tokenAddress)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+TOKEN_FIELDS = frozenset(field.name for field in fields(Token))
+
+
+def canonical_address(chain_id: str, address: str) -> str:
+    """
+    Returns the address as used in token keys: lowercased on EVM_CHAINS,
+    unchanged elsewhere.
+    """
+    return address.lower() if chain_id in EVM_CHAINS else address
+
+
+def to_number(value, nested_key: str = None):
+    """
+    Converts a JSON value to float, or None when it's missing or not numeric.
+    Dict values (e.g. liquidity: {"usd": ...}) are read through 'nested_key'.
+    """
+    if isinstance(value, dict):
+        value = value.get(nested_key) if nested_key else None
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def display_value(value, missing: str = "N/A"):
+    """
+    Formats an optional numeric field for display.
+    """
+    if value is None:
+        return missing
+    return int(value) if float(value).is_integer() else value
+
+
+def parse_links(links) -> tuple:
+    """
+    Normalizes the "links" field to a tuple of URL strings. The API sends a
+    list of {"type", "label", "url"} objects; plain strings are kept as-is.
+    """
+    if not links:
+        return ()
+
+    urls = []
+    for link in links:
+        if isinstance(link, dict):
+            link = link.get("url")
+        if isinstance(link, str) and link:
+            urls.append(link)
+    return tuple(urls)
+
+
+def parse_tokens(items, limit: int = None) -> list:
+    """
+    Turns decoded token objects into Token records, keeping at most 'limit'.
+    'items' may be a lazy iterator; it's not advanced past the first 'limit' items.
+    """
+    if limit:
+        items = islice(items, limit)
+    return [Token.from_json(item) for item in items if isinstance(item, dict)]
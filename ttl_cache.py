@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+################################################################################
+# TTL CACHE WITH SINGLE-FLIGHT LOADING
+################################################################################
+
+class _Flight:
+    """ One in-progress load that concurrent callers wait on. """
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire 'ttl' seconds after being loaded.
+    get_or_load() coalesces concurrent misses for the same key: the first
+    caller runs the loader, everyone else waits for and shares its result,
+    so N concurrent callers cause one upstream request per interval.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # key -> (value, loaded_at), least recently used first
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key, max_age: float):
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < max_age:
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def get(self, key, default=None):
+        """ Returns the cached value if it hasn't expired, else 'default'. """
+        with self._lock:
+            entry = self._fresh(key, self.ttl)
+        return entry[0] if entry is not None else default
+
+    def get_stale(self, key, default=None):
+        """ Returns the last loaded value even if it has expired. """
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else default
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def age(self, key):
+        """ Seconds since 'key' was loaded, or None if it isn't cached. """
+        with self._lock:
+            entry = self._entries.get(key)
+        return time.monotonic() - entry[1] if entry is not None else None
+
+    def get_or_load(self, key, loader, max_age: float = None):
+        """
+        Returns the cached value for 'key', calling loader() when it is older
+        than 'max_age' (default: the cache TTL). Exceptions raised by the
+        loader propagate to every caller waiting on that load.
+        """
+        max_age = self.ttl if max_age is None else max_age
+
+        with self._lock:
+            entry = self._fresh(key, max_age)
+            if entry is not None:
+                return entry[0]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            with self._lock:
+                self._store(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,113 @@
+import tkinter as tk
+from tkinter import ttk
+
+################################################################################
+# GLOBAL CONSTANTS & CONFIG
+################################################################################
+
+SCROLL_INCREMENT = 40  # Pixels per mouse-wheel "unit"
+OVERSCAN_ROWS = 1  # Extra rows kept bound above/below the viewport
+
+
+################################################################################
+# VIRTUALIZED LIST
+################################################################################
+
+class VirtualList:
+    """
+    A scrollable list of fixed-height rows that only creates enough row
+    widgets to fill the viewport. As the user scrolls, the same widgets are
+    moved and rebound to whichever items come into view, so widget count,
+    memory and layout cost stay constant however many items the list holds.
+
+      create_row(canvas)  -> a new row object with a .frame widget
+      bind_row(row, index)   fills 'row' with item 'index'
+    """
+
+    def __init__(self, parent, row_height: int, create_row, bind_row, gap: int = 0):
+        self.row_height = row_height
+        self.gap = gap
+        self.create_row = create_row
+        self.bind_row = bind_row
+
+        self.canvas = tk.Canvas(parent, highlightthickness=0, yscrollincrement=SCROLL_INCREMENT)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yview)
+        self.canvas.bind("<Configure>", self._on_resize)
+
+        self.count = 0
+        self._rows = []  # Pool of row objects; each remembers the window it lives in
+        self._bound = []  # Item index currently bound to each pooled row (None = hidden)
+        self._width = 1
+
+    @property
+    def stride(self) -> int:
+        return self.row_height + self.gap
+
+    def pack(self, **options) -> None:
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(**options)
+
+    def set_count(self, count: int, inserted_above: int = 0) -> None:
+        """
+        Sets how many items the list shows. 'inserted_above' items were added
+        at the top; unless the view is already at the top it is shifted so
+        the rows the user is reading stay in place.
+        """
+        first_visible = self.canvas.canvasy(0)
+        self.count = count
+        self._update_scrollregion()
+
+        if inserted_above and first_visible > 0:
+            total = max(1, self.count * self.stride)
+            self.canvas.yview_moveto((first_visible + inserted_above * self.stride) / total)
+
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Binds the pooled rows to the items currently in (or next to) the viewport.
+        'force' rebinds rows even if they already show the same index.
+        """
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // self.stride) - OVERSCAN_ROWS)
+
+        for slot, row in enumerate(self._rows):
+            index = first + slot
+            if index >= self.count:
+                if self._bound[slot] is not None:
+                    self.canvas.itemconfigure(row.window, state="hidden")
+                    self._bound[slot] = None
+                continue
+
+            if force or self._bound[slot] != index:
+                self.canvas.coords(row.window, 0, index * self.stride)
+                self.canvas.itemconfigure(row.window, state="normal")
+                self.bind_row(row, index)
+                self._bound[slot] = index
+
+    def _update_scrollregion(self) -> None:
+        height = max(self.count * self.stride, int(self.canvas.winfo_height()))
+        self.canvas.configure(scrollregion=(0, 0, self._width, height))
+
+    def _ensure_pool(self, viewport_height: int) -> None:
+        needed = viewport_height // self.stride + 2 + 2 * OVERSCAN_ROWS
+        while len(self._rows) < needed:
+            row = self.create_row(self.canvas)
+            row.window = self.canvas.create_window(
+                0, 0, window=row.frame, anchor="nw", width=self._width, height=self.row_height, state="hidden"
+            )
+            self._rows.append(row)
+            self._bound.append(None)
+
+    def _on_resize(self, event) -> None:
+        self._width = event.width
+        self._ensure_pool(event.height)
+        for row in self._rows:
+            self.canvas.itemconfigure(row.window, width=self._width)
+        self._update_scrollregion()
+        self.refresh()
+
+    def _on_yview(self, first, last) -> None:
+        self.scrollbar.set(first, last)
+        self.refresh()